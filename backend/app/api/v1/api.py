@@ -1,6 +1,6 @@
 # backend/app/api/v1/api.py
 from fastapi import APIRouter
-from .endpoints import auth, documents, workers, companies, observations
+from .endpoints import auth, documents, workers, companies, observations, metrics, search, credentials
 
 api_router = APIRouter()
 
@@ -34,3 +34,21 @@ api_router.include_router(
     prefix="/observations",
     tags=["observations"]
 )
+
+api_router.include_router(
+    search.router,
+    prefix="/search",
+    tags=["search"]
+)
+
+api_router.include_router(
+    credentials.router,
+    prefix="/credentials",
+    tags=["credentials"]
+)
+
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["metrics"]
+)
@@ -1,70 +1,79 @@
 # backend/app/api/v1/endpoints/auth.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 from ....core.database import get_db
+from ....core.replicas import get_read_db
 from ....core.security import (
-    verify_password, 
-    get_password_hash, 
+    admit_login,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
+    token_claims,
     get_current_user
 )
+from ....core.principal import invalidate_principal
 from ....models import user as user_models
 from ....schemas import user as schemas
+from ....utils.pagination import PageParams, paginate
 
 router = APIRouter()
 
 @router.post("/login", response_model=schemas.TokenResponse)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Login endpoint"""
-    user = db.query(user_models.User).filter(
-        user_models.User.username == form_data.username
-    ).first()
+    admit_login(form_data.username, request.client.host if request.client else None)
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await db.scalar(select(user_models.User).where(
+        user_models.User.username == form_data.username
+    ))
+    hashed_password = user.hashed_password if user else None
+    # Give the connection back while bcrypt runs; holding it across the
+    # await lets a login burst exhaust the database pool
+    await db.rollback()
+    
+    valid, new_hash = await verify_password_async(form_data.password, hashed_password)
+    if not user or not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    await db.refresh(user)
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
     
-    # Update last login
+    # Update last login, upgrading the hash if the bcrypt cost changed
     user.last_login = datetime.now()
-    db.commit()
+    if new_hash:
+        user.hashed_password = new_hash
+    await db.commit()
+    invalidate_principal(user.id)
     
     # Create access token
-    access_token = create_access_token(
-        data={"sub": user.username, "user_id": user.id, "role": user.role.value}
-    )
+    access_token = create_access_token(data=token_claims(user))
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "full_name": user.full_name,
-            "role": user.role,
-            "company_id": user.company_id
-        }
+        "user": user
     }
 
 @router.post("/register", response_model=schemas.UserResponse)
-def register(
+async def register(
     user_data: schemas.UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Register a new user (admin or company RRHH only)"""
@@ -73,11 +82,14 @@ def register(
     if current_user.role not in ["admin", "rrhh"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    # Hash before touching the database so no connection is held across the await
+    hashed_password = await get_password_hash_async(user_data.password)
+    
     # Check if user already exists
-    existing_user = db.query(user_models.User).filter(
-        (user_models.User.username == user_data.username) |
-        (user_models.User.email == user_data.email)
-    ).first()
+    existing_user = await db.scalar(select(user_models.User).where(or_(
+        user_models.User.username == user_data.username,
+        user_models.User.email == user_data.email
+    )))
     
     if existing_user:
         raise HTTPException(
@@ -86,8 +98,6 @@ def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    
     db_user = user_models.User(
         username=user_data.username,
         email=user_data.email,
@@ -98,56 +108,66 @@ def register(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    # SQLite can reuse the id of a deleted user
+    invalidate_principal(db_user.id)
     
     return db_user
 
 @router.get("/me", response_model=schemas.UserResponse)
-def get_current_user_info(
+async def get_current_user_info(
     current_user = Depends(get_current_user)
 ):
     """Get current user information"""
     return current_user
 
 @router.put("/me", response_model=schemas.UserResponse)
-def update_current_user(
+async def update_current_user(
     update_data: schemas.UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Update current user profile"""
+    # Hash before touching the database so no connection is held across the await
+    hashed_password = None
+    if update_data.password:
+        hashed_password = await get_password_hash_async(update_data.password)
+    
+    # current_user is a cached snapshot; changes go to the row
+    user = await db.get(user_models.User, current_user.id)
     
     # Update allowed fields
     if update_data.email:
         # Check if email is already taken
-        existing = db.query(user_models.User).filter(
+        existing = await db.scalar(select(user_models.User).where(
             user_models.User.email == update_data.email,
             user_models.User.id != current_user.id
-        ).first()
+        ))
         if existing:
             raise HTTPException(status_code=400, detail="Email already taken")
-        current_user.email = update_data.email
+        user.email = update_data.email
     
     if update_data.full_name:
-        current_user.full_name = update_data.full_name
+        user.full_name = update_data.full_name
     
-    if update_data.password:
-        current_user.hashed_password = get_password_hash(update_data.password)
+    if hashed_password:
+        user.hashed_password = hashed_password
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_principal(user.id)
     
-    return current_user
+    return user
 
 @router.get("/users", response_model=List[schemas.UserResponse])
-def get_users(
+async def get_users(
+    response: Response,
     company_id: Optional[int] = None,
     role: Optional[schemas.UserRole] = None,
     is_active: Optional[bool] = True,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get list of users (admin or RRHH only)"""
@@ -155,28 +175,28 @@ def get_users(
     if current_user.role not in ["admin", "rrhh"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    query = db.query(user_models.User)
+    query = select(user_models.User)
     
     # Filter by company if not admin
     if current_user.role != "admin":
-        query = query.filter(user_models.User.company_id == current_user.company_id)
+        query = query.where(user_models.User.company_id == current_user.company_id)
     elif company_id:
-        query = query.filter(user_models.User.company_id == company_id)
+        query = query.where(user_models.User.company_id == company_id)
     
     if role:
-        query = query.filter(user_models.User.role == role)
+        query = query.where(user_models.User.role == role)
     
     if is_active is not None:
-        query = query.filter(user_models.User.is_active == is_active)
+        query = query.where(user_models.User.is_active == is_active)
     
-    users = query.offset(skip).limit(limit).all()
+    users = await paginate(db, query, page, response, (user_models.User.id,))
     return users
 
 @router.patch("/users/{user_id}/status")
-def update_user_status(
+async def update_user_status(
     user_id: int,
     is_active: bool,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Activate/deactivate user (admin only)"""
@@ -184,43 +204,31 @@ def update_user_status(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    user = db.query(user_models.User).filter(
-        user_models.User.id == user_id
-    ).first()
+    user = await db.get(user_models.User, user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     user.is_active = is_active
-    db.commit()
+    if not is_active:
+        # Revoke tokens already issued to the user
+        user.token_version = (user.token_version or 0) + 1
+    await db.commit()
+    invalidate_principal(user.id)
     
     return {"message": f"User {'activated' if is_active else 'deactivated'} successfully"}
 
 @router.post("/refresh-token", response_model=schemas.TokenResponse)
-def refresh_token(
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def refresh_token(
+    current_user = Depends(get_current_user)
 ):
     """Refresh access token"""
     
     # Create new access token
-    access_token = create_access_token(
-        data={
-            "sub": current_user.username, 
-            "user_id": current_user.id, 
-            "role": current_user.role.value
-        }
-    )
+    access_token = create_access_token(data=token_claims(current_user))
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": {
-            "id": current_user.id,
-            "username": current_user.username,
-            "email": current_user.email,
-            "full_name": current_user.full_name,
-            "role": current_user.role,
-            "company_id": current_user.company_id
-        }
+        "user": current_user
     }
@@ -1,21 +1,33 @@
 # backend/app/api/v1/endpoints/companies.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from datetime import date, timedelta
+from ....core.config import settings
 from ....core.database import get_db
+from ....core.replicas import get_read_db, read_session
 from ....models import company as company_models
 from ....models import worker as worker_models
 from ....models import document as doc_models
+from ....models.compliance import CompanyComplianceStats
 from ....schemas import company as schemas
 from ....core.security import get_current_user
+from ....services.compliance_export import FORMATS, export_stream
+from ....services.compliance_rollup import STATUS_COLUMNS, compliance_percentage
+from ....services.loaders import build_company_with_details
+from ....services.report_cache import data_version, report_cache
+from ....services.search import company_search_condition
+from ....utils.etag import conditional_list, latest
+from ....utils.pagination import PageParams, paginate
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.CompanyResponse)
-def create_company(
+async def create_company(
     company: schemas.CompanyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create a new company"""
@@ -25,76 +37,70 @@ def create_company(
         raise HTTPException(status_code=403, detail="Not authorized")
     
     # Check if company already exists
-    existing = db.query(company_models.Company).filter(
+    existing = await db.scalar(select(company_models.Company).where(
         company_models.Company.rut == company.rut
-    ).first()
+    ))
     
     if existing:
         raise HTTPException(status_code=400, detail="Company already exists")
     
     db_company = company_models.Company(**company.dict())
     db.add(db_company)
-    db.commit()
-    db.refresh(db_company)
+    await db.commit()
+    await db.refresh(db_company)
     
     return db_company
 
 @router.get("/", response_model=List[schemas.CompanyResponse])
-def get_companies(
+async def get_companies(
+    request: Request,
+    response: Response,
     is_active: Optional[bool] = Query(True),
-    search: Optional[str] = Query(None),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    search: Optional[str] = Query(None, min_length=2),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get list of companies with filters"""
-    query = db.query(company_models.Company)
+    query = select(company_models.Company, CompanyComplianceStats).outerjoin(
+        CompanyComplianceStats,
+        CompanyComplianceStats.company_id == company_models.Company.id
+    )
     
     # Filter by company if user is not admin
     if current_user.role != "admin" and current_user.company_id:
-        query = query.filter(company_models.Company.id == current_user.company_id)
+        query = query.where(company_models.Company.id == current_user.company_id)
     
     if is_active is not None:
-        query = query.filter(company_models.Company.is_active == is_active)
+        query = query.where(company_models.Company.is_active == is_active)
     
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (company_models.Company.name.ilike(search_filter)) |
-            (company_models.Company.business_name.ilike(search_filter)) |
-            (company_models.Company.rut.ilike(search_filter))
-        )
-    
-    companies = query.offset(skip).limit(limit).all()
-    
-    # Add statistics
-    for company in companies:
-        company.workers_count = db.query(func.count(worker_models.Worker.id)).filter(
-            worker_models.Worker.company_id == company.id
-        ).scalar()
-        
-        company.documents_count = db.query(func.count(doc_models.Document.id)).filter(
-            doc_models.Document.company_id == company.id
-        ).scalar()
-        
-        # Calculate compliance percentage
-        approved_docs = db.query(func.count(doc_models.Document.id)).filter(
-            doc_models.Document.company_id == company.id,
-            doc_models.Document.status == "approved"
-        ).scalar()
-        
-        company.compliance_percentage = (
-            (approved_docs / company.documents_count * 100) 
-            if company.documents_count > 0 else 0
-        )
+        query = query.where(company_search_condition(db, search))
+    
+    # Rollup stats count as well: a version sum only grows
+    not_modified = await conditional_list(request, response, db, query, current_user, [
+        *latest(company_models.Company.created_at, company_models.Company.updated_at),
+        func.sum(CompanyComplianceStats.data_version)
+    ], page)
+    if not_modified:
+        return not_modified
+    
+    rows = await paginate(db, query, page, response, (company_models.Company.id,))
+    
+    # Add statistics from the compliance rollup
+    companies = []
+    for company, stats in rows:
+        company.workers_count = stats.workers_count if stats else 0
+        company.documents_count = stats.documents_count if stats else 0
+        company.compliance_percentage = compliance_percentage(stats)
+        companies.append(company)
     
     return companies
 
 @router.get("/{company_id}", response_model=schemas.CompanyWithDetails)
-def get_company_detail(
+async def get_company_detail(
     company_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get company details with workers and statistics"""
@@ -104,27 +110,19 @@ def get_company_detail(
         current_user.company_id != company_id):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    company = db.query(company_models.Company).filter(
-        company_models.Company.id == company_id
-    ).first()
+    company = await db.get(company_models.Company, company_id)
     
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
     # Get workers with their document status
-    workers = db.query(worker_models.Worker).filter(
-        worker_models.Worker.company_id == company_id
-    ).all()
-    
-    company.workers = workers
-    
-    return company
+    return await db.run_sync(build_company_with_details, company)
 
 @router.put("/{company_id}", response_model=schemas.CompanyResponse)
-def update_company(
+async def update_company(
     company_id: int,
     update_data: schemas.CompanyUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Update company information"""
@@ -134,9 +132,7 @@ def update_company(
         current_user.company_id != company_id):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    company = db.query(company_models.Company).filter(
-        company_models.Company.id == company_id
-    ).first()
+    company = await db.get(company_models.Company, company_id)
     
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
@@ -146,38 +142,36 @@ def update_company(
     for field, value in update_dict.items():
         setattr(company, field, value)
     
-    db.commit()
-    db.refresh(company)
+    await db.commit()
+    await db.refresh(company)
     
     return company
 
 @router.delete("/{company_id}")
-def delete_company(
+async def delete_company(
     company_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Deactivate a company (admin only)"""
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    company = db.query(company_models.Company).filter(
-        company_models.Company.id == company_id
-    ).first()
+    company = await db.get(company_models.Company, company_id)
     
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
     # Soft delete
     company.is_active = False
-    db.commit()
+    await db.commit()
     
     return {"message": "Company deactivated successfully"}
 
 @router.get("/{company_id}/compliance-report")
-def get_company_compliance_report(
+async def get_company_compliance_report(
     company_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get detailed compliance report for a company"""
@@ -187,48 +181,83 @@ def get_company_compliance_report(
         current_user.company_id != company_id):
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    # Read the version first: the report computed after it is at least as new
+    version = await data_version(db, company_id)
+    return await report_cache.get_or_compute(
+        "compliance", company_id, f"{version}:{date.today().isoformat()}",
+        lambda: _compliance_report(db, company_id)
+    )
+
+@router.get("/{company_id}/export")
+async def export_company_compliance(
+    company_id: int,
+    request: Request,
+    format: str = Query("csv", pattern=f"^({'|'.join(FORMATS)})$"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """Stream every worker and document of a company as CSV or XLSX"""
+    
+    # Check permissions
+    if (current_user.role != "admin" and 
+        current_user.company_id != company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    company = await db.get(company_models.Company, company_id)
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    media_type, extension = FORMATS[format]
+    filename = f"compliance-{company.rut}-{date.today().isoformat()}.{extension}"
+    # The stream outlives this endpoint, so it reads on a session it owns
+    return StreamingResponse(
+        export_stream(read_session(request), company_id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    )
+
+async def _compliance_report(db: AsyncSession, company_id: int) -> dict:
     # Get company statistics
-    total_workers = db.query(func.count(worker_models.Worker.id)).filter(
+    total_workers = await db.scalar(select(func.count(worker_models.Worker.id)).where(
         worker_models.Worker.company_id == company_id,
         worker_models.Worker.is_active == True
-    ).scalar()
-    
-    total_documents = db.query(func.count(doc_models.Document.id)).filter(
-        doc_models.Document.company_id == company_id
-    ).scalar()
-    
-    # Documents by status
-    doc_stats = db.query(
-        doc_models.Document.status,
-        func.count(doc_models.Document.id)
-    ).filter(
-        doc_models.Document.company_id == company_id
-    ).group_by(doc_models.Document.status).all()
+    ))
+    
+    # Totals and statuses come from the rollup, as in GET /companies/
+    stats = await db.get(CompanyComplianceStats, company_id)
+    documents_by_status = {
+        status.value: getattr(stats, column)
+        for status, column in STATUS_COLUMNS.items()
+        if stats is not None and getattr(stats, column)
+    }
     
     # Document types compliance
-    type_stats = db.query(
+    type_stats = (await db.execute(select(
         doc_models.Document.type,
         func.count(doc_models.Document.id),
-        func.count(func.nullif(doc_models.Document.status != "approved", True))
-    ).filter(
-        doc_models.Document.company_id == company_id
-    ).group_by(doc_models.Document.type).all()
-    
-    # Expiring documents (next 30 days)
-    from datetime import datetime, timedelta
-    expiring_soon = db.query(func.count(doc_models.Document.id)).filter(
+        func.count(func.nullif(doc_models.Document.status != doc_models.DocumentStatus.APPROVED, True))
+    ).where(
         doc_models.Document.company_id == company_id,
-        doc_models.Document.expiry_date.between(
-            datetime.now(),
-            datetime.now() + timedelta(days=30)
-        )
-    ).scalar()
+        doc_models.Document.is_active == True
+    ).group_by(doc_models.Document.type))).all()
+    
+    # Expiring documents, precomputed by the expiry engine when it has run
+    if stats is not None and stats.expiring_refreshed_at is not None:
+        expiring_soon = stats.expiring_count
+    else:
+        today = date.today()
+        expiring_soon = await db.scalar(select(func.count(doc_models.Document.id)).where(
+            doc_models.Document.company_id == company_id,
+            doc_models.Document.expiry_date.between(today, today + timedelta(days=settings.EXPIRY_WARNING_DAYS)),
+            doc_models.Document.status != doc_models.DocumentStatus.EXPIRED,
+            doc_models.Document.is_active == True
+        ))
     
     return {
         "company_id": company_id,
         "total_workers": total_workers,
-        "total_documents": total_documents,
-        "documents_by_status": {status: count for status, count in doc_stats},
+        "total_documents": stats.documents_count if stats else 0,
+        "documents_by_status": documents_by_status,
         "documents_by_type": [
             {
                 "type": doc_type,
@@ -239,8 +268,5 @@ def get_company_compliance_report(
             for doc_type, total, approved in type_stats
         ],
         "expiring_soon": expiring_soon,
-        "overall_compliance": (
-            dict(doc_stats).get("approved", 0) / total_documents * 100
-            if total_documents > 0 else 0
-        )
+        "overall_compliance": compliance_percentage(stats)
     }
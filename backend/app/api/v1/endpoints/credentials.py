@@ -0,0 +1,187 @@
+# backend/app/api/v1/endpoints/credentials.py
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ....core.config import settings
+from ....core.database import AsyncSessionLocal, get_db
+from ....core.security import get_current_user
+from ....models.compliance import WorkerComplianceStats
+from ....models.credential import Credential, GateChange
+from ....models.worker import Worker
+from ....schemas import credential as schemas
+from ....services import gate_snapshot
+from ....services.qr_service import as_utc, credential_verifier, sign_credential, worker_snapshot
+
+router = APIRouter()
+
+ISSUER_ROLES = ["admin", "rrhh", "prevencionista"]
+VERIFIER_ROLES = ["admin", "guardia", "prevencionista"]
+GATE_ROLES = ["admin", "guardia"]
+
+@router.post("/", response_model=schemas.CredentialResponse)
+async def issue_credential(
+    credential_data: schemas.CredentialCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Issue a QR credential for a worker"""
+    if current_user.role not in ISSUER_ROLES:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    worker = await db.get(Worker, credential_data.worker_id)
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker not found")
+    
+    if current_user.role != "admin" and current_user.company_id != worker.company_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Stored naive, so pin it to UTC first; the token and the row must agree
+    valid_until = as_utc(credential_data.valid_until or (
+        datetime.now(timezone.utc) + timedelta(days=settings.CREDENTIAL_VALID_DAYS)
+    ))
+    
+    # The token embeds the credential id, so sign once the row has one
+    placeholder = secrets.token_urlsafe(24)
+    credential = Credential(
+        qr_code=placeholder,
+        token=placeholder,
+        valid_until=valid_until,
+        worker_id=worker.id,
+        created_by=current_user.id
+    )
+    db.add(credential)
+    await db.flush()
+    credential.token = credential.qr_code = sign_credential(credential.id, worker.id, valid_until)
+    db.add(GateChange(company_id=worker.company_id, worker_id=worker.id))
+    await db.commit()
+    await db.refresh(credential)
+    # The worker may be new since the last refresh; make the credential scannable here at once
+    stats = await db.get(WorkerComplianceStats, worker.id)
+    credential_verifier.add_worker(worker.id, worker_snapshot(worker, stats))
+    
+    return credential
+
+@router.post("/{credential_id}/revoke", response_model=schemas.CredentialResponse)
+async def revoke_credential(
+    credential_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Revoke a credential; other API processes refuse it after their next refresh"""
+    if current_user.role not in ISSUER_ROLES:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    credential = await db.get(Credential, credential_id)
+    if not credential:
+        raise HTTPException(status_code=404, detail="Credential not found")
+    
+    worker = await db.get(Worker, credential.worker_id)
+    if current_user.role != "admin" and current_user.company_id != worker.company_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if credential.revoked_at is None:
+        credential.revoked_at = datetime.now(timezone.utc)
+        credential.is_active = False
+        db.add(GateChange(company_id=worker.company_id, worker_id=worker.id))
+        await db.commit()
+    credential_verifier.revoke(credential.id, credential.valid_until)
+    
+    return credential
+
+@router.post("/verify", response_model=schemas.CredentialVerification)
+async def verify_credential(
+    payload: schemas.CredentialVerify,
+    response: Response,
+    current_user = Depends(get_current_user)
+):
+    """Check a scanned QR token at the gate; answered from memory"""
+    if current_user.role not in VERIFIER_ROLES:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    result = credential_verifier.verify(payload.token)
+    response.headers["Server-Timing"] = f"verify;dur={credential_verifier.durations[-1] * 1000:.3f}"
+    
+    worker = result.worker
+    return {
+        "valid": result.valid,
+        "reason": result.reason,
+        "credential_id": result.credential_id,
+        "worker_id": result.worker_id,
+        "worker_run": worker.run if worker else None,
+        "worker_name": worker.name if worker else None,
+        "company_id": worker.company_id if worker else None,
+        "compliance_status": worker.compliance_status if worker else None,
+        "valid_until": result.valid_until
+    }
+
+def _gate_company(current_user, company_id: Optional[int]) -> int:
+    if current_user.role not in GATE_ROLES:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if current_user.role != "admin":
+        if current_user.company_id is None or company_id not in (None, current_user.company_id):
+            raise HTTPException(status_code=403, detail="Not authorized")
+        return current_user.company_id
+    if company_id is None:
+        raise HTTPException(status_code=400, detail="company_id is required")
+    return company_id
+
+async def _stream(db: AsyncSession, body):
+    # The session outlives the endpoint, so the stream owns it
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        await db.close()
+
+def _gate_response(db: AsyncSession, body, version: int) -> StreamingResponse:
+    return StreamingResponse(
+        _stream(db, body),
+        media_type="application/octet-stream",
+        headers={"X-Gate-Version": str(version), "Cache-Control": "no-store"}
+    )
+
+@router.get("/gate/public-key")
+async def gate_public_key(current_user = Depends(get_current_user)):
+    """Key gate devices check snapshot and delta signatures with"""
+    if current_user.role not in GATE_ROLES:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return {"algorithm": "Ed25519", "public_key": gate_snapshot.public_key()}
+
+@router.get("/gate/snapshot")
+async def gate_snapshot_download(
+    company_id: Optional[int] = None,
+    current_user = Depends(get_current_user)
+):
+    """Signed snapshot of a company's active credentials for offline gates"""
+    company_id = _gate_company(current_user, company_id)
+    # Read from the primary: the version must never run ahead of the rows
+    db = AsyncSessionLocal()
+    try:
+        version = await gate_snapshot.settled_version(db, company_id)
+    except BaseException:
+        await db.close()
+        raise
+    return _gate_response(db, gate_snapshot.stream_snapshot(db, company_id, version), version)
+
+@router.get("/gate/delta")
+async def gate_delta_download(
+    since: int = Query(..., ge=0),
+    company_id: Optional[int] = None,
+    current_user = Depends(get_current_user)
+):
+    """Signed changes since a snapshot or delta version; 410 means resync from a snapshot"""
+    company_id = _gate_company(current_user, company_id)
+    db = AsyncSessionLocal()
+    try:
+        await gate_snapshot.check_delta_start(db, company_id, since)
+        version = max(since, await gate_snapshot.settled_version(db, company_id))
+    except gate_snapshot.SnapshotRequired:
+        await db.close()
+        raise HTTPException(status_code=410, detail="Delta no longer available; download a snapshot")
+    except BaseException:
+        await db.close()
+        raise
+    return _gate_response(db, gate_snapshot.stream_delta(db, company_id, since, version), version)
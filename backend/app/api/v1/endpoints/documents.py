@@ -1,20 +1,60 @@
 # backend/app/api/v1/endpoints/documents.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import hashlib
+import mimetypes
 import os
+import zipfile
+import aiofiles.os
+from ....core.config import settings
 from ....core.database import get_db
+from ....core.replicas import get_read_db
 from ....models import document as models
+from ....models.observation import Observation
+from ....models.worker import Worker
 from ....schemas import document as schemas
 from ....core.security import get_current_user
-from ....services.document_validator import DocumentValidator
+from ....services.loaders import build_documents_with_observations
+from ....models.blob import FileBlob
+from ....services.file_delivery import (
+    FileDelivery, FileRangeResponse, RangeNotSatisfiable,
+    accel_redirect_headers, is_range_current, parse_range
+)
+from ....services.preview_service import SIZES, PreviewUnavailable, get_preview_service
+from ....services.storage import MULTIPART_OVERHEAD, FileTooLargeError, iter_upload, write_temp
+from ....services.blob_store import store_blob, release_blob
+from ....services.validation_queue import enqueue_validation, get_latest_job
+from ....services.bulk_ingest import (
+    BulkIngest,
+    ManifestError,
+    parse_manifest,
+    find_archive_manifest,
+    iter_archive_member,
+    MANIFEST_NAMES
+)
+from ....services.compliance_rollup import (
+    as_model_status,
+    record_document_added,
+    record_document_status_change,
+    record_document_removed
+)
+from ....services.notification_service import document_event, enqueue_events
+from ....models.notification import NotificationKind
+from ....utils.etag import conditional_list, etag_matches, latest
+from ....utils.pagination import PageParams, keyset, paginate
+from ....utils.responses import ndjson_response, response_columns, rows_response, wants_ndjson
 
 router = APIRouter()
 
+DOCUMENT_COLUMNS = response_columns(schemas.DocumentResponse, models.Document)
+
 @router.post("/upload", response_model=schemas.DocumentResponse)
 async def upload_document(
+    request: Request,
     file: UploadFile = File(...),
     name: str = Form(...),
     type: schemas.DocumentType = Form(...),
@@ -22,113 +62,370 @@ async def upload_document(
     company_id: int = Form(...),
     issue_date: Optional[str] = Form(None),
     expiry_date: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Upload a new document with automatic validation"""
+    """Upload a new document and queue it for validation"""
+    
+    # Reject oversize requests before reading the body
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > settings.MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail="File too large")
     
     # Validate file extension
     file_extension = os.path.splitext(file.filename)[1].lower()
-    if file_extension not in ['.pdf', '.jpg', '.jpeg', '.png']:
+    if file_extension not in settings.ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Invalid file format")
     
-    # Save file
-    file_content = await file.read()
-    file_hash = hashlib.sha256(file_content).hexdigest()
-    
-    # Create upload directory if not exists
-    upload_dir = f"uploads/{company_id}/{worker_id}"
-    os.makedirs(upload_dir, exist_ok=True)
+    # Stream file to disk, hashing as it is written
+    try:
+        temp = await write_temp(iter_upload(file))
+    except FileTooLargeError:
+        raise HTTPException(status_code=413, detail="File too large")
     
-    # Save file with unique name
-    file_path = f"{upload_dir}/{datetime.now().timestamp()}_{file.filename}"
-    with open(file_path, "wb") as f:
-        f.write(file_content)
-    
-    # Validate document (OCR, format, etc.)
-    validator = DocumentValidator()
-    validation_result = await validator.validate(file_path, type)
+    # Identical content is stored once and shared
+    blob = await store_blob(db, temp)
     
     # Create database record
     db_document = models.Document(
         name=name,
-        type=type,
-        file_path=file_path,
-        file_hash=file_hash,
+        type=models.DocumentType(type.value),
+        file_path=blob.path,
+        file_hash=blob.file_hash,
         worker_id=worker_id,
         company_id=company_id,
         uploaded_by=current_user.id,
-        status=schemas.DocumentStatus.PENDING if not validation_result.is_valid 
-               else schemas.DocumentStatus.APPROVED,
+        status=models.DocumentStatus.PENDING,
         issue_date=datetime.fromisoformat(issue_date) if issue_date else None,
         expiry_date=datetime.fromisoformat(expiry_date) if expiry_date else None
     )
     
     db.add(db_document)
-    db.commit()
-    db.refresh(db_document)
+    await db.flush()
+    await db.run_sync(record_document_added, db_document)
+    
+    # Validation (OCR, format, etc.) runs out of band; the document stays
+    # pending until a validation worker finishes the job
+    await db.run_sync(enqueue_validation, db_document)
+    await db.commit()
+    await db.refresh(db_document)
     
-    # Create observations if validation failed
-    if not validation_result.is_valid:
-        for error in validation_result.errors:
-            # Create observation logic here
-            pass
+    if settings.PREVIEW_EAGER:
+        get_preview_service().schedule(blob.path, blob.file_hash)
     
     return db_document
 
+@router.post("/bulk", response_model=schemas.BulkIngestResponse)
+async def bulk_upload_documents(
+    company_id: int = Form(...),
+    files: List[UploadFile] = File([]),
+    archive: Optional[UploadFile] = File(None),
+    manifest: Optional[UploadFile] = File(None),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Upload many documents, or a ZIP archive, described by a CSV/JSON manifest"""
+    
+    if (current_user.role != "admin" and 
+        current_user.company_id != company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if not files and archive is None:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    
+    zip_file = None
+    try:
+        if archive is not None:
+            try:
+                zip_file = zipfile.ZipFile(archive.file)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail="Invalid ZIP archive")
+        
+        # Manifest from the form, or bundled inside the archive
+        try:
+            if manifest is not None:
+                entries = parse_manifest(await manifest.read(), manifest.filename)
+            else:
+                entries = find_archive_manifest(zip_file) if zip_file else None
+        except ManifestError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        if entries is None:
+            raise HTTPException(status_code=400, detail="Manifest required")
+        
+        ingest = BulkIngest(db, company_id, entries, current_user.id)
+        await ingest.load_workers()
+        
+        if zip_file is not None:
+            for info in zip_file.infolist():
+                if info.is_dir() or info.filename.lower() in MANIFEST_NAMES:
+                    continue
+                await ingest.add(info.filename, iter_archive_member(zip_file, info))
+        
+        for upload in files:
+            await ingest.add(upload.filename, iter_upload(upload))
+        
+        return await ingest.finish()
+    finally:
+        if zip_file is not None:
+            zip_file.close()
+
 @router.get("/worker/{worker_id}", response_model=List[schemas.DocumentResponse])
-def get_worker_documents(
+async def get_worker_documents(
     worker_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get all documents for a specific worker"""
-    documents = db.query(models.Document).filter(
-        models.Document.worker_id == worker_id
-    ).all()
-    return documents
+    query = select(*DOCUMENT_COLUMNS).where(
+        models.Document.worker_id == worker_id,
+        models.Document.is_active == True
+    )
+    if wants_ndjson(request):
+        return ndjson_response(request, keyset(query, page, (models.Document.id,)))
+    not_modified = await conditional_list(request, response, db, query, current_user, latest(
+        models.Document.created_at, models.Document.updated_at
+    ), page)
+    if not_modified:
+        return not_modified
+    rows = await paginate(db, query, page, response, (models.Document.id,))
+    return rows_response(rows, response)
+
+@router.get("/worker/{worker_id}/with-observations", response_model=List[schemas.DocumentWithObservations])
+async def get_worker_documents_with_observations(
+    worker_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """Get all documents for a worker with their observations embedded"""
+    worker = await db.get(Worker, worker_id)
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker not found")
+    
+    if (current_user.role != "admin" and 
+        current_user.company_id != worker.company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    query = select(models.Document).where(
+        models.Document.worker_id == worker_id,
+        models.Document.is_active == True
+    )
+    documents = await paginate(db, query, page, response, (models.Document.id,))
+    return await db.run_sync(build_documents_with_observations, documents)
 
 @router.get("/expiring", response_model=List[schemas.DocumentResponse])
-def get_expiring_documents(
-    days: int = 30,
-    db: Session = Depends(get_db),
+async def get_expiring_documents(
+    request: Request,
+    response: Response,
+    days: int = Query(30, ge=0, le=365),
+    company_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
-    """Get documents expiring in the next N days"""
-    expiry_date = datetime.now() + timedelta(days=days)
+    """Get documents expiring in the next N days, soonest first"""
+    today = date.today()
+    
+    # Same predicate as the expiry engine's partial index
+    query = select(*DOCUMENT_COLUMNS).where(
+        models.Document.expiry_date.between(today, today + timedelta(days=days)),
+        models.Document.status != models.DocumentStatus.EXPIRED,
+        models.Document.is_active == True
+    )
     
-    documents = db.query(models.Document).filter(
-        models.Document.expiry_date <= expiry_date,
-        models.Document.expiry_date >= datetime.now(),
-        models.Document.status != schemas.DocumentStatus.EXPIRED
-    ).all()
+    if current_user.role != "admin":
+        query = query.where(models.Document.company_id == current_user.company_id)
+    elif company_id:
+        query = query.where(models.Document.company_id == company_id)
     
-    return documents
+    order = (models.Document.expiry_date, models.Document.id)
+    if wants_ndjson(request):
+        return ndjson_response(request, keyset(query, page, order))
+    rows = await paginate(db, query, page, response, order)
+    return rows_response(rows, response)
+
+@router.get("/{document_id}/validation", response_model=schemas.ValidationStatusResponse)
+async def get_document_validation(
+    document_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """Get validation progress and the observations it raised"""
+    document = await db.get(models.Document, document_id)
+    
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    if (current_user.role != "admin" and 
+        current_user.company_id != document.company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    job = await db.run_sync(get_latest_job, document_id)
+    observations = (await db.scalars(select(Observation).where(
+        Observation.document_id == document_id,
+        Observation.created_by.is_(None)
+    ))).all()
+    
+    return {
+        "document_id": document.id,
+        "document_status": document.status.value,
+        "job_status": job.status.value if job else None,
+        "attempts": job.attempts if job else 0,
+        "last_error": job.last_error if job else None,
+        "enqueued_at": job.created_at if job else None,
+        "finished_at": job.finished_at if job else None,
+        "observations": observations
+    }
+
+@router.api_route("/{document_id}/file", methods=["GET", "HEAD"])
+async def download_document_file(
+    document_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """Stream the stored file; supports Range requests for lazy-loading viewers"""
+    document = await db.get(models.Document, document_id)
+    
+    if not document or not document.is_active:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    if (current_user.role != "admin" and 
+        current_user.company_id != document.company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    try:
+        stat = await aiofiles.os.stat(document.file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    blob = await db.get(FileBlob, document.file_hash) if document.file_hash else None
+    media_type = (
+        (blob.content_type if blob else None)
+        or mimetypes.guess_type(document.file_path)[0]
+        or "application/octet-stream"
+    )
+    delivery = FileDelivery(
+        path=document.file_path,
+        size=stat.st_size,
+        etag=f'"{document.file_hash or f"{stat.st_size:x}-{stat.st_mtime_ns:x}"}"',
+        media_type=media_type,
+        filename=document.name + (mimetypes.guess_extension(media_type) or "")
+    )
+    
+    if etag_matches(request, delivery.etag):
+        return Response(status_code=304, headers={"ETag": delivery.etag})
+    
+    accel = accel_redirect_headers(delivery)
+    if accel:
+        return Response(headers=accel)
+    
+    try:
+        byte_range = parse_range(request.headers.get("range"), delivery.size) if is_range_current(request, delivery.etag) else None
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{delivery.size}"})
+    
+    return FileRangeResponse(delivery, byte_range, request.method)
+
+@router.get("/{document_id}/preview")
+async def get_document_preview(
+    document_id: int,
+    request: Request,
+    size: str = Query("thumb", pattern=f"^({'|'.join(SIZES)})$"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """WebP thumbnail or first-page preview, rendered on first request"""
+    document = await db.get(models.Document, document_id)
+    
+    if not document or not document.is_active:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    if (current_user.role != "admin" and 
+        current_user.company_id != document.company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # A document's file never changes, so neither does its preview;
+    # files stored before content addressing are keyed by path
+    file_key = document.file_hash or hashlib.sha256(document.file_path.encode()).hexdigest()
+    headers = {
+        "ETag": f'"{file_key}-{size}"',
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        path = await get_preview_service().get(document.file_path, file_key, SIZES[size])
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    except PreviewUnavailable:
+        raise HTTPException(status_code=422, detail="Preview not available for this file")
+    
+    return FileResponse(path, media_type="image/webp", headers=headers)
 
 @router.patch("/{document_id}", response_model=schemas.DocumentResponse)
-def update_document_status(
+async def update_document_status(
     document_id: int,
     update_data: schemas.DocumentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Update document status (approve/observe)"""
-    document = db.query(models.Document).filter(
-        models.Document.id == document_id
-    ).first()
+    document = await db.scalar(select(models.Document).where(
+        models.Document.id == document_id,
+        models.Document.is_active == True
+    ))
     
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
     if update_data.status:
-        document.status = update_data.status
+        old_status = document.status
+        document.status = as_model_status(update_data.status)
         document.reviewed_by = current_user.id
         document.review_date = datetime.now()
+        await db.run_sync(record_document_status_change, document, old_status)
+        if document.status == models.DocumentStatus.APPROVED and old_status != document.status:
+            await db.run_sync(enqueue_events, [
+                document_event(NotificationKind.DOCUMENT_APPROVED, document, f"{document.name} approved")
+            ])
     
     if update_data.review_comments:
         document.review_comments = update_data.review_comments
     
-    db.commit()
-    db.refresh(document)
+    await db.commit()
+    await db.refresh(document)
     
     return document
+
+@router.delete("/{document_id}")
+async def delete_document(
+    document_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Soft delete a document"""
+    document = await db.scalar(select(models.Document).where(
+        models.Document.id == document_id,
+        models.Document.is_active == True
+    ))
+    
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    if (current_user.role != "admin" and 
+        current_user.company_id != document.company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Soft delete
+    document.is_active = False
+    await db.run_sync(record_document_removed, document)
+    await db.run_sync(release_blob, document.file_hash)
+    await db.commit()
+    
+    return {"message": "Document deleted successfully"}
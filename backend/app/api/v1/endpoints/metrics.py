@@ -0,0 +1,28 @@
+# backend/app/api/v1/endpoints/metrics.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ....core.metrics import collect_metrics
+from ....core.replicas import get_read_db
+from ....core.security import get_current_admin_user
+from ....services.blob_store import storage_savings
+
+router = APIRouter()
+
+@router.get("/")
+def get_metrics(
+    current_user = Depends(get_current_admin_user)
+):
+    """Get in-process runtime metrics (admin only)"""
+    return collect_metrics()
+
+@router.get("/storage")
+async def get_storage_savings(
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """Bytes saved by photo normalization, per company (admin only)"""
+    companies = await db.run_sync(storage_savings)
+    return {
+        "companies": companies,
+        "bytes_saved": sum(company["bytes_saved"] for company in companies),
+    }
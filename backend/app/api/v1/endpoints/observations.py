@@ -1,89 +1,110 @@
 # backend/app/api/v1/endpoints/observations.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 from ....core.database import get_db
+from ....core.replicas import get_read_db
 from ....models import observation as models
+from ....models.document import Document
 from ....schemas import observation as schemas
 from ....core.security import get_current_user
+from ....models.notification import NotificationKind
+from ....services.notification_service import document_event, enqueue_events
+from ....utils.etag import conditional_list, latest
+from ....utils.pagination import PageParams, paginate
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.ObservationResponse)
-def create_observation(
+async def create_observation(
     observation: schemas.ObservationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create a new observation for a document"""
+    document = await db.get(Document, observation.document_id)
+    
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
     db_observation = models.Observation(
         **observation.dict(),
         created_by=current_user.id
     )
     
     db.add(db_observation)
-    db.commit()
-    db.refresh(db_observation)
+    await db.run_sync(enqueue_events, [document_event(
+        NotificationKind.OBSERVATION_CREATED, document,
+        f"{document.name}: {observation.title}", observation.description
+    )])
+    await db.commit()
+    await db.refresh(db_observation)
     
     return db_observation
 
 @router.get("/document/{document_id}", response_model=List[schemas.ObservationResponse])
-def get_document_observations(
+async def get_document_observations(
     document_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get all observations for a document"""
-    observations = db.query(models.Observation).filter(
+    observations = (await db.scalars(select(models.Observation).where(
         models.Observation.document_id == document_id
-    ).all()
+    ))).all()
     
     return observations
 
 @router.get("/", response_model=List[schemas.ObservationResponse])
-def get_observations(
+async def get_observations(
+    request: Request,
+    response: Response,
     status: Optional[schemas.ObservationStatus] = Query(None),
     type: Optional[schemas.ObservationType] = Query(None),
     company_id: Optional[int] = Query(None),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get observations with filters"""
-    query = db.query(models.Observation)
+    query = select(models.Observation)
     
     if status:
-        query = query.filter(models.Observation.status == status)
+        query = query.where(models.Observation.status == status)
     
     if type:
-        query = query.filter(models.Observation.type == type)
+        query = query.where(models.Observation.type == type)
     
     # Filter by company if user is not admin
     if current_user.role != "admin" and current_user.company_id:
-        query = query.join(models.Observation.document).filter(
-            models.Document.company_id == current_user.company_id
+        query = query.join(models.Observation.document).where(
+            Document.company_id == current_user.company_id
         )
     elif company_id:
-        query = query.join(models.Observation.document).filter(
-            models.Document.company_id == company_id
+        query = query.join(models.Observation.document).where(
+            Document.company_id == company_id
         )
     
-    observations = query.offset(skip).limit(limit).all()
+    not_modified = await conditional_list(request, response, db, query, current_user, latest(
+        models.Observation.created_at, models.Observation.updated_at
+    ), page)
+    if not_modified:
+        return not_modified
+    
+    observations = await paginate(db, query, page, response, (models.Observation.id,))
     return observations
 
 @router.patch("/{observation_id}", response_model=schemas.ObservationResponse)
-def resolve_observation(
+async def resolve_observation(
     observation_id: int,
     update_data: schemas.ObservationUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Resolve or update an observation"""
-    observation = db.query(models.Observation).filter(
-        models.Observation.id == observation_id
-    ).first()
+    observation = await db.get(models.Observation, observation_id)
     
     if not observation:
         raise HTTPException(status_code=404, detail="Observation not found")
@@ -98,29 +119,27 @@ def resolve_observation(
     if update_data.resolution_comments:
         observation.resolution_comments = update_data.resolution_comments
     
-    db.commit()
-    db.refresh(observation)
+    await db.commit()
+    await db.refresh(observation)
     
     return observation
 
 @router.delete("/{observation_id}")
-def delete_observation(
+async def delete_observation(
     observation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Delete an observation (admin only)"""
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    observation = db.query(models.Observation).filter(
-        models.Observation.id == observation_id
-    ).first()
+    observation = await db.get(models.Observation, observation_id)
     
     if not observation:
         raise HTTPException(status_code=404, detail="Observation not found")
     
-    db.delete(observation)
-    db.commit()
+    await db.delete(observation)
+    await db.commit()
     
     return {"message": "Observation deleted successfully"}
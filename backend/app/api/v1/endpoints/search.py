@@ -0,0 +1,23 @@
+# backend/app/api/v1/endpoints/search.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ....core.replicas import get_read_db
+from ....core.security import get_current_user
+from ....schemas import search as schemas
+from ....services.search import search
+
+router = APIRouter()
+
+@router.get("/", response_model=schemas.SearchResponse)
+async def search_companies_and_workers(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """Typeahead search over companies (RUT, name) and workers (RUN, name)"""
+    company_id = None
+    if current_user.role != "admin" and current_user.company_id:
+        company_id = current_user.company_id
+    
+    return await db.run_sync(search, q, company_id, limit)
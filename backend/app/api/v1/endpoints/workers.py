@@ -1,99 +1,132 @@
 # backend/app/api/v1/endpoints/workers.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, Form
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from ....core.database import get_db
+from ....core.replicas import get_read_db
 from ....models import worker as worker_models
-from ....models import document as doc_models
+from ....models.compliance import WorkerComplianceStats
 from ....schemas import worker as schemas
 from ....core.security import get_current_user
+from ....services.compliance_rollup import record_worker_added, worker_compliance_status_column
+from ....services.loaders import build_worker_with_documents
+from ....services.worker_import import WorkerImport, ImportFormatError, iter_rows
+from ....services.search import worker_search_condition
+from ....utils.etag import conditional_list, latest
+from ....utils.pagination import PageParams, keyset, paginate
+from ....utils.responses import ndjson_response, response_columns, rows_response, wants_ndjson
+from ....utils.validators import normalize_run, split_run
 
 router = APIRouter()
 
+WORKER_COLUMNS = response_columns(
+    schemas.WorkerResponse, worker_models.Worker,
+    documents_count=func.coalesce(WorkerComplianceStats.documents_count, 0),
+    compliance_status=worker_compliance_status_column()
+)
+
 @router.post("/", response_model=schemas.WorkerResponse)
-def create_worker(
+async def create_worker(
     worker: schemas.WorkerCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create a new worker"""
     
-    # Check if worker already exists
-    existing = db.query(worker_models.Worker).filter(
-        worker_models.Worker.run == worker.run
-    ).first()
+    run = normalize_run(worker.run)
+    if run is None:
+        raise HTTPException(status_code=400, detail="Invalid RUN")
+    
+    # Check if worker already exists; rows stored before RUNs were
+    # normalized only match on their digits
+    number, check_digit = split_run(run)
+    existing = await db.scalar(select(worker_models.Worker).where(or_(
+        worker_models.Worker.run == run,
+        and_(worker_models.Worker.run_number == number, worker_models.Worker.run_dv == check_digit)
+    )))
     
     if existing:
         raise HTTPException(status_code=400, detail="Worker already exists")
     
-    db_worker = worker_models.Worker(**worker.dict())
+    db_worker = worker_models.Worker(**dict(worker.dict(), run=run))
     db.add(db_worker)
-    db.commit()
-    db.refresh(db_worker)
+    await db.flush()
+    await db.run_sync(record_worker_added, db_worker)
+    await db.commit()
+    await db.refresh(db_worker)
     
     return db_worker
 
+@router.post("/import", response_model=schemas.WorkerImportResponse)
+async def import_workers(
+    file: UploadFile = File(...),
+    company_id: int = Form(...),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Create or update workers in bulk from a CSV/XLSX roster"""
+    
+    if (current_user.role != "admin" and 
+        current_user.company_id != company_id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    try:
+        rows = iter_rows(file.file, file.filename)
+        return await WorkerImport(db, company_id).run(rows)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 @router.get("/", response_model=List[schemas.WorkerResponse])
-def get_workers(
+async def get_workers(
+    request: Request,
+    response: Response,
     company_id: Optional[int] = Query(None),
     is_active: Optional[bool] = Query(True),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    search: Optional[str] = Query(None, min_length=2),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get list of workers with filters"""
-    query = db.query(worker_models.Worker)
+    query = select(*WORKER_COLUMNS).outerjoin(
+        WorkerComplianceStats,
+        WorkerComplianceStats.worker_id == worker_models.Worker.id
+    )
     
     if company_id:
-        query = query.filter(worker_models.Worker.company_id == company_id)
+        query = query.where(worker_models.Worker.company_id == company_id)
     
     if is_active is not None:
-        query = query.filter(worker_models.Worker.is_active == is_active)
+        query = query.where(worker_models.Worker.is_active == is_active)
+    
+    if search:
+        query = query.where(worker_search_condition(db, search))
     
-    workers = query.offset(skip).limit(limit).all()
+    if wants_ndjson(request):
+        return ndjson_response(request, keyset(query, page, (worker_models.Worker.id,)))
     
-    # Add document count and compliance status
-    for worker in workers:
-        worker.documents_count = db.query(func.count(doc_models.Document.id)).filter(
-            doc_models.Document.worker_id == worker.id
-        ).scalar()
-        
-        # Calculate compliance status
-        approved_docs = db.query(func.count(doc_models.Document.id)).filter(
-            doc_models.Document.worker_id == worker.id,
-            doc_models.Document.status == "approved"
-        ).scalar()
-        
-        if worker.documents_count == 0:
-            worker.compliance_status = "no_documents"
-        elif approved_docs == worker.documents_count:
-            worker.compliance_status = "compliant"
-        else:
-            worker.compliance_status = "non_compliant"
+    not_modified = await conditional_list(request, response, db, query, current_user, latest(
+        worker_models.Worker.created_at, worker_models.Worker.updated_at, WorkerComplianceStats.updated_at
+    ), page)
+    if not_modified:
+        return not_modified
     
-    return workers
+    # Document count and compliance status come from the rollup join
+    rows = await paginate(db, query, page, response, (worker_models.Worker.id,))
+    return rows_response(rows, response)
 
 @router.get("/{worker_id}", response_model=schemas.WorkerWithDocuments)
-def get_worker_detail(
+async def get_worker_detail(
     worker_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get worker details with all documents"""
-    worker = db.query(worker_models.Worker).filter(
-        worker_models.Worker.id == worker_id
-    ).first()
+    worker = await db.get(worker_models.Worker, worker_id)
     
     if not worker:
         raise HTTPException(status_code=404, detail="Worker not found")
     
     # Get documents
-    documents = db.query(doc_models.Document).filter(
-        doc_models.Document.worker_id == worker_id
-    ).all()
-    
-    worker.documents = documents
-    
-    return worker
+    return await db.run_sync(build_worker_with_documents, worker)
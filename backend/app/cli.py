@@ -0,0 +1,204 @@
+# backend/app/cli.py
+"""Maintenance commands: python -m app.cli <command>"""
+import argparse
+import asyncio
+import json
+import logging
+from datetime import timedelta
+from sqlalchemy import or_, select, update
+from .core.config import settings
+from .core.database import SessionLocal, engine
+from .models import *
+from .services.compliance_rollup import reconcile_rollups
+from .services.blob_store import recount_references, collect_garbage, sweep_stray_files
+from .services.validation_queue import run_worker_pool
+from .services.expiry_engine import run_engine
+from .services.notification_service import dispatcher_name, run_dispatcher
+from .services.gate_snapshot import prune_changes
+from .utils.validators import normalize_run, split_run
+
+def rebuild_rollups(args):
+    """Recompute compliance rollups and repair drift"""
+    db = SessionLocal()
+    try:
+        drift = reconcile_rollups(db, company_id=args.company_id, fix=not args.check)
+        if args.check:
+            db.rollback()
+        else:
+            db.commit()
+    finally:
+        db.close()
+
+    for entry in drift:
+        print(json.dumps(entry))
+    action = "found" if args.check else "repaired"
+    print(f"{len(drift)} drifted rollup rows {action}")
+    return 1 if args.check and drift else 0
+
+def gc_blobs(args):
+    """Recount blob references and delete unreferenced blobs"""
+    grace = timedelta(hours=args.grace_hours)
+    db = SessionLocal()
+    try:
+        corrected = recount_references(db)
+        db.commit()
+        removed = collect_garbage(db, grace=grace)
+        stray = sweep_stray_files(db, grace=grace)
+    finally:
+        db.close()
+
+    print(f"{corrected} blob reference counts corrected")
+    print(f"{len(removed)} unreferenced blobs removed")
+    print(f"{len(stray)} blob files without a row removed")
+    return 0
+
+def validation_workers(args):
+    """Run the document validation worker pool in the foreground"""
+    run_worker_pool(args.workers)
+    return 0
+
+def expiry_engine(args):
+    """Expire overdue documents and refresh expiring-soon counts"""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    result = run_engine(once=args.once)
+    if result is not None:
+        print(f"{result.expired} documents expired in {result.batches} batches")
+        print(f"{result.expiring_rows_updated} expiring-soon counts updated")
+        if result.skipped:
+            print("another expiry engine holds the lock; pass skipped")
+    return 0
+
+def notification_dispatcher(args):
+    """Coalesce pending notifications into digests and send them"""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    try:
+        asyncio.run(run_dispatcher(dispatcher_name()))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def gc_gate_changes(args):
+    """Prune the offline gate change log"""
+    db = SessionLocal()
+    try:
+        removed = prune_changes(db, timedelta(days=args.days))
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"{removed} gate changes pruned; older gate versions must resync from a snapshot")
+    return 0
+
+def rebuild_search(args):
+    """Backfill normalized RUT/RUN keys and (re)build name search indexes"""
+    db = SessionLocal()
+    try:
+        # Older rows keep the RUN as typed; duplicate checks and the
+        # roster upsert expect the canonical 12345678-9
+        respelled = 0
+        legacy = db.execute(select(Worker.id, Worker.run).where(or_(
+            Worker.run.contains("."), Worker.run.contains(" "), ~Worker.run.contains("-"),
+            Worker.run.endswith("k"), Worker.run.startswith("0")
+        ))).all()
+        for worker_id, value in legacy:
+            run = normalize_run(value)
+            if run is None or run == value:
+                continue
+            twin = db.scalar(select(Worker.id).where(Worker.run == run))
+            if twin is not None:
+                print(f"Worker {worker_id} ({value}) duplicates worker {twin} ({run}); left unchanged")
+                continue
+            db.execute(update(Worker).where(Worker.id == worker_id).values(run=run))
+            respelled += 1
+
+        backfilled = 0
+        for model, key, number, dv in (
+            (Company, Company.rut, Company.rut_number, Company.rut_dv),
+            (Worker, Worker.run, Worker.run_number, Worker.run_dv),
+        ):
+            rows = db.execute(select(model.id, key).where(number.is_(None))).all()
+            for row_id, value in rows:
+                parts = split_run(value)
+                if parts:
+                    db.execute(
+                        update(model).where(model.id == row_id)
+                        .values({number: parts[0], dv: parts[1]})
+                    )
+                    backfilled += 1
+        db.commit()
+    finally:
+        db.close()
+
+    with engine.begin() as connection:
+        ensure_search_indexes(connection)
+
+    print(f"{respelled} worker RUNs normalized")
+    print(f"{backfilled} RUT/RUN keys backfilled; search indexes ready")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rollups = commands.add_parser(
+        "rebuild-rollups",
+        help="Recompute company/worker compliance rollups from the documents table"
+    )
+    rollups.add_argument("--company-id", type=int, help="Only rebuild this company")
+    rollups.add_argument("--check", action="store_true", help="Report drift without writing")
+    rollups.set_defaults(func=rebuild_rollups)
+
+    blobs = commands.add_parser(
+        "gc-blobs",
+        help="Delete stored files no active document references"
+    )
+    blobs.add_argument(
+        "--grace-hours", type=float, default=24,
+        help="Only delete blobs unreferenced for at least this long"
+    )
+    blobs.set_defaults(func=gc_blobs)
+
+    validation = commands.add_parser(
+        "validation-workers",
+        help="Drain the document validation queue"
+    )
+    validation.add_argument(
+        "--workers", type=int,
+        help="Number of worker processes (default: VALIDATION_WORKERS)"
+    )
+    validation.set_defaults(func=validation_workers)
+
+    expiry = commands.add_parser(
+        "expiry-engine",
+        help="Expire overdue documents every EXPIRY_ENGINE_INTERVAL seconds"
+    )
+    expiry.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    expiry.set_defaults(func=expiry_engine)
+
+    notifications = commands.add_parser(
+        "notification-dispatcher",
+        help="Send notification digests over SMTP"
+    )
+    notifications.set_defaults(func=notification_dispatcher)
+
+    gate = commands.add_parser(
+        "gc-gate-changes",
+        help="Prune the change log behind the offline gate delta feed"
+    )
+    gate.add_argument(
+        "--days", type=float, default=settings.GATE_CHANGE_RETENTION_DAYS,
+        help="Keep changes newer than this many days (default: GATE_CHANGE_RETENTION_DAYS)"
+    )
+    gate.set_defaults(func=gc_gate_changes)
+
+    search = commands.add_parser(
+        "rebuild-search",
+        help="Backfill RUT/RUN search keys and create name search indexes"
+    )
+    search.set_defaults(func=rebuild_search)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,9 +8,34 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     
     DATABASE_URL: str
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: int = 30  # seconds to wait for a connection
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds; replace older connections
+    DATABASE_POOL_PRE_PING: bool = True
+    # Read replicas for GET endpoints, as a JSON list; empty reads from the primary
+    DATABASE_REPLICA_URLS: list = []
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 5.0  # seconds between health checks
+    DATABASE_REPLICA_CHECK_TIMEOUT: float = 2.0
+    READ_YOUR_WRITES_WINDOW: float = 5.0  # seconds a user reads from the primary after writing
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL: float = 30.0  # seconds; 0 disables the cache
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_REFRESH_INTERVAL: float = 5.0  # seconds between polls for users changed by other processes
+    REPORT_CACHE_BACKEND: str = "memory"  # "memory", "shared" or "" to disable
+    REPORT_CACHE_SIZE: int = 10000
+    REPORT_CACHE_URL: Optional[str] = None  # redis:// URL for the shared backend; in-process stand-in when unset
+    REPORT_CACHE_TTL: float = 3600.0  # seconds superseded versions linger in the shared backend
+    
+    # Password hashing (stored hashes are upgraded on login when this changes)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 64  # pending operations beyond the workers
+    LOGIN_ATTEMPTS_PER_USERNAME: int = 10  # per LOGIN_RATE_WINDOW; 0 disables
+    LOGIN_ATTEMPTS_PER_IP: int = 300  # shared gate terminals sit behind one IP
+    LOGIN_RATE_WINDOW: int = 60  # seconds
     
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000"]
@@ -18,7 +43,71 @@ class Settings(BaseSettings):
     # File upload
     UPLOAD_FOLDER: str = "./uploads"
     MAX_FILE_SIZE: int = 10485760  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 1MB
+    DOWNLOAD_CHUNK_SIZE: int = 262144  # read size when the server cannot sendfile
+    DOWNLOAD_ACCEL_REDIRECT_PREFIX: Optional[str] = None  # e.g. "/protected-uploads"; nginx serves the bytes
     ALLOWED_EXTENSIONS: set = {".pdf", ".jpg", ".jpeg", ".png"}
+    IMAGE_NORMALIZATION: Optional[str] = None  # "jpeg" or "pdf" to re-encode uploaded photos; unset stores them verbatim
+    IMAGE_TARGET_DPI: int = 200  # photos are downscaled to an A4 page at this resolution
+    IMAGE_QUALITY: int = 80  # JPEG quality, also inside PDFs
+    IMAGE_NORMALIZATION_WORKERS: int = 2
+    BULK_MAX_ITEMS: int = 2000
+    WORKER_IMPORT_CHUNK_SIZE: int = 1000
+    
+    # List endpoints
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+    STREAM_BATCH_SIZE: int = 1000  # rows per server-side cursor fetch for NDJSON listings
+    
+    # Document validation queue
+    VALIDATION_WORKERS: int = 2
+    VALIDATION_POLL_INTERVAL: float = 1.0  # seconds
+    VALIDATION_MAX_ATTEMPTS: int = 3
+    VALIDATION_JOB_TIMEOUT: int = 300  # seconds before a running job is reclaimed
+    OBSERVATION_DEADLINE_DAYS: int = 7
+    
+    # Document expiry engine
+    EXPIRY_ENGINE_INTERVAL: float = 300.0  # seconds between passes
+    EXPIRY_ENGINE_BATCH_SIZE: int = 500
+    EXPIRY_WARNING_DAYS: int = 30  # window of the per-company "expiring soon" count
+    
+    # Gate credentials (QR payloads are HMAC-signed tokens)
+    CREDENTIAL_SIGNING_KEY: Optional[str] = None  # derived from SECRET_KEY when unset
+    CREDENTIAL_VALID_DAYS: int = 365
+    CREDENTIAL_REFRESH_INTERVAL: float = 5.0  # seconds between revocation/compliance refreshes
+    GATE_SNAPSHOT_SIGNING_KEY: Optional[str] = None  # base64 Ed25519 seed; derived from SECRET_KEY when unset
+    GATE_CHANGE_RETENTION_DAYS: int = 30  # older deltas fall back to a full snapshot
+    
+    # Notification digests (the dispatcher refuses to start without SMTP_HOST)
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 25
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = False  # implicit TLS, usually port 465
+    SMTP_START_TLS: bool = False
+    SMTP_TIMEOUT: float = 30.0
+    NOTIFICATION_FROM: str = "SSO Document Management <no-reply@localhost>"
+    NOTIFICATION_DIGEST_WINDOW: int = 900  # seconds a recipient's events are collected
+    NOTIFICATION_POLL_INTERVAL: float = 5.0
+    NOTIFICATION_BATCH_SIZE: int = 100  # digests claimed per cycle
+    NOTIFICATION_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_RETRY_BACKOFF: float = 30.0  # seconds, doubled per attempt
+    NOTIFICATION_LEASE_TIMEOUT: int = 300  # seconds before a stuck send is reclaimed
+    
+    # OCR (disabled when OCR_ENGINE is unset)
+    OCR_ENGINE: Optional[str] = None  # "tesseract" or "stub"
+    OCR_WORKERS: int = 2
+    OCR_CACHE_DIR: str = "./cache/ocr"
+    OCR_LANGUAGES: str = "spa"
+    OCR_MIN_TEXT_LENGTH: int = 20
+    METRICS_PUBLISH_INTERVAL: float = 15.0  # seconds between worker metrics snapshots
+    TESSERACT_CMD: Optional[str] = None
+    
+    # Document previews (WebP thumbnails and first pages)
+    PREVIEW_WORKERS: int = 2
+    PREVIEW_CACHE_DIR: str = "./cache/previews"
+    PREVIEW_CACHE_MAX_BYTES: int = 536870912  # 512MB; least recently used previews are evicted; 0 is unbounded
+    PREVIEW_EAGER: bool = False  # render after upload instead of on first request
     
     class Config:
         env_file = ".env"
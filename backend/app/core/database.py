@@ -1,19 +1,132 @@
 # backend/app/core/database.py
-from sqlalchemy import create_engine
+"""Database engines and sessions.
+
+The API serves requests from an async engine (asyncpg on Postgres,
+aiosqlite on SQLite). Services shared with the CLI and the validation
+worker processes stay synchronous and are called from endpoints through
+``AsyncSession.run_sync``; those processes use the sync ``engine``.
+Read-only endpoints may be routed to replicas, see ``core.replicas``.
+"""
+import time
+from collections import deque
+from fastapi import Request
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
+from .metrics import register_metrics
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of a sync URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.get_driver_name() in ("asyncpg", "aiosqlite") or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def pool_options() -> dict:
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection"""
+
+    samples = 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = deque(maxlen=self.samples)
+        self.checkouts = 0
+        self.saturated = 0
+        self.timeouts = 0
+
+    def _do_get(self):
+        if self.checkedout() >= self.size() + self._max_overflow:
+            self.saturated += 1
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        self.waits.append(time.perf_counter() - started)
+        self.checkouts += 1
+        return connection
+
+    def metrics(self) -> dict:
+        waits = sorted(self.waits)
+
+        def percentile(fraction: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * fraction))] * 1000, 3) if waits else 0.0
+
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "saturated_checkouts": self.saturated,
+            "timeouts": self.timeouts,
+            "checkout_wait_p50_ms": percentile(0.5),
+            "checkout_wait_p95_ms": percentile(0.95),
+            "checkout_wait_max_ms": round(waits[-1] * 1000, 3) if waits else 0.0,
+        }
+
+# Sync engine for the CLI, validation workers and benchmarks
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    async_database_url(SQLALCHEMY_DATABASE_URL),
+    poolclass=InstrumentedPool,
+    **pool_options()
+)
+# Objects stay loaded after commit; lazy refreshes cannot run implicitly
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Looked up on each call: dispose() replaces the pool
+register_metrics("database", lambda: async_engine.sync_engine.pool.metrics())
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+def dialect_insert(db, table):
+    """Return an INSERT construct supporting ON CONFLICT for the bound dialect"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    return insert(table)
+
+def try_advisory_lock(db, key: int) -> bool:
+    """Take a Postgres advisory lock until the current transaction ends.
+
+    Other backends have no advisory locks; callers there rely on their
+    guarded UPDATEs, so this always succeeds.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.scalar(select(func.pg_try_advisory_xact_lock(key))))
+
+async def get_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        # Commits on this session keep the caller on the primary for a while
+        db.info["request_state"] = request.state
         yield db
-    finally:
-        db.close()
\ No newline at end of file
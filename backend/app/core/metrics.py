@@ -0,0 +1,16 @@
+# backend/app/core/metrics.py
+"""In-process metrics registry.
+
+Subsystems register a callable returning a dict of current values; the
+metrics endpoint collects all of them on demand.
+"""
+from typing import Callable, Dict
+
+_providers: Dict[str, Callable[[], dict]] = {}
+
+def register_metrics(name: str, provider: Callable[[], dict]):
+    """Expose ``provider()`` under ``name``; re-registering replaces it"""
+    _providers[name] = provider
+
+def collect_metrics() -> Dict[str, dict]:
+    return {name: provider() for name, provider in _providers.items()}
@@ -0,0 +1,180 @@
+# backend/app/core/principal.py
+"""Cache of authenticated principals.
+
+``get_current_user`` would otherwise load the user row on every request.
+Principals are immutable snapshots of that row kept in a per-process
+TTL/LRU cache keyed by user id. Endpoints that change a user invalidate
+its entry after committing. Other processes poll ``users.updated_at``
+every ``PRINCIPAL_REFRESH_INTERVAL`` seconds and drop the entries of
+users changed since, so they see the change within that interval.
+Deactivation also bumps the user's ``token_version``, so tokens issued
+before it stop working as soon as the principal is reloaded.
+"""
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import select
+from .config import settings
+from .database import AsyncSessionLocal
+from .metrics import register_metrics
+from ..models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Rows committed slightly out of timestamp order are caught by re-reading
+# this far behind the watermark
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+@dataclass(frozen=True)
+class Principal:
+    """Read-only view of the authenticated user"""
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str]
+    role: UserRole
+    company_id: Optional[int]
+    is_active: bool
+    token_version: int
+    created_at: Optional[datetime] = None
+    last_login: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            company_id=user.company_id,
+            is_active=user.is_active,
+            token_version=user.token_version or 0,
+            created_at=user.created_at,
+            last_login=user.last_login
+        )
+
+class PrincipalCache:
+    """Thread-safe TTL/LRU map of user id to Principal"""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.refresh_failures = 0
+        self._since: Optional[datetime] = None
+        self._primed = False
+        self._seen: Dict[int, datetime] = {}  # user id -> updated_at read inside the overlap
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, principal: Principal):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    async def refresh(self):
+        """Invalidate users changed by any process since the last poll"""
+        query = select(User.id, User.updated_at).where(User.updated_at.isnot(None))
+        if self._since is not None:
+            query = query.where(User.updated_at >= self._since - REFRESH_OVERLAP)
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(query)).all()
+
+        latest = self._since
+        for user_id, updated_at in rows:
+            # Rows re-read inside the overlap were already applied
+            if self._primed and self._seen.get(user_id) != updated_at:
+                self.invalidate(user_id)
+            self._seen[user_id] = updated_at
+            if latest is None or updated_at > latest:
+                latest = updated_at
+        self._since = latest
+        self._primed = True
+        if latest is not None:
+            self._seen = {key: stamp for key, stamp in self._seen.items() if stamp >= latest - REFRESH_OVERLAP}
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(settings.PRINCIPAL_REFRESH_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception:
+                self.refresh_failures += 1
+                logger.exception("Principal cache refresh failed")
+
+    async def start(self):
+        """Set the watermark, then keep polling in the background"""
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        try:
+            await self.refresh()
+        except Exception:
+            self.refresh_failures += 1
+            logger.exception("Initial principal cache watermark failed; retrying in the background")
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "refresh_failures": self.refresh_failures,
+            }
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL, settings.PRINCIPAL_CACHE_SIZE)
+register_metrics("principal_cache", principal_cache.metrics)
+
+def invalidate_principal(user_id: int):
+    """Drop a cached principal; call after committing a change to the user"""
+    principal_cache.invalidate(user_id)
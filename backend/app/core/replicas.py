@@ -0,0 +1,218 @@
+# backend/app/core/replicas.py
+"""Routing of read-only endpoints to database replicas.
+
+With ``DATABASE_REPLICA_URLS`` set, endpoints depending on
+``get_read_db`` get a session on one of the replicas, picked round-robin
+among those passing the periodic health check. Writes always go through
+``get_db`` on the primary. After a request commits a write (a flush or
+an INSERT/UPDATE/DELETE statement), the response sets a cookie holding
+the time until which the client reads from the primary,
+``READ_YOUR_WRITES_WINDOW`` seconds ahead, so replica lag cannot hide
+what it just changed. The cookie travels with the client, so every API
+process honours it. Without replicas ``get_read_db`` is the primary
+session.
+"""
+import asyncio
+import contextlib
+import math
+import time
+from typing import List, Optional
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from .config import settings
+from .database import AsyncSessionLocal, InstrumentedPool, async_database_url, pool_options
+from .metrics import register_metrics
+
+PRIMARY_UNTIL_COOKIE = "read_primary_until"
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_async_engine(
+            async_database_url(url),
+            poolclass=InstrumentedPool,
+            **pool_options()
+        )
+        self.sessions = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+        self.healthy = True
+        self.reads = 0
+        self.failures = 0
+
+    async def _ping(self):
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def check(self) -> bool:
+        try:
+            await asyncio.wait_for(self._ping(), settings.DATABASE_REPLICA_CHECK_TIMEOUT)
+        except Exception:  # refused, timed out, missing file, auth...
+            self.mark_down()
+        else:
+            self.healthy = True
+        return self.healthy
+
+    def mark_down(self):
+        if self.healthy:
+            self.failures += 1
+        self.healthy = False
+
+    def metrics(self) -> dict:
+        return {
+            "url": make_url(self.url).render_as_string(hide_password=True),
+            "healthy": self.healthy,
+            "reads": self.reads,
+            "failures": self.failures,
+            "pool": self.engine.sync_engine.pool.metrics(),
+        }
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._next = 0
+        self._monitor: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.sticky_reads = 0
+        self.fallback_reads = 0
+
+    def choose(self, primary_until: Optional[float] = None) -> Optional[Replica]:
+        """Replica for the next read, or None to read from the primary"""
+        if not self.replicas:
+            return None
+        if primary_until is not None and primary_until > time.time():
+            self.sticky_reads += 1
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next]
+            self._next = (self._next + 1) % len(self.replicas)
+            if replica.healthy:
+                replica.reads += 1
+                return replica
+        self.fallback_reads += 1
+        return None
+
+    async def _watch(self):
+        while True:
+            await asyncio.gather(*(replica.check() for replica in self.replicas))
+            await asyncio.sleep(settings.DATABASE_REPLICA_CHECK_INTERVAL)
+
+    def start(self):
+        """Start health checks on the running event loop"""
+        if self.replicas and self._monitor is None:
+            self._monitor = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._monitor is not None:
+            self._monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor
+            self._monitor = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def metrics(self) -> dict:
+        return {
+            "replicas": [replica.metrics() for replica in self.replicas],
+            "sticky_reads": self.sticky_reads,
+            "fallback_reads": self.fallback_reads,
+        }
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+if replica_router.replicas:
+    register_metrics("database_replicas", replica_router.metrics)
+
+@event.listens_for(Session, "before_flush")
+def _refuse_replica_writes(session, flush_context, instances):
+    if session.info.get("replica"):
+        raise RuntimeError("Replica sessions are read-only; depend on get_db to write")
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_statement_write(orm_execute_state):
+    # Bulk and upsert statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        session = orm_execute_state.session
+        if session.info.get("replica"):
+            raise RuntimeError("Replica sessions are read-only; depend on get_db to write")
+        if "request_state" in session.info:
+            session.info["wrote"] = True
+
+@event.listens_for(Session, "after_flush")
+def _note_write(session, flush_context):
+    if "request_state" in session.info:
+        session.info["wrote"] = True
+
+@event.listens_for(Session, "after_commit")
+def _stick_writer(session):
+    if session.info.pop("wrote", False) and replica_router.replicas:
+        session.info["request_state"].primary_until = time.time() + settings.READ_YOUR_WRITES_WINDOW
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
+
+def primary_until(request: Request) -> Optional[float]:
+    """The read-your-writes deadline the client carries, if still plausible"""
+    try:
+        until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, ""))
+    except ValueError:
+        return None
+    # A forged cookie can only pin the client to the primary for one window
+    return min(until, time.time() + settings.READ_YOUR_WRITES_WINDOW)
+
+class ReadYourWritesMiddleware:
+    """Set the read-your-writes cookie on responses to requests that wrote"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                until = scope.get("state", {}).get("primary_until")
+                if until is not None:
+                    MutableHeaders(scope=message).append(
+                        "set-cookie",
+                        f"{PRIMARY_UNTIL_COOKIE}={until:.3f}; Max-Age={math.ceil(settings.READ_YOUR_WRITES_WINDOW)}; "
+                        "Path=/; HttpOnly; SameSite=Lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+def read_session(request: Request) -> AsyncSession:
+    """A session on the database ``get_read_db`` would pick, for the caller to close.
+
+    For streamed responses, which outlive the endpoint and its dependencies.
+    """
+    replica = replica_router.choose(primary_until(request))
+    if replica is None:
+        return AsyncSessionLocal()
+    db = replica.sessions()
+    db.info["replica"] = True
+    return db
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints: a replica unless the caller wrote recently"""
+    replica = replica_router.choose(primary_until(request))
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with replica.sessions() as db:
+        db.info["replica"] = True
+        try:
+            yield db
+        except (OperationalError, InterfaceError):
+            # Take it out of rotation until the next health check passes
+            replica.mark_down()
+            raise
@@ -1,17 +1,29 @@
 # backend/app/core/security.py
+import math
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from .config import settings
 from .database import get_db
 from ..models.user import User
+from .principal import Principal, principal_cache
+from ..services.password_hasher import PasswordPoolSaturated, get_password_hasher
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes verify_and_update() flag
+# hashes made with any other cost for rehashing
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(
@@ -26,6 +38,34 @@ def get_password_hash(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
 
+def _too_many_requests(exc: PasswordPoolSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=exc.reason,
+        headers={"Retry-After": str(math.ceil(exc.retry_after))}
+    )
+
+def admit_login(username: str, client_ip: Optional[str]):
+    """Per-username and per-IP login rate limits; raises 429"""
+    try:
+        get_password_hasher().admit_login(username, client_ip)
+    except PasswordPoolSaturated as exc:
+        raise _too_many_requests(exc)
+
+async def verify_password_async(plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Verify in the hashing pool; returns (valid, upgraded hash or None)"""
+    try:
+        return await get_password_hasher().verify(plain_password, hashed_password)
+    except PasswordPoolSaturated as exc:
+        raise _too_many_requests(exc)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash in the hashing pool; raises 429 when it is saturated"""
+    try:
+        return await get_password_hasher().hash(password)
+    except PasswordPoolSaturated as exc:
+        raise _too_many_requests(exc)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -38,6 +78,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def token_claims(user) -> dict:
+    """Claims identifying ``user`` (a User or Principal) in an access token"""
+    return {
+        "sub": user.username,
+        "user_id": user.id,
+        "role": user.role.value,
+        "ver": user.token_version or 0
+    }
+
 def verify_token(token: str) -> dict:
     """Verify and decode JWT token"""
     try:
@@ -57,11 +106,28 @@ def verify_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_current_user(
+async def _load_principal(db: AsyncSession, payload: dict) -> Optional[Principal]:
+    user_id = payload.get("user_id")
+    if user_id is not None:
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+        user = await db.get(User, user_id)
+    else:
+        # Tokens issued before user_id was a claim
+        user = await db.scalar(select(User).where(User.username == payload["sub"]))
+    
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.put(principal)
+    return principal
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Get current authenticated user (cached, see core.principal)"""
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -77,8 +143,16 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
+    user = await _load_principal(db, payload)
+    if user is not None and payload.get("ver", 0) != user.token_version:
+        # The cached principal may predate a version change made elsewhere
+        principal_cache.invalidate(user.id)
+        user = await _load_principal(db, payload)
+    
+    if user is None or user.username != username:
+        raise credentials_exception
+    
+    if payload.get("ver", 0) != user.token_version:
         raise credentials_exception
     
     if not user.is_active:
@@ -90,8 +164,8 @@ def get_current_user(
     return user
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Get current user and verify admin role"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -101,8 +175,8 @@ def get_current_admin_user(
     return current_user
 
 def get_current_company_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Get current user and verify they belong to a company"""
     if not current_user.company_id and current_user.role != "admin":
         raise HTTPException(
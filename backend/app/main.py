@@ -4,24 +4,50 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
 from .api.v1.api import api_router
-from .core.database import Base, engine
+from .core.database import Base, async_engine
+from .core.principal import principal_cache
+from .core.replicas import ReadYourWritesMiddleware, replica_router
+from .services.image_normalizer import shutdown_image_normalizer
+from .services.password_hasher import shutdown_password_hasher
+from .services.preview_service import get_preview_service
+from .services.qr_service import credential_verifier
 from .models import *
+from .utils.etag import ETagMiddleware
+from .utils.pagination import NEXT_CURSOR_HEADER
+from .utils.responses import ORJSONResponse
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    replica_router.start()
+    await principal_cache.start()
+    await credential_verifier.start()
     yield
     # Shutdown
-    pass
+    await credential_verifier.stop()
+    await principal_cache.stop()
+    await replica_router.stop()
+    get_preview_service().shutdown()
+    shutdown_image_normalizer()
+    shutdown_password_hasher()
+    await async_engine.dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Conditional GETs; added first so CORS headers also wrap the 304s
+app.add_middleware(ETagMiddleware)
+
+# Keeps clients that just wrote reading from the primary
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +55,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Include API router with prefix
@@ -0,0 +1,13 @@
+# backend/app/models/__init__.py
+from .company import Company
+from .worker import Worker
+from .user import User, UserRole
+from .document import Document, DocumentStatus, DocumentType
+from .observation import Observation, ObservationStatus, ObservationType
+from .credential import Credential, GateChange
+from .compliance import CompanyComplianceStats, WorkerComplianceStats
+from .blob import FileBlob, BlobValidation
+from .validation_job import ValidationJob, ValidationJobStatus
+from .process_metrics import ProcessMetrics
+from .notification import Notification, NotificationDigest, NotificationKind, DigestStatus
+from .search import ensure_search_indexes
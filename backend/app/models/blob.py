@@ -0,0 +1,34 @@
+# backend/app/models/blob.py
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Enum, JSON
+from sqlalchemy.sql import func
+from ..core.database import Base
+from .document import DocumentType
+
+class FileBlob(Base):
+    """Stored file content, shared by every document with the same SHA-256"""
+    __tablename__ = "file_blobs"
+
+    file_hash = Column(String(64), primary_key=True)
+    path = Column(String(500), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String(100))
+    # Set when the upload was normalized: the uploaded bytes' hash (for dedup) and size
+    original_hash = Column(String(64), index=True)
+    original_size = Column(BigInteger)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    orphaned_at = Column(DateTime(timezone=True))
+
+class BlobValidation(Base):
+    """Validation outcome cached per content hash and document type"""
+    __tablename__ = "blob_validations"
+
+    file_hash = Column(String(64), primary_key=True)
+    document_type = Column(Enum(DocumentType), primary_key=True)
+    is_valid = Column(Boolean, nullable=False)
+    errors = Column(JSON, nullable=False, default=list)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
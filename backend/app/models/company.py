@@ -1,14 +1,17 @@
 # backend/app/models/company.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from ..core.database import Base
+from ..utils.validators import split_run
 
 class Company(Base):
     __tablename__ = "companies"
     
     id = Column(Integer, primary_key=True, index=True)
     rut = Column(String(12), unique=True, index=True, nullable=False)
+    rut_number = Column(String(10))  # digits only, for exact/prefix search
+    rut_dv = Column(String(1))
     name = Column(String(200), nullable=False)
     business_name = Column(String(200))
     email = Column(String(100))
@@ -20,4 +23,14 @@ class Company(Base):
     
     # Relationships
     workers = relationship("Worker", back_populates="company")
-    documents = relationship("Document", back_populates="company")
\ No newline at end of file
+    documents = relationship("Document", back_populates="company")
+    
+    __table_args__ = (
+        # text_pattern_ops lets Postgres serve LIKE 'prefix%' from the B-tree
+        Index("ix_companies_rut_number", "rut_number", postgresql_ops={"rut_number": "text_pattern_ops"}),
+    )
+    
+    @validates("rut")
+    def _split_rut(self, key, value):
+        self.rut_number, self.rut_dv = split_run(value) or (None, None)
+        return value
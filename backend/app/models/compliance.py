@@ -0,0 +1,39 @@
+# backend/app/models/compliance.py
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+class CompanyComplianceStats(Base):
+    """Per-company document counters, maintained on every document write"""
+    __tablename__ = "company_compliance_stats"
+
+    company_id = Column(Integer, ForeignKey("companies.id"), primary_key=True)
+    workers_count = Column(Integer, nullable=False, default=0, server_default="0")
+    documents_count = Column(Integer, nullable=False, default=0, server_default="0")
+    pending_count = Column(Integer, nullable=False, default=0, server_default="0")
+    approved_count = Column(Integer, nullable=False, default=0, server_default="0")
+    observed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    expired_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Documents expiring within EXPIRY_WARNING_DAYS, refreshed by the expiry engine
+    expiring_count = Column(Integer, nullable=False, default=0, server_default="0")
+    expiring_refreshed_at = Column(DateTime(timezone=True))
+    # Bumped on every document, worker or observation write; keys cached reports
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class WorkerComplianceStats(Base):
+    """Per-worker document counters, maintained on every document write"""
+    __tablename__ = "worker_compliance_stats"
+
+    worker_id = Column(Integer, ForeignKey("workers.id"), primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    documents_count = Column(Integer, nullable=False, default=0, server_default="0")
+    pending_count = Column(Integer, nullable=False, default=0, server_default="0")
+    approved_count = Column(Integer, nullable=False, default=0, server_default="0")
+    observed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    expired_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
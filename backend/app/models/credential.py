@@ -1,5 +1,5 @@
 # backend/app/models/credential.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
@@ -19,8 +19,21 @@ class Credential(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    revoked_at = Column(DateTime(timezone=True))
+    revoked_at = Column(DateTime(timezone=True), index=True)  # polled by the gate verifier
     
     # Relationships
     worker = relationship("Worker", back_populates="credentials")
-    created_by_user = relationship("User", back_populates="credentials_created")
\ No newline at end of file
+    created_by_user = relationship("User", back_populates="credentials_created")
+
+class GateChange(Base):
+    """Change log behind the offline gate delta feed; the id is the version"""
+    __tablename__ = "gate_changes"
+    
+    id = Column(Integer, primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    worker_id = Column(Integer, ForeignKey("workers.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    __table_args__ = (
+        Index("ix_gate_changes_company_id_id", "company_id", "id"),
+    )
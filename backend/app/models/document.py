@@ -1,5 +1,5 @@
 # backend/app/models/document.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -31,6 +31,7 @@ class Document(Base):
     file_path = Column(String(500), nullable=False)
     file_hash = Column(String(64))  # SHA256
     status = Column(Enum(DocumentStatus), default=DocumentStatus.PENDING)
+    is_active = Column(Boolean, default=True)
     
     # Dates
     issue_date = Column(Date)
@@ -56,4 +57,16 @@ class Document(Base):
     company = relationship("Company", back_populates="documents")
     observations = relationship("Observation", back_populates="document")
     uploader = relationship("User", foreign_keys=[uploaded_by])
-    reviewer = relationship("User", foreign_keys=[reviewed_by])
\ No newline at end of file
+    reviewer = relationship("User", foreign_keys=[reviewed_by])
+    
+    __table_args__ = (
+        # Keyset pagination orders
+        Index("ix_documents_worker_id_id", "worker_id", "id"),
+        Index("ix_documents_expiry_date_id", "expiry_date", "id"),
+        # Expiry engine scan: only documents that can still expire
+        Index(
+            "ix_documents_unexpired_expiry_date", "expiry_date", "id",
+            postgresql_where=(status != DocumentStatus.EXPIRED) & (is_active == True),
+            sqlite_where=(status != DocumentStatus.EXPIRED) & (is_active == True),
+        ),
+    )
@@ -0,0 +1,67 @@
+# backend/app/models/notification.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import enum
+from ..core.database import Base
+
+class NotificationKind(enum.Enum):
+    DOCUMENT_EXPIRED = "document_expired"
+    OBSERVATION_CREATED = "observation_created"
+    DOCUMENT_APPROVED = "document_approved"
+
+class DigestStatus(enum.Enum):
+    QUEUED = "queued"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class Notification(Base):
+    """One event for one recipient, waiting to be folded into a digest"""
+    __tablename__ = "notifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(Enum(NotificationKind), nullable=False)
+    recipient_email = Column(String(100), nullable=False)
+    title = Column(String(200), nullable=False)
+    body = Column(Text)
+
+    # Foreign Keys
+    recipient_id = Column(Integer, ForeignKey("users.id"))
+    company_id = Column(Integer, ForeignKey("companies.id"))
+    document_id = Column(Integer, ForeignKey("documents.id"))
+    digest_id = Column(Integer, ForeignKey("notification_digests.id"))  # NULL until coalesced
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    digest = relationship("NotificationDigest", back_populates="notifications")
+
+    __table_args__ = (
+        # Pending events per recipient, oldest first
+        Index("ix_notifications_digest_id_recipient_email_id", "digest_id", "recipient_email", "id"),
+    )
+
+class NotificationDigest(Base):
+    """All of a recipient's events from one window, delivered as one email"""
+    __tablename__ = "notification_digests"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipient_email = Column(String(100), nullable=False)
+    events_count = Column(Integer, nullable=False, default=0)
+    status = Column(Enum(DigestStatus), default=DigestStatus.QUEUED, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+
+    # Sender lease
+    locked_by = Column(String(100))
+    locked_at = Column(DateTime(timezone=True))
+    run_after = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), index=True)
+
+    # Relationships
+    notifications = relationship("Notification", back_populates="digest")
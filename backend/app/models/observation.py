@@ -30,7 +30,7 @@ class Observation(Base):
     
     # Foreign Keys
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id"))  # NULL for system-generated observations
     resolved_by = Column(Integer, ForeignKey("users.id"))
     
     # Resolution info
@@ -0,0 +1,12 @@
+# backend/app/models/process_metrics.py
+from sqlalchemy import Column, String, DateTime, JSON
+from ..core.database import Base
+
+class ProcessMetrics(Base):
+    """Latest metrics snapshot published by a worker process"""
+    __tablename__ = "process_metrics"
+    
+    name = Column(String(50), primary_key=True)  # subsystem, e.g. "ocr"
+    process = Column(String(200), primary_key=True)  # host:pid:index
+    values = Column(JSON, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,76 @@
+# backend/app/models/search.py
+"""Name search indexes, created alongside the tables.
+
+Postgres gets pg_trgm GIN indexes, which serve ILIKE '%term%' and
+similarity ranking. SQLite gets external-content FTS5 tables kept in
+sync by triggers.
+"""
+from sqlalchemy import DDL, event
+from ..core.database import Base
+from .company import Company
+from .worker import Worker
+
+WORKER_NAME_SQL = "(first_name || ' ' || last_name)"
+
+POSTGRES_DDL = {
+    Company.__table__: [
+        "CREATE INDEX IF NOT EXISTS ix_companies_name_trgm ON companies USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_companies_business_name_trgm ON companies USING gin (business_name gin_trgm_ops)",
+    ],
+    Worker.__table__: [
+        f"CREATE INDEX IF NOT EXISTS ix_workers_name_trgm ON workers USING gin ({WORKER_NAME_SQL} gin_trgm_ops)",
+    ],
+}
+
+def _fts5_ddl(table: str, columns: list) -> list:
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+    ]
+
+SQLITE_DDL = {
+    Company.__table__: _fts5_ddl("companies", ["name", "business_name"]),
+    Worker.__table__: _fts5_ddl("workers", ["first_name", "last_name"]),
+}
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+for table, statements in POSTGRES_DDL.items():
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+for table, statements in SQLITE_DDL.items():
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+def ensure_search_indexes(connection):
+    """Create missing search indexes on an existing database"""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        statements = POSTGRES_DDL
+    elif dialect == "sqlite":
+        statements = SQLITE_DDL
+    else:
+        return
+    for table_statements in statements.values():
+        for statement in table_statements:
+            connection.exec_driver_sql(statement)
+    if dialect == "sqlite":
+        for table in SQLITE_DDL:
+            connection.exec_driver_sql(f"INSERT INTO {table.name}_fts({table.name}_fts) VALUES ('rebuild')")
@@ -1,11 +1,11 @@
 # backend/app/models/user.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from ..core.database import Base
 
-class UserRole(enum.Enum):
+class UserRole(str, enum.Enum):
     ADMIN = "admin"
     PREVENCIONISTA = "prevencionista"
     EMPRESA = "empresa"
@@ -23,10 +23,11 @@ class User(Base):
     role = Column(Enum(UserRole), default=UserRole.EMPRESA)
     is_active = Column(Boolean, default=True)
     company_id = Column(Integer, ForeignKey("companies.id"))
+    token_version = Column(Integer, default=0, nullable=False, server_default="0")  # bumped to revoke issued tokens
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), index=True)  # polled by core.principal
     last_login = Column(DateTime(timezone=True))
     
     # Relationships
@@ -0,0 +1,35 @@
+# backend/app/models/validation_job.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import enum
+from ..core.database import Base
+
+class ValidationJobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class ValidationJob(Base):
+    __tablename__ = "validation_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(Enum(ValidationJobStatus), default=ValidationJobStatus.QUEUED, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    
+    # Worker lease
+    locked_by = Column(String(100))
+    locked_at = Column(DateTime(timezone=True))
+    run_after = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Foreign Keys
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False, index=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    document = relationship("Document")
@@ -1,14 +1,17 @@
 # backend/app/models/worker.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from ..core.database import Base
+from ..utils.validators import split_run
 
 class Worker(Base):
     __tablename__ = "workers"
     
     id = Column(Integer, primary_key=True, index=True)
     run = Column(String(12), unique=True, index=True, nullable=False)
+    run_number = Column(String(10))  # digits only, for exact/prefix search
+    run_dv = Column(String(1))
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     email = Column(String(100))
@@ -27,4 +30,17 @@ class Worker(Base):
     # Relationships
     company = relationship("Company", back_populates="workers")
     documents = relationship("Document", back_populates="worker")
-    credentials = relationship("Credential", back_populates="worker")
\ No newline at end of file
+    credentials = relationship("Credential", back_populates="worker")
+    
+    __table_args__ = (
+        # text_pattern_ops lets Postgres serve LIKE 'prefix%' from the B-tree
+        Index("ix_workers_run_number", "run_number", postgresql_ops={"run_number": "text_pattern_ops"}),
+        # Incremental refresh of the gate verifier's worker snapshot
+        Index("ix_workers_created_at", "created_at"),
+        Index("ix_workers_updated_at", "updated_at"),
+    )
+    
+    @validates("run")
+    def _split_run(self, key, value):
+        self.run_number, self.run_dv = split_run(value) or (None, None)
+        return value
@@ -0,0 +1,34 @@
+# backend/app/schemas/credential.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class CredentialCreate(BaseModel):
+    worker_id: int
+    valid_until: Optional[datetime] = None  # default: CREDENTIAL_VALID_DAYS from now
+
+class CredentialResponse(BaseModel):
+    id: int
+    worker_id: int
+    qr_code: str
+    is_active: bool
+    valid_until: datetime
+    created_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class CredentialVerify(BaseModel):
+    token: str
+
+class CredentialVerification(BaseModel):
+    valid: bool
+    reason: Optional[str] = None  # why access is refused
+    credential_id: Optional[int] = None
+    worker_id: Optional[int] = None
+    worker_run: Optional[str] = None
+    worker_name: Optional[str] = None
+    company_id: Optional[int] = None
+    compliance_status: Optional[str] = None
+    valid_until: Optional[datetime] = None
@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 from datetime import date, datetime
 from typing import Optional, List
 from enum import Enum
+from .observation import ObservationResponse
 
 class DocumentStatus(str, Enum):
     PENDING = "pending"
@@ -45,4 +46,34 @@ class DocumentResponse(DocumentBase):
     review_comments: Optional[str] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class DocumentWithObservations(DocumentResponse):
+    observations: List[ObservationResponse] = []
+
+class ValidationJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class ValidationStatusResponse(BaseModel):
+    document_id: int
+    document_status: DocumentStatus
+    job_status: Optional[ValidationJobStatus] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
+    enqueued_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    observations: List[ObservationResponse] = []
+
+class BulkIngestItem(BaseModel):
+    filename: str
+    status: str
+    document_id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkIngestResponse(BaseModel):
+    created: int
+    rejected: int
+    items: List[BulkIngestItem] = []
\ No newline at end of file
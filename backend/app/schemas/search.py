@@ -0,0 +1,23 @@
+# backend/app/schemas/search.py
+from pydantic import BaseModel
+from typing import Optional, List
+
+class CompanySearchHit(BaseModel):
+    id: int
+    rut: str
+    name: str
+    business_name: Optional[str] = None
+    score: float
+
+class WorkerSearchHit(BaseModel):
+    id: int
+    run: str
+    first_name: str
+    last_name: str
+    position: str
+    company_id: int
+    score: float
+
+class SearchResponse(BaseModel):
+    companies: List[CompanySearchHit] = []
+    workers: List[WorkerSearchHit] = []
@@ -2,6 +2,7 @@
 from pydantic import BaseModel, Field
 from datetime import date, datetime
 from typing import Optional, List
+from .document import DocumentResponse
 
 class WorkerBase(BaseModel):
     run: str = Field(..., min_length=8, max_length=12)
@@ -33,4 +34,15 @@ class WorkerResponse(WorkerBase):
         from_attributes = True
 
 class WorkerWithDocuments(WorkerResponse):
-    documents: List["DocumentResponse"] = []
\ No newline at end of file
+    documents: List[DocumentResponse] = []
+
+class WorkerImportRejection(BaseModel):
+    row: int
+    run: Optional[str] = None
+    reason: str
+
+class WorkerImportResponse(BaseModel):
+    inserted: int
+    updated: int
+    rejected: int
+    rejected_rows: List[WorkerImportRejection] = []
\ No newline at end of file
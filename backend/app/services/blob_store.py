@@ -0,0 +1,242 @@
+# backend/app/services/blob_store.py
+"""Content-addressed storage for uploaded files.
+
+Each distinct file is written once under its SHA-256 and shared by every
+document that uploads the same bytes. ``ref_count`` tracks the active
+documents pointing at a blob; ``collect_garbage`` removes blobs nobody
+references any more, and ``sweep_stray_files`` removes files whose row
+was rolled back with the upload that created them.
+"""
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+import aiofiles
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import dialect_insert
+from ..models.blob import FileBlob, BlobValidation
+from ..models.document import Document, DocumentType
+from .document_validator import ValidationResult, detect_content_type
+from .image_normalizer import get_image_normalizer
+from .storage import StoredFile, move_into_place, discard
+
+def blob_path(file_hash: str) -> str:
+    """Location of a blob, fanned out by hash prefix"""
+    return os.path.join(settings.UPLOAD_FOLDER, "blobs", file_hash[:2], file_hash[2:4], file_hash)
+
+async def _acquire(db: AsyncSession, file_hash: str) -> bool:
+    """Increment the reference count; False if the blob row does not exist"""
+    result = await db.execute(
+        update(FileBlob)
+        .where(FileBlob.file_hash == file_hash)
+        .values(ref_count=FileBlob.ref_count + 1, orphaned_at=None)
+    )
+    return result.rowcount == 1
+
+async def store_blob(db: AsyncSession, temp: StoredFile) -> FileBlob:
+    """Adopt a streamed temp file as a blob, or drop it if the content exists.
+
+    With ``IMAGE_NORMALIZATION`` set, photos are stored normalized. The
+    upload's own hash is kept as ``original_hash``, so uploading the same
+    photo again reuses the blob without re-encoding it.
+
+    The reference taken here belongs to the caller's transaction and is
+    released automatically if that transaction rolls back.
+    """
+    if await _acquire(db, temp.sha256):
+        await discard(temp.path)
+        return await db.get(FileBlob, temp.sha256)
+
+    content_type = await _content_type(temp.path)
+    normalizer = get_image_normalizer()
+    if normalizer is not None and content_type in ("image/jpeg", "image/png"):
+        existing = await db.scalar(
+            select(FileBlob.file_hash).where(FileBlob.original_hash == temp.sha256).limit(1)
+        )
+        if existing is not None and await _acquire(db, existing):
+            await discard(temp.path)
+            return await db.get(FileBlob, existing)
+
+        normalized = await normalizer.normalize(temp)
+        if normalized is not None:
+            await discard(temp.path)
+            return await _adopt(db, normalized, await _content_type(normalized.path), original=temp)
+
+    return await _adopt(db, temp, content_type)
+
+async def _content_type(path: str) -> Optional[str]:
+    async with aiofiles.open(path, "rb") as f:
+        return detect_content_type(await f.read(16))
+
+async def _adopt(db: AsyncSession, temp: StoredFile, content_type: Optional[str], original: Optional[StoredFile] = None) -> FileBlob:
+    # Two photos can normalize to the same bytes
+    if original is not None and await _acquire(db, temp.sha256):
+        await discard(temp.path)
+        return await db.get(FileBlob, temp.sha256)
+
+    path = blob_path(temp.sha256)
+    await move_into_place(temp, path)
+    await db.execute(
+        dialect_insert(db, FileBlob)
+        .values(
+            file_hash=temp.sha256,
+            path=path,
+            size=temp.size,
+            content_type=content_type,
+            original_hash=original.sha256 if original else None,
+            original_size=original.size if original else None,
+            ref_count=0
+        )
+        .on_conflict_do_nothing(index_elements=["file_hash"])
+    )
+    await _acquire(db, temp.sha256)
+    return await db.get(FileBlob, temp.sha256)
+
+def release_blob(db: Session, file_hash: Optional[str]):
+    """Drop one reference; the blob becomes collectable at zero"""
+    if not file_hash:
+        return
+    db.execute(
+        update(FileBlob)
+        .where(FileBlob.file_hash == file_hash, FileBlob.ref_count > 0)
+        .values(ref_count=FileBlob.ref_count - 1)
+    )
+    db.execute(
+        update(FileBlob)
+        .where(FileBlob.file_hash == file_hash, FileBlob.ref_count == 0)
+        .values(orphaned_at=func.now())
+    )
+
+def get_cached_validation(db: Session, file_hash: str, document_type) -> Optional[ValidationResult]:
+    """Reuse the validation outcome of identical content"""
+    cached = db.get(BlobValidation, (file_hash, DocumentType(getattr(document_type, "value", document_type))))
+    if cached is None:
+        return None
+    return ValidationResult.from_dicts(cached.is_valid, cached.errors)
+
+def cache_validation(db: Session, file_hash: str, document_type, result: ValidationResult):
+    """Remember a validation outcome for this content and document type"""
+    db.execute(
+        dialect_insert(db, BlobValidation)
+        .values(
+            file_hash=file_hash,
+            document_type=DocumentType(getattr(document_type, "value", document_type)),
+            is_valid=result.is_valid,
+            errors=result.errors_as_dicts()
+        )
+        .on_conflict_do_nothing(index_elements=["file_hash", "document_type"])
+    )
+
+def recount_references(db: Session) -> int:
+    """Recompute ref_count from active documents; returns rows corrected"""
+    actual = dict(db.execute(
+        select(Document.file_hash, func.count(Document.id))
+        .join(FileBlob, FileBlob.path == Document.file_path)
+        .where(Document.is_active == True)
+        .group_by(Document.file_hash)
+    ).all())
+
+    corrected = 0
+    for blob in db.scalars(select(FileBlob)):
+        expected = actual.get(blob.file_hash, 0)
+        if blob.ref_count != expected:
+            blob.ref_count = expected
+            if expected == 0 and blob.orphaned_at is None:
+                blob.orphaned_at = datetime.now(timezone.utc)
+            corrected += 1
+    db.flush()
+    return corrected
+
+def collect_garbage(db: Session, grace: timedelta = timedelta(hours=24)) -> List[str]:
+    """Delete blobs that have been unreferenced for longer than ``grace``.
+
+    Each row deletion commits before its file is removed. A crash in
+    between leaves only a stray file for ``sweep_stray_files``, never a
+    row without its file. An upload of the same content that recreates
+    the row in the meantime keeps the file.
+    """
+    cutoff = datetime.now(timezone.utc) - grace
+    candidates = db.scalars(
+        select(FileBlob.file_hash).where(
+            FileBlob.ref_count <= 0,
+            FileBlob.orphaned_at < cutoff
+        )
+    ).all()
+
+    removed = []
+    for file_hash in candidates:
+        result = db.execute(
+            delete(FileBlob).where(FileBlob.file_hash == file_hash, FileBlob.ref_count <= 0)
+        )
+        if result.rowcount != 1:
+            continue
+        db.execute(delete(BlobValidation).where(BlobValidation.file_hash == file_hash))
+        db.commit()
+        if db.get(FileBlob, file_hash) is None:
+            try:
+                os.remove(blob_path(file_hash))
+            except FileNotFoundError:
+                pass
+        removed.append(file_hash)
+    return removed
+
+def sweep_stray_files(db: Session, grace: timedelta = timedelta(hours=24)) -> List[str]:
+    """Delete blob files without a row that are older than ``grace``.
+
+    An upload moves its file into place before the row commits. If that
+    transaction rolls back, the file stays behind with no row pointing at
+    it. The grace period covers uploads still in flight.
+    """
+    root = os.path.join(settings.UPLOAD_FOLDER, "blobs")
+    cutoff = time.time() - grace.total_seconds()
+    candidates = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                if path == blob_path(name) and os.stat(path).st_mtime < cutoff:
+                    candidates.append(name)
+            except FileNotFoundError:
+                continue
+
+    removed = []
+    for start in range(0, len(candidates), 500):
+        chunk = candidates[start:start + 500]
+        known = set(db.scalars(select(FileBlob.file_hash).where(FileBlob.file_hash.in_(chunk))))
+        for file_hash in chunk:
+            if file_hash in known:
+                continue
+            try:
+                os.remove(blob_path(file_hash))
+            except FileNotFoundError:
+                continue
+            removed.append(file_hash)
+    return removed
+
+def storage_savings(db: Session) -> List[dict]:
+    """Bytes saved by image normalization per company, over active documents"""
+    rows = db.execute(
+        select(
+            Document.company_id,
+            func.count(Document.id),
+            func.sum(FileBlob.original_size),
+            func.sum(FileBlob.size)
+        )
+        .join(FileBlob, FileBlob.file_hash == Document.file_hash)
+        .where(Document.is_active == True, FileBlob.original_size.isnot(None))
+        .group_by(Document.company_id)
+        .order_by(Document.company_id)
+    ).all()
+    return [
+        {
+            "company_id": company_id,
+            "normalized_documents": documents,
+            "original_bytes": original,
+            "stored_bytes": stored,
+            "bytes_saved": original - stored,
+        }
+        for company_id, documents, original, stored in rows
+    ]
@@ -0,0 +1,202 @@
+# backend/app/services/bulk_ingest.py
+"""Bulk document ingestion from many files or a ZIP archive.
+
+A manifest maps each filename to a worker RUN, document type and dates.
+Files are streamed one at a time into the blob store; every resulting
+document, rollup update and validation job is written in one transaction.
+"""
+import csv
+import io
+import json
+import os
+import zipfile
+from dataclasses import dataclass
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import settings
+from ..models.document import Document, DocumentStatus, DocumentType
+from ..models.validation_job import ValidationJob, ValidationJobStatus
+from ..models.worker import Worker
+from .blob_store import store_blob
+from .compliance_rollup import record_documents_added
+from .storage import FileTooLargeError, write_temp
+from ..utils.validators import normalize_run
+
+MANIFEST_NAMES = ("manifest.csv", "manifest.json")
+
+class ManifestError(ValueError):
+    """Raised when a manifest cannot be parsed"""
+
+@dataclass
+class ManifestEntry:
+    filename: str
+    worker_run: str
+    type: str
+    name: Optional[str] = None
+    issue_date: Optional[str] = None
+    expiry_date: Optional[str] = None
+
+def parse_manifest(content: bytes, filename: str) -> Dict[str, ManifestEntry]:
+    """Parse a CSV or JSON manifest into entries keyed by filename"""
+    try:
+        text = content.decode("utf-8-sig")
+        if filename.lower().endswith(".json"):
+            rows = json.loads(text)
+            if isinstance(rows, dict):
+                rows = rows.get("documents", [])
+        else:
+            rows = list(csv.DictReader(io.StringIO(text)))
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as exc:
+        raise ManifestError(f"Invalid manifest: {exc}")
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ManifestError("A JSON manifest must be a list of objects, or an object with a \"documents\" list")
+
+    entries = {}
+    fields = ManifestEntry.__dataclass_fields__
+    for row in rows:
+        # JSON may carry numbers (e.g. a RUN without dots); entries hold text
+        row = {key.strip(): (None if value is None else str(value).strip())
+               for key, value in row.items() if isinstance(key, str) and key.strip() in fields}
+        if not row.get("filename") or not row.get("worker_run") or not row.get("type"):
+            raise ManifestError("Every manifest row needs filename, worker_run and type")
+        entries[os.path.basename(row["filename"])] = ManifestEntry(**row)
+    return entries
+
+def find_archive_manifest(archive: zipfile.ZipFile) -> Optional[Dict[str, ManifestEntry]]:
+    """Load the manifest bundled at the root of an archive, if any"""
+    names = {info.filename.lower(): info for info in archive.infolist()}
+    for manifest_name in MANIFEST_NAMES:
+        info = names.get(manifest_name)
+        if info is not None:
+            return parse_manifest(archive.read(info), manifest_name)
+    return None
+
+async def iter_archive_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Decompress one archive member chunk by chunk off the event loop"""
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    member = await run_in_threadpool(archive.open, info)
+    try:
+        while True:
+            chunk = await run_in_threadpool(member.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        member.close()
+
+class BulkIngest:
+    """Collects documents for one company and commits them together"""
+
+    def __init__(self, db: AsyncSession, company_id: int, manifest: Dict[str, ManifestEntry], uploaded_by: int):
+        self.db = db
+        self.company_id = company_id
+        self.manifest = manifest
+        self.uploaded_by = uploaded_by
+        self.documents: List[Document] = []
+        self.items: List[dict] = []
+        self.workers: Dict[str, int] = {}
+        self._seen = set()
+
+    async def load_workers(self):
+        """Resolve every manifest RUN to a worker of the company in one query"""
+        runs = {entry.worker_run for entry in self.manifest.values()}
+        runs |= {normalize_run(run) for run in runs} - {None}
+        if runs:
+            self.workers = dict((await self.db.execute(
+                select(Worker.run, Worker.id).where(
+                    Worker.company_id == self.company_id,
+                    Worker.run.in_(runs)
+                )
+            )).all())
+
+    def _reject(self, filename: str, error: str) -> dict:
+        item = {"filename": filename, "status": "rejected", "error": error}
+        self.items.append(item)
+        return item
+
+    def _build(self, filename: str) -> tuple:
+        """Check a manifest entry before any bytes are read"""
+        if filename in self._seen:
+            return None, "Duplicate filename"
+        self._seen.add(filename)
+
+        if len(self.documents) >= settings.BULK_MAX_ITEMS:
+            return None, f"Batch limit of {settings.BULK_MAX_ITEMS} documents reached"
+
+        entry = self.manifest.get(filename)
+        if entry is None:
+            return None, "No manifest entry"
+
+        if os.path.splitext(filename)[1].lower() not in settings.ALLOWED_EXTENSIONS:
+            return None, "Invalid file format"
+
+        worker_id = self.workers.get(entry.worker_run) or self.workers.get(normalize_run(entry.worker_run))
+        if worker_id is None:
+            return None, f"Worker {entry.worker_run} not found in company"
+
+        try:
+            document = Document(
+                name=entry.name or os.path.splitext(filename)[0],
+                type=DocumentType(entry.type),
+                worker_id=worker_id,
+                company_id=self.company_id,
+                uploaded_by=self.uploaded_by,
+                status=DocumentStatus.PENDING,
+                is_active=True,
+                issue_date=date.fromisoformat(entry.issue_date) if entry.issue_date else None,
+                expiry_date=date.fromisoformat(entry.expiry_date) if entry.expiry_date else None
+            )
+        except ValueError as exc:
+            return None, str(exc)
+        return document, None
+
+    async def add(self, filename: str, chunks: AsyncIterator[bytes]) -> dict:
+        """Stream one file into the blob store and stage its document"""
+        filename = os.path.basename(filename)
+        document, error = self._build(filename)
+        if error:
+            return self._reject(filename, error)
+
+        try:
+            temp = await write_temp(chunks)
+        except FileTooLargeError:
+            return self._reject(filename, "File too large")
+
+        blob = await store_blob(self.db, temp)
+        document.file_path = blob.path
+        document.file_hash = blob.file_hash
+        self.documents.append(document)
+
+        item = {"filename": filename, "status": "created", "document": document}
+        self.items.append(item)
+        return item
+
+    async def finish(self) -> dict:
+        """Insert staged documents, rollups and validation jobs in one commit"""
+        for filename in self.manifest.keys() - self._seen:
+            self._reject(filename, "File missing from upload")
+
+        self.db.add_all(self.documents)
+        await self.db.flush()
+        await self.db.run_sync(record_documents_added, self.documents)
+        self.db.add_all([
+            ValidationJob(document_id=document.id, status=ValidationJobStatus.QUEUED)
+            for document in self.documents
+        ])
+
+        items = []
+        for item in self.items:
+            document = item.pop("document", None)
+            if document is not None:
+                item["document_id"] = document.id
+            items.append(item)
+        await self.db.commit()
+
+        return {
+            "created": len(self.documents),
+            "rejected": len(items) - len(self.documents),
+            "items": items,
+        }
@@ -0,0 +1,245 @@
+# backend/app/services/compliance_export.py
+"""Full per-company compliance export, streamed as CSV or XLSX.
+
+There is one row per active document of every worker. Workers without
+documents get a single row with empty document columns. Rows come from
+a server-side cursor in ``settings.STREAM_BATCH_SIZE`` batches. Each
+batch is encoded and sent before the next is fetched, so memory stays
+flat and the first bytes go out at once, however large the company is.
+
+openpyxl cannot stream: even its write-only mode builds the whole
+archive before saving. XLSX is therefore written by hand. It is a zip of
+a few fixed XML parts plus one worksheet of inline-string cells, deflated
+as it is written. The zip goes to a non-seekable sink, so the sizes go in
+data descriptors after each entry. Without zip64, the worksheet XML is
+capped at 2 GiB, which is about fifteen million cells.
+
+CSV text cells starting with ``=``, ``+``, ``-``, ``@``, a tab or a
+carriage return get a leading ``'``, so spreadsheets do not run them as
+formulas. XLSX inline strings are never evaluated and are left as is.
+"""
+import csv
+import enum
+import io
+import re
+import zipfile
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Dict, Tuple
+from xml.sax.saxutils import escape
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import settings
+from ..models.compliance import WorkerComplianceStats
+from ..models.document import Document
+from ..models.worker import Worker
+from .compliance_rollup import worker_compliance_status_column
+
+COLUMNS = (
+    ("run", Worker.run),
+    ("first_name", Worker.first_name),
+    ("last_name", Worker.last_name),
+    ("position", Worker.position),
+    ("worker_active", Worker.is_active),
+    ("compliance_status", worker_compliance_status_column()),
+    ("document_id", Document.id),
+    ("document_name", Document.name),
+    ("document_type", Document.type),
+    ("document_status", Document.status),
+    ("issue_date", Document.issue_date),
+    ("expiry_date", Document.expiry_date),
+    ("upload_date", Document.upload_date),
+    ("review_date", Document.review_date),
+)
+
+FORMATS: Dict[str, Tuple[str, str]] = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+def export_statement(company_id: int):
+    """Every worker of the company with its active documents, in index order"""
+    return select(*(column.label(name) for name, column in COLUMNS)).select_from(Worker).outerjoin(
+        WorkerComplianceStats, WorkerComplianceStats.worker_id == Worker.id
+    ).outerjoin(
+        Document, and_(Document.worker_id == Worker.id, Document.is_active == True)
+    ).where(
+        Worker.company_id == company_id
+    ).order_by(Worker.id, Document.id)
+
+async def _batches(db: AsyncSession, statement) -> AsyncIterator[list]:
+    result = await db.stream(statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield partition
+
+async def export_stream(db: AsyncSession, company_id: int, format: str) -> AsyncIterator[bytes]:
+    """The export's bytes; closes ``db``, which outlives the endpoint, when done"""
+    statement = export_statement(company_id)
+    body = stream_xlsx(db, statement) if format == "xlsx" else stream_csv(db, statement)
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        await db.close()
+
+# CSV
+
+# Spreadsheets evaluate cells starting with these as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return str(value)
+
+async def stream_csv(db: AsyncSession, statement) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Excel only detects UTF-8 (accented names) with a byte order mark
+    buffer.write("\ufeff")
+    writer.writerow(name for name, _ in COLUMNS)
+    async for batch in _batches(db, statement):
+        writer.writerows([_text(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+# XLSX
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_PARTS = {
+    "[Content_Types].xml": (
+        f'{_XML}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        f'{_XML}<Relationships xmlns="{_PACKAGE_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        f'{_XML}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+        '<sheets><sheet name="Compliance" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        f'{_XML}<Relationships xmlns="{_PACKAGE_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # Cell styles: 0 default, 1 date, 2 date and time, 3 bold header
+    "xl/styles.xml": (
+        f'{_XML}<styleSheet xmlns="{_MAIN_NS}">'
+        '<numFmts count="2"><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>'
+        '<numFmt numFmtId="165" formatCode="yyyy-mm-dd hh:mm"/></numFmts>'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+_SHEET_HEAD = (
+    f'{_XML}<worksheet xmlns="{_MAIN_NS}"><sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+_EPOCH = datetime(1899, 12, 30)
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+_LETTERS = [_column_letter(index) for index in range(len(COLUMNS))]
+
+def _cell(ref: str, value, style: int = 0) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return f'<c r="{ref}" s="2"><v>{(value - _EPOCH).total_seconds() / 86400:.6f}</v></c>'
+    if isinstance(value, date):
+        return f'<c r="{ref}" s="1"><v>{(value - _EPOCH.date()).days}</v></c>'
+    if isinstance(value, enum.Enum):
+        value = value.value
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    style_attribute = f' s="{style}"' if style else ""
+    return f'<c r="{ref}" t="inlineStr"{style_attribute}><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _row(number: int, values, style: int = 0) -> str:
+    cells = "".join(_cell(f"{letter}{number}", value, style) for letter, value in zip(_LETTERS, values))
+    return f'<row r="{number}">{cells}</row>'
+
+class _Sink:
+    """Write-only, non-seekable file that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+async def stream_xlsx(db: AsyncSession, statement) -> AsyncIterator[bytes]:
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _PARTS.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write((_SHEET_HEAD + _row(1, (name for name, _ in COLUMNS), style=3)).encode())
+            number = 1
+            async for batch in _batches(db, statement):
+                rows = []
+                for row in batch:
+                    number += 1
+                    rows.append(_row(number, row))
+                sheet.write("".join(rows).encode())
+                yield sink.drain()
+            sheet.write(_SHEET_TAIL.encode())
+    yield sink.drain()
@@ -0,0 +1,333 @@
+# backend/app/services/compliance_rollup.py
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, update, insert, event, func, or_, case
+from sqlalchemy.orm import Session
+from ..core.database import dialect_insert
+from ..models.compliance import CompanyComplianceStats, WorkerComplianceStats
+from ..models.credential import GateChange
+from ..models.document import Document, DocumentStatus
+from ..models.observation import Observation
+from ..models.worker import Worker
+
+STATUS_COLUMNS = {
+    DocumentStatus.PENDING: "pending_count",
+    DocumentStatus.APPROVED: "approved_count",
+    DocumentStatus.OBSERVED: "observed_count",
+    DocumentStatus.EXPIRED: "expired_count",
+}
+
+COUNTER_COLUMNS = ["documents_count"] + list(STATUS_COLUMNS.values())
+
+def as_model_status(value) -> DocumentStatus:
+    """Coerce a schema enum, model enum or raw string into the model DocumentStatus"""
+    if isinstance(value, DocumentStatus):
+        return value
+    return DocumentStatus(getattr(value, "value", value))
+
+def _ensure_rows(db: Session, company_id: int, worker_id: Optional[int] = None):
+    """Create zeroed rollup rows if they do not exist yet"""
+    db.execute(
+        dialect_insert(db, CompanyComplianceStats)
+        .values(company_id=company_id)
+        .on_conflict_do_nothing(index_elements=["company_id"])
+    )
+    if worker_id is not None:
+        db.execute(
+            dialect_insert(db, WorkerComplianceStats)
+            .values(worker_id=worker_id, company_id=company_id)
+            .on_conflict_do_nothing(index_elements=["worker_id"])
+        )
+
+def record_gate_change(db: Session, company_id: int, worker_id: int):
+    """Put the worker in the next offline gate delta; call before the surrounding commit"""
+    db.execute(insert(GateChange).values(company_id=company_id, worker_id=worker_id))
+
+def _apply_deltas(db: Session, company_id: int, worker_id: Optional[int], deltas: Dict[str, int]):
+    """Atomically add deltas to the company (and worker) rollup rows"""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    _ensure_rows(db, company_id, worker_id)
+
+    company_values = {
+        column: getattr(CompanyComplianceStats, column) + delta
+        for column, delta in deltas.items()
+    }
+    company_values["data_version"] = CompanyComplianceStats.data_version + 1
+    db.execute(
+        update(CompanyComplianceStats)
+        .where(CompanyComplianceStats.company_id == company_id)
+        .values(**company_values)
+    )
+
+    worker_values = {
+        column: getattr(WorkerComplianceStats, column) + delta
+        for column, delta in deltas.items()
+        if column in COUNTER_COLUMNS
+    }
+    if worker_id is not None and worker_values:
+        db.execute(
+            update(WorkerComplianceStats)
+            .where(WorkerComplianceStats.worker_id == worker_id)
+            .values(**worker_values)
+        )
+        record_gate_change(db, company_id, worker_id)
+
+def record_document_added(db: Session, document: Document):
+    """Count a newly inserted document; call before the surrounding commit"""
+    status = as_model_status(document.status or DocumentStatus.PENDING)
+    _apply_deltas(db, document.company_id, document.worker_id, {
+        "documents_count": 1,
+        STATUS_COLUMNS[status]: 1,
+    })
+
+def record_documents_added(db: Session, documents: List[Document]):
+    """Count many new documents with one update per worker"""
+    grouped: Dict[tuple, Dict[str, int]] = {}
+    for document in documents:
+        status = as_model_status(document.status or DocumentStatus.PENDING)
+        deltas = grouped.setdefault((document.company_id, document.worker_id), {})
+        deltas["documents_count"] = deltas.get("documents_count", 0) + 1
+        deltas[STATUS_COLUMNS[status]] = deltas.get(STATUS_COLUMNS[status], 0) + 1
+    for (company_id, worker_id), deltas in grouped.items():
+        _apply_deltas(db, company_id, worker_id, deltas)
+
+def record_document_status_change(db: Session, document: Document, old_status):
+    """Move a document between status counters"""
+    old_status = as_model_status(old_status or DocumentStatus.PENDING)
+    new_status = as_model_status(document.status or DocumentStatus.PENDING)
+    if old_status == new_status:
+        return
+    _apply_deltas(db, document.company_id, document.worker_id, {
+        STATUS_COLUMNS[old_status]: -1,
+        STATUS_COLUMNS[new_status]: 1,
+    })
+
+def record_document_removed(db: Session, document: Document):
+    """Stop counting a soft-deleted document"""
+    status = as_model_status(document.status or DocumentStatus.PENDING)
+    _apply_deltas(db, document.company_id, document.worker_id, {
+        "documents_count": -1,
+        STATUS_COLUMNS[status]: -1,
+    })
+
+def record_documents_expired(db: Session, documents: List[tuple]):
+    """Move expired documents given as (company_id, worker_id, old_status)"""
+    grouped: Dict[tuple, Dict[str, int]] = {}
+    for company_id, worker_id, old_status in documents:
+        column = STATUS_COLUMNS[as_model_status(old_status or DocumentStatus.PENDING)]
+        deltas = grouped.setdefault((company_id, worker_id), {})
+        deltas[column] = deltas.get(column, 0) - 1
+        deltas["expired_count"] = deltas.get("expired_count", 0) + 1
+    for (company_id, worker_id), deltas in grouped.items():
+        _apply_deltas(db, company_id, worker_id, deltas)
+
+def set_expiring_counts(db: Session, counts: Dict[int, int]):
+    """Store each company's expiring-soon count; companies missing from ``counts`` get 0.
+
+    Only rows whose count changed are written.
+    """
+    now = datetime.now(timezone.utc)
+    stored = {
+        company_id: (count if refreshed_at is not None else None)
+        for company_id, count, refreshed_at in db.execute(select(
+            CompanyComplianceStats.company_id,
+            CompanyComplianceStats.expiring_count,
+            CompanyComplianceStats.expiring_refreshed_at,
+        ))
+    }
+    missing = [company_id for company_id in counts if company_id not in stored]
+    if missing:
+        db.execute(
+            dialect_insert(db, CompanyComplianceStats)
+            .values([{"company_id": company_id} for company_id in missing])
+            .on_conflict_do_nothing(index_elements=["company_id"])
+        )
+
+    changes = [
+        {"company_id": company_id, "expiring_count": counts.get(company_id, 0), "expiring_refreshed_at": now}
+        for company_id in set(stored) | set(counts)
+        if stored.get(company_id) != counts.get(company_id, 0)
+    ]
+    if changes:
+        db.execute(update(CompanyComplianceStats), changes)
+        bump_data_versions(db, company_ids=[change["company_id"] for change in changes])
+    return len(changes)
+
+def bump_data_versions(db: Session, company_ids: Iterable[int] = (), document_ids: Iterable[int] = ()):
+    """Advance the data version of these companies and of the companies owning these documents.
+
+    Cached reports are keyed by the version, so bumping it invalidates them
+    in every process. ORM writes are tracked automatically; call this for
+    bulk statements that bypass the session.
+    """
+    company_ids, document_ids = sorted(set(company_ids)), sorted(set(document_ids))
+    if not company_ids and not document_ids:
+        return
+    if company_ids:
+        db.execute(
+            dialect_insert(db, CompanyComplianceStats)
+            .values([{"company_id": company_id} for company_id in company_ids])
+            .on_conflict_do_nothing(index_elements=["company_id"])
+        )
+    owners = select(Document.company_id).where(Document.id.in_(document_ids))
+    db.execute(
+        update(CompanyComplianceStats)
+        .where(or_(
+            CompanyComplianceStats.company_id.in_(company_ids),
+            CompanyComplianceStats.company_id.in_(owners)
+        ))
+        .values(data_version=CompanyComplianceStats.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+@event.listens_for(Session, "before_flush")
+def _track_report_writes(session, flush_context, instances):
+    company_ids = session.info.setdefault("changed_companies", set())
+    document_ids = session.info.setdefault("changed_documents", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, (Document, Worker)) and obj.company_id is not None:
+            company_ids.add(obj.company_id)
+        elif isinstance(obj, Observation) and obj.document_id is not None:
+            document_ids.add(obj.document_id)
+
+@event.listens_for(Session, "before_commit")
+def _bump_tracked_versions(session):
+    # Sessions here run without autoflush; flush so pending writes are tracked
+    session.flush()
+    company_ids = session.info.pop("changed_companies", None)
+    document_ids = session.info.pop("changed_documents", None)
+    if company_ids or document_ids:
+        bump_data_versions(session, company_ids or (), document_ids or ())
+
+@event.listens_for(Session, "after_rollback")
+def _forget_tracked_writes(session):
+    session.info.pop("changed_companies", None)
+    session.info.pop("changed_documents", None)
+
+def record_worker_added(db: Session, worker: Worker):
+    """Count a newly inserted worker and create its zeroed rollup row"""
+    _apply_deltas(db, worker.company_id, worker.id, {"workers_count": 1})
+
+def record_workers_added(db: Session, company_id: int, count: int):
+    """Count workers inserted in bulk; their worker rows are created lazily"""
+    _apply_deltas(db, company_id, None, {"workers_count": count})
+
+def compliance_percentage(stats: Optional[CompanyComplianceStats]) -> float:
+    """Share of approved documents over all active documents"""
+    if stats is None or not stats.documents_count:
+        return 0
+    return stats.approved_count / stats.documents_count * 100
+
+def worker_compliance_status(stats: Optional[WorkerComplianceStats]) -> str:
+    """Derive the worker compliance label from its rollup row"""
+    if stats is None or not stats.documents_count:
+        return "no_documents"
+    if stats.approved_count == stats.documents_count:
+        return "compliant"
+    return "non_compliant"
+
+def worker_compliance_status_column():
+    """``worker_compliance_status`` as SQL, for selects outer-joined to the rollup"""
+    return case(
+        (func.coalesce(WorkerComplianceStats.documents_count, 0) == 0, "no_documents"),
+        (WorkerComplianceStats.approved_count == WorkerComplianceStats.documents_count, "compliant"),
+        else_="non_compliant"
+    )
+
+def _expected_counts(db: Session, company_id: Optional[int] = None):
+    """Recompute the rollups from the source tables"""
+    zero = lambda: {column: 0 for column in COUNTER_COLUMNS}
+    companies: Dict[int, Dict[str, int]] = {}
+    workers: Dict[int, Dict[str, int]] = {}
+    worker_company: Dict[int, int] = {}
+
+    worker_query = select(Worker.id, Worker.company_id)
+    if company_id is not None:
+        worker_query = worker_query.where(Worker.company_id == company_id)
+    for worker_id, worker_company_id in db.execute(worker_query):
+        workers[worker_id] = zero()
+        worker_company[worker_id] = worker_company_id
+        company = companies.setdefault(worker_company_id, dict(zero(), workers_count=0))
+        company["workers_count"] += 1
+
+    doc_query = select(
+        Document.company_id,
+        Document.worker_id,
+        Document.status,
+        func.count(Document.id),
+    ).where(Document.is_active.isnot(False)).group_by(
+        Document.company_id, Document.worker_id, Document.status
+    )
+    if company_id is not None:
+        doc_query = doc_query.where(Document.company_id == company_id)
+    for doc_company_id, worker_id, status, count in db.execute(doc_query):
+        column = STATUS_COLUMNS[as_model_status(status or DocumentStatus.PENDING)]
+        company = companies.setdefault(doc_company_id, dict(zero(), workers_count=0))
+        company["documents_count"] += count
+        company[column] += count
+        worker = workers.setdefault(worker_id, zero())
+        worker_company.setdefault(worker_id, doc_company_id)
+        worker["documents_count"] += count
+        worker[column] += count
+
+    return companies, workers, worker_company
+
+def reconcile_rollups(db: Session, company_id: Optional[int] = None, fix: bool = True) -> List[dict]:
+    """Compare rollups against the source tables and optionally repair drift.
+
+    Returns one entry per drifted row. The caller owns the commit.
+    """
+    companies, workers, worker_company = _expected_counts(db, company_id)
+    drift = []
+
+    company_query = select(CompanyComplianceStats)
+    worker_query = select(WorkerComplianceStats)
+    if company_id is not None:
+        company_query = company_query.where(CompanyComplianceStats.company_id == company_id)
+        worker_query = worker_query.where(WorkerComplianceStats.company_id == company_id)
+
+    stored_companies = {row.company_id: row for row in db.scalars(company_query)}
+    stored_workers = {row.worker_id: row for row in db.scalars(worker_query)}
+
+    company_columns = ["workers_count"] + COUNTER_COLUMNS
+    for key in set(companies) | set(stored_companies):
+        expected = companies.get(key) or {column: 0 for column in company_columns}
+        row = stored_companies.get(key)
+        actual = {column: getattr(row, column) for column in company_columns} if row else None
+        if actual is None and not any(expected.values()):
+            # Rows are created lazily; a missing row means all zeros
+            continue
+        if actual != expected:
+            drift.append({"company_id": key, "expected": expected, "actual": actual})
+            if fix:
+                _ensure_rows(db, key)
+                db.execute(
+                    update(CompanyComplianceStats)
+                    .where(CompanyComplianceStats.company_id == key)
+                    .values(**expected)
+                )
+
+    for key in set(workers) | set(stored_workers):
+        expected = workers.get(key) or {column: 0 for column in COUNTER_COLUMNS}
+        row = stored_workers.get(key)
+        actual = {column: getattr(row, column) for column in COUNTER_COLUMNS} if row else None
+        if actual is None and not any(expected.values()):
+            continue
+        if actual != expected:
+            drift.append({"worker_id": key, "expected": expected, "actual": actual})
+            if fix:
+                owner = worker_company.get(key) or row.company_id
+                _ensure_rows(db, owner, key)
+                db.execute(
+                    update(WorkerComplianceStats)
+                    .where(WorkerComplianceStats.worker_id == key)
+                    .values(**expected)
+                )
+                record_gate_change(db, owner, key)
+
+    return drift
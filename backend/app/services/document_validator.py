@@ -0,0 +1,100 @@
+# backend/app/services/document_validator.py
+import os
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional
+import aiofiles
+import aiofiles.os
+from ..core.config import settings
+from ..models.document import DocumentType
+from ..models.observation import ObservationType
+from .ocr_service import get_ocr_service
+
+# Scans whose content must be readable
+OCR_DOCUMENT_TYPES = {DocumentType.EXAMEN_MEDICO, DocumentType.CERTIFICADO_ALTURA}
+
+# Leading bytes identifying each accepted format
+SIGNATURES = {
+    b"%PDF-": "application/pdf",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"\xff\xd8\xff": "image/jpeg",
+}
+
+def detect_content_type(header: bytes) -> Optional[str]:
+    """Identify the file format from its first bytes"""
+    for signature, content_type in SIGNATURES.items():
+        if header.startswith(signature):
+            return content_type
+    return None
+
+@dataclass
+class ValidationIssue:
+    type: str
+    title: str
+    description: str
+
+@dataclass
+class ValidationResult:
+    is_valid: bool
+    errors: List[ValidationIssue] = field(default_factory=list)
+
+    def errors_as_dicts(self) -> List[dict]:
+        return [asdict(error) for error in self.errors]
+
+    @classmethod
+    def from_dicts(cls, is_valid: bool, errors: List[dict]) -> "ValidationResult":
+        return cls(is_valid=is_valid, errors=[ValidationIssue(**error) for error in errors])
+
+class DocumentValidator:
+    """Checks a stored document before it goes to review.
+
+    The result depends only on file content and document type, so it can be
+    cached per content hash.
+    """
+
+    async def validate(self, file_path: str, document_type, file_hash: Optional[str] = None) -> ValidationResult:
+        errors: List[ValidationIssue] = []
+
+        if not await aiofiles.os.path.exists(file_path):
+            errors.append(ValidationIssue(
+                type=ObservationType.MISSING.value,
+                title="File not found",
+                description="The stored file could not be found"
+            ))
+            return ValidationResult(is_valid=False, errors=errors)
+
+        async with aiofiles.open(file_path, "rb") as f:
+            header = await f.read(16)
+
+        if not header:
+            errors.append(ValidationIssue(
+                type=ObservationType.INCOMPLETE.value,
+                title="Empty file",
+                description="The uploaded file is empty"
+            ))
+            return ValidationResult(is_valid=False, errors=errors)
+
+        content_type = detect_content_type(header)
+        if content_type is None:
+            errors.append(ValidationIssue(
+                type=ObservationType.FORMAT_ERROR.value,
+                title="Unrecognized format",
+                description="The file is not a valid PDF, PNG or JPEG"
+            ))
+        elif settings.OCR_ENGINE and self._requires_ocr(document_type):
+            errors.extend(await self._check_legibility(file_path, file_hash))
+
+        return ValidationResult(is_valid=not errors, errors=errors)
+
+    def _requires_ocr(self, document_type) -> bool:
+        return DocumentType(getattr(document_type, "value", document_type)) in OCR_DOCUMENT_TYPES
+
+    async def _check_legibility(self, file_path: str, file_hash: Optional[str]) -> List[ValidationIssue]:
+        file_hash = file_hash or os.path.basename(file_path)
+        result = await get_ocr_service().extract_text(file_path, file_hash)
+        if len(result.text.strip()) < settings.OCR_MIN_TEXT_LENGTH:
+            return [ValidationIssue(
+                type=ObservationType.ILLEGIBLE.value,
+                title="Illegible document",
+                description="No readable text could be recognized in the scan"
+            )]
+        return []
@@ -0,0 +1,170 @@
+# backend/app/services/expiry_engine.py
+"""Scheduled expiry of documents.
+
+Each pass walks the active, not yet expired documents whose
+``expiry_date`` has passed, in batches along the partial index
+``ix_documents_unexpired_expiry_date``. A batch flips its documents to
+EXPIRED with one UPDATE per previous status, opens an EXPIRED
+observation for each, moves the rollup counters and notifies the
+company. The pass then
+refreshes every company's count of documents expiring within
+``EXPIRY_WARNING_DAYS``.
+
+Every transaction first takes a Postgres transaction-level advisory
+lock, so engines running on several replicas take turns instead of
+expiring the same rows twice. SQLite has no advisory locks but
+serializes writers, and the guarded UPDATE only returns rows it changed.
+"""
+import logging
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal, try_advisory_lock
+from ..models.document import Document, DocumentStatus
+from ..models.observation import Observation, ObservationStatus, ObservationType
+from ..models.notification import NotificationKind
+from .compliance_rollup import record_documents_expired, set_expiring_counts
+from .notification_service import document_event, enqueue_events
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_LOCK_KEY = zlib.crc32(b"sso.expiry_engine")
+
+@dataclass
+class ExpiredDocument:
+    id: int
+    company_id: int
+    worker_id: int
+    name: str
+    expiry_date: date
+    old_status: DocumentStatus
+
+@dataclass
+class ExpiryPassResult:
+    expired: int = 0
+    batches: int = 0
+    expiring_rows_updated: int = 0
+    skipped: bool = False  # another engine held the lock
+
+def _can_expire():
+    # Matches the partial index predicate
+    return (Document.status != DocumentStatus.EXPIRED, Document.is_active == True)
+
+def expire_batch(db: Session, today: date, batch_size: int) -> Optional[List[ExpiredDocument]]:
+    """Expire the next overdue documents; None when nothing is overdue.
+
+    The caller owns the commit.
+    """
+    candidates = db.execute(
+        select(Document.id, Document.status)
+        .where(Document.expiry_date < today, *_can_expire())
+        .order_by(Document.expiry_date, Document.id)
+        .limit(batch_size)
+    ).all()
+    if not candidates:
+        return None
+
+    by_status = defaultdict(list)
+    for document_id, status in candidates:
+        by_status[status].append(document_id)
+
+    expired = []
+    for old_status, ids in by_status.items():
+        rows = db.execute(
+            update(Document)
+            .where(Document.id.in_(ids), Document.status == old_status)
+            .values(status=DocumentStatus.EXPIRED)
+            .returning(Document.id, Document.company_id, Document.worker_id, Document.name, Document.expiry_date)
+            .execution_options(synchronize_session=False)
+        ).all()
+        expired.extend(ExpiredDocument(*row, old_status=old_status) for row in rows)
+    if not expired:
+        return expired
+
+    deadline = datetime.now(timezone.utc) + timedelta(days=settings.OBSERVATION_DEADLINE_DAYS)
+    db.execute(insert(Observation), [
+        {
+            "type": ObservationType.EXPIRED,
+            "status": ObservationStatus.OPEN,
+            "title": "Document expired",
+            "description": f"{document.name} expired on {document.expiry_date:%Y-%m-%d}",
+            "deadline": deadline,
+            "document_id": document.id,
+        }
+        for document in expired
+    ])
+    record_documents_expired(db, [
+        (document.company_id, document.worker_id, document.old_status)
+        for document in expired
+    ])
+    enqueue_events(db, [
+        document_event(
+            NotificationKind.DOCUMENT_EXPIRED, document,
+            f"{document.name} expired on {document.expiry_date:%Y-%m-%d}"
+        )
+        for document in expired
+    ])
+    return expired
+
+def refresh_expiring_counts(db: Session, today: date, days: int) -> int:
+    """Recount documents expiring in [today, today + days] per company"""
+    counts = dict(db.execute(
+        select(Document.company_id, func.count(Document.id))
+        .where(Document.expiry_date.between(today, today + timedelta(days=days)), *_can_expire())
+        .group_by(Document.company_id)
+    ).all())
+    return set_expiring_counts(db, counts)
+
+def run_pass(today: Optional[date] = None) -> ExpiryPassResult:
+    """Expire everything overdue, then refresh the expiring-soon counts"""
+    today = today or date.today()
+    result = ExpiryPassResult()
+    db = SessionLocal()
+    try:
+        while True:
+            if not try_advisory_lock(db, EXPIRY_LOCK_KEY):
+                db.rollback()
+                result.skipped = True
+                return result
+            expired = expire_batch(db, today, settings.EXPIRY_ENGINE_BATCH_SIZE)
+            db.commit()
+            if expired is None:
+                break
+            result.expired += len(expired)
+            result.batches += 1
+
+        if not try_advisory_lock(db, EXPIRY_LOCK_KEY):
+            db.rollback()
+            result.skipped = True
+            return result
+        result.expiring_rows_updated = refresh_expiring_counts(db, today, settings.EXPIRY_WARNING_DAYS)
+        db.commit()
+    finally:
+        db.close()
+    return result
+
+def run_engine(once: bool = False):
+    """Run passes every EXPIRY_ENGINE_INTERVAL seconds"""
+    while True:
+        started = time.monotonic()
+        try:
+            result = run_pass()
+        except Exception:
+            if once:
+                raise
+            logger.exception("Expiry pass failed")
+        else:
+            logger.info(
+                "Expiry pass: %s documents expired in %s batches, %s expiring counts updated%s",
+                result.expired, result.batches, result.expiring_rows_updated,
+                " (skipped, lock held elsewhere)" if result.skipped else ""
+            )
+            if once:
+                return result
+        time.sleep(max(0.0, settings.EXPIRY_ENGINE_INTERVAL - (time.monotonic() - started)))
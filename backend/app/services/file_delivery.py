@@ -0,0 +1,141 @@
+# backend/app/services/file_delivery.py
+"""Serving stored files with byte ranges and without copying through Python.
+
+A download is answered in one of three ways, cheapest first:
+
+- ``X-Accel-Redirect`` when ``DOWNLOAD_ACCEL_REDIRECT_PREFIX`` is set.
+  The front proxy (nginx ``internal`` location) sends the bytes and
+  handles ``Range`` itself.
+- The ASGI ``http.response.zerocopysend`` extension when the server
+  offers it. The server ``sendfile``s the range straight from the file
+  descriptor.
+- Otherwise, ``DOWNLOAD_CHUNK_SIZE`` reads off the event loop. Only one
+  chunk is in memory at a time.
+
+Blobs are content addressed, so the SHA-256 is a strong validator.
+It backs ``If-None-Match`` (``utils.etag.etag_matches``) and
+``If-Range``. ``HEAD`` gets the same headers without the body. Only single ranges are
+honoured. A multi-range request gets the whole file, which RFC 9110
+allows.
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import quote
+import aiofiles
+from fastapi import Request, Response
+from starlette.types import Receive, Scope, Send
+from ..core.config import settings
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+class RangeNotSatisfiable(Exception):
+    """The requested range lies outside the file"""
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) of a single byte range; None to send the whole file"""
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if match is None:
+        # Multiple or malformed ranges: ignoring Range is always allowed
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # Invalid rather than unsatisfiable (RFC 9110 14.1.1)
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(int(last), size - 1) if last else size - 1
+
+@dataclass
+class FileDelivery:
+    path: str
+    size: int
+    etag: str
+    media_type: str
+    filename: str
+
+    def disposition(self) -> str:
+        fallback = self.filename.encode("ascii", "replace").decode().replace('"', "")
+        return f"inline; filename=\"{fallback}\"; filename*=UTF-8''{quote(self.filename)}"
+
+    def headers(self) -> dict:
+        return {
+            "ETag": self.etag,
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": self.disposition(),
+            # Revalidation is cheap: the ETag is the content hash
+            "Cache-Control": "private, no-cache",
+        }
+
+class FileRangeResponse(Response):
+    """A whole file (200) or one range of it (206)"""
+
+    def __init__(self, delivery: FileDelivery, byte_range: Optional[Tuple[int, int]] = None, method: str = "GET"):
+        self.delivery = delivery
+        self.start, self.end = byte_range if byte_range else (0, delivery.size - 1)
+        self.status_code = 206 if byte_range else 200
+        self.send_body = method != "HEAD"
+        self.background = None
+        headers = delivery.headers()
+        headers["Content-Length"] = str(max(0, self.end - self.start + 1))
+        if byte_range:
+            headers["Content-Range"] = f"bytes {self.start}-{self.end}/{delivery.size}"
+        self.media_type = delivery.media_type
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        length = self.end - self.start + 1
+        if not self.send_body or length <= 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            fd = os.open(self.delivery.path, os.O_RDONLY)
+            try:
+                await send({"type": "http.response.zerocopysend", "file": fd, "offset": self.start, "count": length})
+            finally:
+                os.close(fd)
+            return
+
+        chunk_size = settings.DOWNLOAD_CHUNK_SIZE
+        async with aiofiles.open(self.delivery.path, "rb") as f:
+            await f.seek(self.start)
+            remaining = length
+            while remaining > 0:
+                chunk = await f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # The file shrank underneath us; end the body rather than hang the client
+            await send({"type": "http.response.body", "body": b""})
+
+def accel_redirect_headers(delivery: FileDelivery) -> Optional[dict]:
+    """Headers handing the download to the front proxy, when configured"""
+    prefix = settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX
+    if not prefix:
+        return None
+    relative = os.path.relpath(os.path.abspath(delivery.path), os.path.abspath(settings.UPLOAD_FOLDER))
+    headers = delivery.headers()
+    headers["Content-Type"] = delivery.media_type
+    headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(relative.replace(os.sep, "/"))
+    return headers
+
+def is_range_current(request: Request, etag: str) -> bool:
+    """If-Range absent or still naming this representation (strong comparison)"""
+    if_range = request.headers.get("if-range")
+    return if_range is None or if_range.strip() == etag
@@ -0,0 +1,189 @@
+# backend/app/services/gate_snapshot.py
+"""Signed, compressed credential snapshots and deltas for offline gates.
+
+Gate devices at remote sites keep a local copy of their company's active
+credentials. They download one full snapshot, then only deltas.
+
+A response body is ``payload || signature``:
+
+- ``payload`` is a zlib stream of a 30-byte header, fixed 18-byte rows
+  and a 4-byte row count;
+- ``signature`` is 64 bytes, Ed25519 over SHA-256(payload), checked
+  against the key from ``/credentials/gate/public-key``.
+
+Header (big-endian): magic ``SSOG``, format u8, kind u8 (1 snapshot,
+2 delta), company id u32, version u64, since u64, generated at u32.
+
+Row: worker id u32, credential id u32, valid until u32 (epoch), RUN
+number u32, RUN check digit (1 ASCII byte), flags u8 (``FLAG_*``).
+
+In a delta, every changed worker starts with a row whose credential id
+is 0. The device drops what it holds for that worker and applies the
+rows that follow. A snapshot has no such markers.
+
+Versions are ``gate_changes`` ids. The version a response advertises
+only counts changes older than ``SETTLE_SECONDS``, so a change that
+commits late is still in the next delta. Rows always show the current
+state, so applying one twice is harmless.
+"""
+import base64
+import hashlib
+import hmac
+import struct
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models.compliance import WorkerComplianceStats
+from ..models.credential import Credential, GateChange
+from ..models.worker import Worker
+from .compliance_rollup import worker_compliance_status
+
+FORMAT_VERSION = 1
+KIND_SNAPSHOT = 1
+KIND_DELTA = 2
+
+FLAG_WORKER_ACTIVE = 1
+FLAG_COMPLIANT = 2
+FLAG_HAS_DOCUMENTS = 4
+
+SETTLE_SECONDS = 10
+STREAM_BATCH = 1000
+
+_HEADER = struct.Struct(">4sBBIQQI")
+_ROW = struct.Struct(">IIIIcB")
+_FOOTER = struct.Struct(">I")
+
+class SnapshotRequired(Exception):
+    """The delta's starting version was pruned from the change log"""
+
+def _signing_key() -> Ed25519PrivateKey:
+    if settings.GATE_SNAPSHOT_SIGNING_KEY:
+        seed = base64.b64decode(settings.GATE_SNAPSHOT_SIGNING_KEY)
+    else:
+        seed = hmac.new(settings.SECRET_KEY.encode(), b"gate-snapshot-signing", hashlib.sha256).digest()
+    return Ed25519PrivateKey.from_private_bytes(seed)
+
+_KEY = _signing_key()
+
+def public_key() -> str:
+    """Base64 raw Ed25519 public key gate devices verify responses with"""
+    return base64.b64encode(_KEY.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)).decode()
+
+async def settled_version(db: AsyncSession, company_id: int) -> int:
+    """Highest change id old enough that no earlier id can still commit"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=SETTLE_SECONDS)
+    version = await db.scalar(
+        select(func.max(GateChange.id))
+        .where(GateChange.company_id == company_id, GateChange.created_at <= cutoff)
+    )
+    return version or 0
+
+async def check_delta_start(db: AsyncSession, company_id: int, since: int):
+    """Raise SnapshotRequired when changes after ``since`` were pruned"""
+    oldest = await db.scalar(select(func.min(GateChange.id)).where(GateChange.company_id == company_id))
+    if since and oldest is not None and since < oldest - 1:
+        raise SnapshotRequired()
+
+def _row_query(company_id: int):
+    now = datetime.now(timezone.utc)
+    return (
+        select(
+            Worker.id, Worker.run_number, Worker.run_dv, Worker.is_active,
+            Credential.id, Credential.valid_until, WorkerComplianceStats
+        )
+        .join(Credential, Credential.worker_id == Worker.id)
+        .outerjoin(WorkerComplianceStats, WorkerComplianceStats.worker_id == Worker.id)
+        .where(
+            Worker.company_id == company_id,
+            Credential.revoked_at.is_(None),
+            Credential.valid_until > now
+        )
+        .order_by(Worker.id, Credential.id)
+    )
+
+def _pack_row(worker_id, run_number, run_dv, is_active, credential_id, valid_until, stats) -> bytes:
+    flags = FLAG_WORKER_ACTIVE if is_active else 0
+    if stats is not None and stats.documents_count:
+        flags |= FLAG_HAS_DOCUMENTS
+    if worker_compliance_status(stats) == "compliant":
+        flags |= FLAG_COMPLIANT
+    if valid_until.tzinfo is None:
+        # SQLite hands back naive UTC timestamps
+        valid_until = valid_until.replace(tzinfo=timezone.utc)
+    return _ROW.pack(
+        worker_id, credential_id, int(valid_until.timestamp()),
+        int(run_number or 0), (run_dv or "0").encode()[:1], flags
+    )
+
+def _marker(worker_id: int) -> bytes:
+    return _ROW.pack(worker_id, 0, 0, 0, b"0", 0)
+
+async def _rows(db: AsyncSession, statement, markers=None) -> AsyncIterator[bytes]:
+    """Pack rows in batches streamed from a server-side cursor"""
+    result = await db.stream(statement.execution_options(yield_per=STREAM_BATCH))
+    async for partition in result.partitions():
+        chunk = []
+        for row in partition:
+            if markers is not None and row[0] in markers:
+                chunk.append(_marker(row[0]))
+                markers.discard(row[0])
+            chunk.append(_pack_row(*row))
+        yield b"".join(chunk)
+    if markers:
+        # Changed workers left without an active credential
+        yield b"".join(_marker(worker_id) for worker_id in sorted(markers))
+
+async def _signed(header: bytes, rows: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6)
+    digest = hashlib.sha256()
+    count = 0
+
+    def emit(data: bytes) -> bytes:
+        digest.update(data)
+        return data
+
+    yield emit(compressor.compress(header))
+    async for chunk in rows:
+        count += len(chunk) // _ROW.size
+        data = compressor.compress(chunk)
+        if data:
+            yield emit(data)
+    yield emit(compressor.compress(_FOOTER.pack(count)) + compressor.flush())
+    yield _KEY.sign(digest.digest())
+
+def stream_snapshot(db: AsyncSession, company_id: int, version: int) -> AsyncIterator[bytes]:
+    header = _HEADER.pack(b"SSOG", FORMAT_VERSION, KIND_SNAPSHOT, company_id, version, 0, int(time.time()))
+    return _signed(header, _rows(db, _row_query(company_id)))
+
+async def stream_delta(db: AsyncSession, company_id: int, since: int, version: int) -> AsyncIterator[bytes]:
+    changed = set((await db.scalars(
+        select(GateChange.worker_id.distinct())
+        .where(GateChange.company_id == company_id, GateChange.id > since)
+    )).all())
+    header = _HEADER.pack(b"SSOG", FORMAT_VERSION, KIND_DELTA, company_id, version, since, int(time.time()))
+    statement = _row_query(company_id).where(Worker.id.in_(changed)) if changed else None
+
+    async def rows():
+        if statement is not None:
+            async for chunk in _rows(db, statement, markers=set(changed)):
+                yield chunk
+
+    async for data in _signed(header, rows()):
+        yield data
+
+def prune_changes(db: Session, older_than: timedelta) -> int:
+    """Delete old change log rows, keeping each company's latest; the caller owns the commit"""
+    cutoff = datetime.now(timezone.utc) - older_than
+    latest = select(func.max(GateChange.id)).group_by(GateChange.company_id)
+    return db.execute(
+        delete(GateChange)
+        .where(GateChange.created_at < cutoff, GateChange.id.not_in(latest))
+        .execution_options(synchronize_session=False)
+    ).rowcount
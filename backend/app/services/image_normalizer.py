@@ -0,0 +1,146 @@
+# backend/app/services/image_normalizer.py
+"""Ingest-time normalization of uploaded photos.
+
+Phone photos of certificates arrive as multi-megabyte JPEGs with EXIF
+rotation, or as huge PNGs. With ``IMAGE_NORMALIZATION`` set, each upload
+is rotated upright and downscaled to ``IMAGE_TARGET_DPI`` for an A4 page.
+It is then re-encoded as an optimized JPEG (``jpeg``) or wrapped in a
+single-page JPEG-compressed PDF (``pdf``). The result is kept only when
+it is smaller than the original.
+
+Decoding and encoding are CPU-bound and run in a ProcessPoolExecutor. The
+worker writes the output next to the upload's temp file and hashes it, so
+only the path and digest cross the process boundary. Deduplication by the
+original hash happens in ``blob_store.store_blob``.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from ..core.config import settings
+from ..core.metrics import register_metrics
+from .storage import StoredFile, discard
+
+MODES = ("jpeg", "pdf")
+
+A4_LONG_EDGE_INCHES = 11.69
+
+def _normalize_in_process(source: str, destination: str, mode: str, dpi: int, quality: int) -> Optional[tuple]:
+    # Runs inside the pool; returns (sha256, size) of the written file, or None for non-images
+    from PIL import Image, ImageOps
+    image = Image.open(source)
+    if image.format not in ("JPEG", "PNG"):
+        return None
+    max_edge = round(A4_LONG_EDGE_INCHES * dpi)
+    # JPEG decodes straight to a smaller scale when that still covers max_edge
+    image.draft("RGB", (max_edge, max_edge))
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    if mode == "pdf":
+        image.save(destination, "PDF", resolution=dpi, quality=quality)
+    else:
+        image.save(destination, "JPEG", quality=quality, optimize=True, progressive=True)
+
+    sha256 = hashlib.sha256()
+    with open(destination, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest(), os.path.getsize(destination)
+
+class ImageNormalizer:
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None):
+        self.mode = mode or settings.IMAGE_NORMALIZATION
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown image normalization mode: {self.mode}")
+        self.workers = workers or settings.IMAGE_NORMALIZATION_WORKERS
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self.normalized = 0
+        self.kept_original = 0
+        self.failures = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.busy_seconds = 0.0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def normalize(self, temp: StoredFile) -> Optional[StoredFile]:
+        """A smaller normalized copy of an uploaded image, or None to keep the original"""
+        destination = f"{temp.path}.{self.mode}"
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(
+                self._executor(), _normalize_in_process, temp.path, destination,
+                self.mode, settings.IMAGE_TARGET_DPI, settings.IMAGE_QUALITY
+            )
+        except Exception:
+            # Undecodable images are stored as uploaded; validation reports them
+            self.failures += 1
+            await discard(destination)
+            return None
+        finally:
+            self.busy_seconds += time.perf_counter() - started
+
+        if result is None:
+            return None
+        sha256, size = result
+        if size >= temp.size:
+            self.kept_original += 1
+            await discard(destination)
+            return None
+
+        self.normalized += 1
+        self.bytes_in += temp.size
+        self.bytes_out += size
+        return StoredFile(path=destination, sha256=sha256, size=size)
+
+    def metrics(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "normalized": self.normalized,
+            "kept_original": self.kept_original,
+            "failures": self.failures,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "compression_ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            "seconds_per_image": (
+                round(self.busy_seconds / (self.normalized + self.kept_original), 3)
+                if self.normalized + self.kept_original else 0.0
+            ),
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+_normalizer: Optional[ImageNormalizer] = None
+
+def get_image_normalizer() -> Optional[ImageNormalizer]:
+    """Process-wide normalizer, or None when IMAGE_NORMALIZATION is unset"""
+    global _normalizer
+    if _normalizer is None and settings.IMAGE_NORMALIZATION:
+        _normalizer = ImageNormalizer()
+        register_metrics("image_normalization", _normalizer.metrics)
+    return _normalizer
+
+def shutdown_image_normalizer():
+    """Stop the normalizer's pool, if one was started"""
+    if _normalizer is not None:
+        _normalizer.shutdown()
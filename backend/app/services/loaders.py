@@ -0,0 +1,122 @@
+# backend/app/services/loaders.py
+"""DataLoader-style batching for nested API responses.
+
+Response builders hand every parent of one level to a loader, which
+resolves the whole level with a single ``IN (...)`` query and attaches the
+results to the parents. Query count therefore depends on nesting depth,
+not on how many rows a tenant has.
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from ..models.compliance import CompanyComplianceStats, WorkerComplianceStats
+from ..models.company import Company
+from ..models.document import Document
+from ..models.observation import Observation
+from ..models.worker import Worker
+from .compliance_rollup import compliance_percentage, worker_compliance_status
+
+class BatchLoader:
+    """Load rows of ``model`` for many keys of ``key_column`` at once.
+
+    Results are cached per loader, so asking twice for the same key (or
+    for a subset of keys already loaded) does not hit the database again.
+    """
+
+    def __init__(self, db: Session, model, key_column, many: bool = True, order_by=None, where=None):
+        self.db = db
+        self.model = model
+        self.key_column = key_column
+        self.many = many
+        self.order_by = order_by
+        self.where = where
+        self._cache: Dict[int, object] = {}
+
+    def load_many(self, keys: Iterable[int]) -> Dict[int, object]:
+        keys = {key for key in keys if key is not None}
+        missing = keys - self._cache.keys()
+        if missing:
+            query = select(self.model).where(self.key_column.in_(missing))
+            if self.where is not None:
+                query = query.where(self.where)
+            if self.order_by is not None:
+                query = query.order_by(self.order_by)
+            for key in missing:
+                self._cache[key] = [] if self.many else None
+            attribute = self.key_column.key
+            for row in self.db.scalars(query):
+                key = getattr(row, attribute)
+                if self.many:
+                    self._cache[key].append(row)
+                else:
+                    self._cache[key] = row
+        return {key: self._cache[key] for key in keys}
+
+    def load(self, key: int):
+        return self.load_many([key])[key]
+
+    def attach(self, parents: List, attribute: str, key: Callable = lambda parent: parent.id):
+        """Populate ``attribute`` on every parent without triggering lazy loads"""
+        loaded = self.load_many(key(parent) for parent in parents)
+        for parent in parents:
+            set_committed_value(parent, attribute, loaded[key(parent)])
+        return loaded
+
+class Loaders:
+    """Per-request set of loaders; create one per response being built"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.workers_by_company = BatchLoader(
+            db, Worker, Worker.company_id, order_by=Worker.id
+        )
+        self.documents_by_worker = BatchLoader(
+            db, Document, Document.worker_id,
+            order_by=Document.id, where=Document.is_active == True
+        )
+        self.observations_by_document = BatchLoader(
+            db, Observation, Observation.document_id, order_by=Observation.id
+        )
+        self.company_stats = BatchLoader(
+            db, CompanyComplianceStats, CompanyComplianceStats.company_id, many=False
+        )
+        self.worker_stats = BatchLoader(
+            db, WorkerComplianceStats, WorkerComplianceStats.worker_id, many=False
+        )
+
+    def apply_company_stats(self, companies: List[Company]):
+        stats = self.company_stats.load_many(company.id for company in companies)
+        for company in companies:
+            row = stats[company.id]
+            company.workers_count = row.workers_count if row else 0
+            company.documents_count = row.documents_count if row else 0
+            company.compliance_percentage = compliance_percentage(row)
+
+    def apply_worker_stats(self, workers: List[Worker]):
+        stats = self.worker_stats.load_many(worker.id for worker in workers)
+        for worker in workers:
+            row = stats[worker.id]
+            worker.documents_count = row.documents_count if row else 0
+            worker.compliance_status = worker_compliance_status(row)
+
+def build_company_with_details(db: Session, company: Company, loaders: Optional[Loaders] = None) -> Company:
+    """Company with statistics and its workers: three queries regardless of size"""
+    loaders = loaders or Loaders(db)
+    loaders.apply_company_stats([company])
+    workers = loaders.workers_by_company.attach([company], "workers")[company.id]
+    loaders.apply_worker_stats(workers)
+    return company
+
+def build_worker_with_documents(db: Session, worker: Worker, loaders: Optional[Loaders] = None) -> Worker:
+    """Worker with statistics and its active documents: two queries"""
+    loaders = loaders or Loaders(db)
+    loaders.apply_worker_stats([worker])
+    loaders.documents_by_worker.attach([worker], "documents")
+    return worker
+
+def build_documents_with_observations(db: Session, documents: List[Document], loaders: Optional[Loaders] = None) -> List[Document]:
+    """Documents with their observations embedded: one query for all observations"""
+    loaders = loaders or Loaders(db)
+    loaders.observations_by_document.attach(documents, "observations")
+    return documents
@@ -0,0 +1,383 @@
+# backend/app/services/notification_service.py
+"""Notifications for company RRHH and prevencionistas, delivered as digests.
+
+Events are written to ``notifications`` in the transaction that caused
+them, one row per recipient. The dispatcher folds a recipient's pending
+events into one ``NotificationDigest`` once the oldest of them has
+waited ``NOTIFICATION_DIGEST_WINDOW`` seconds, then sends digests over a
+single persistent SMTP connection. A failed send is retried with
+exponential backoff up to ``NOTIFICATION_MAX_ATTEMPTS``; when the relay
+itself is unreachable the rest of the batch is put back untouched.
+Coalescing runs under an advisory lock and digests are claimed with a
+guarded UPDATE, so several dispatchers can run side by side.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+import aiosmtplib
+from sqlalchemy import select, update, insert, delete, func, or_, and_
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal, try_advisory_lock
+from ..core.metrics import register_metrics
+from ..models.document import Document
+from ..models.notification import Notification, NotificationDigest, NotificationKind, DigestStatus
+from ..models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_LOCK_KEY = zlib.crc32(b"sso.notification_digests")
+
+SECTION_TITLES = {
+    NotificationKind.DOCUMENT_EXPIRED: "Expired documents",
+    NotificationKind.OBSERVATION_CREATED: "New observations",
+    NotificationKind.DOCUMENT_APPROVED: "Approved documents",
+}
+
+# The relay is down or unreachable, as opposed to rejecting one message
+RELAY_ERRORS = (
+    OSError,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPTimeoutError,
+)
+
+@dataclass
+class Event:
+    kind: NotificationKind
+    company_id: int
+    title: str
+    body: str = ""
+    document_id: Optional[int] = None
+
+def document_event(kind: NotificationKind, document: Document, title: str, body: str = "") -> Event:
+    return Event(kind=kind, company_id=document.company_id, title=title, body=body, document_id=document.id)
+
+def _recipients(db: Session, company_ids) -> Dict[Optional[int], List[tuple]]:
+    """(user id, email) of the active RRHH and prevencionistas, by company.
+
+    Prevencionistas without a company oversee every contractor and are
+    listed under None.
+    """
+    rows = db.execute(
+        select(User.id, User.email, User.company_id)
+        .where(
+            User.is_active == True,
+            or_(
+                and_(
+                    User.role.in_([UserRole.RRHH, UserRole.PREVENCIONISTA]),
+                    User.company_id.in_(company_ids)
+                ),
+                and_(User.role == UserRole.PREVENCIONISTA, User.company_id.is_(None)),
+            )
+        )
+    ).all()
+    recipients = defaultdict(list)
+    for user_id, email, company_id in rows:
+        recipients[company_id].append((user_id, email))
+    return recipients
+
+def enqueue_events(db: Session, events: List[Event]) -> int:
+    """Fan events out to their recipients; call before the surrounding commit"""
+    if not events:
+        return 0
+    recipients = _recipients(db, {event.company_id for event in events})
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "kind": event.kind,
+            "recipient_id": user_id,
+            "recipient_email": email,
+            "title": event.title,
+            "body": event.body,
+            "company_id": event.company_id,
+            "document_id": event.document_id,
+            "created_at": now,
+        }
+        for event in events
+        for user_id, email in recipients[event.company_id] + recipients[None]
+    ]
+    if rows:
+        db.execute(insert(Notification), rows)
+    return len(rows)
+
+def coalesce_digests(db: Session, now: Optional[datetime] = None) -> int:
+    """Fold the pending events of recipients whose window closed into digests.
+
+    The caller owns the commit.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.NOTIFICATION_DIGEST_WINDOW)
+    due = db.execute(
+        select(Notification.recipient_email, func.max(Notification.id))
+        .where(Notification.digest_id.is_(None))
+        .group_by(Notification.recipient_email)
+        .having(func.min(Notification.created_at) <= cutoff)
+    ).all()
+
+    created = 0
+    for email, last_id in due:
+        digest = NotificationDigest(recipient_email=email, status=DigestStatus.QUEUED, run_after=now)
+        db.add(digest)
+        db.flush()
+        folded = db.execute(
+            update(Notification)
+            .where(
+                Notification.recipient_email == email,
+                Notification.digest_id.is_(None),
+                Notification.id <= last_id
+            )
+            .values(digest_id=digest.id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if folded:
+            digest.events_count = folded
+            created += 1
+        else:
+            # Another dispatcher folded them first
+            db.execute(delete(NotificationDigest).where(NotificationDigest.id == digest.id))
+            db.expunge(digest)
+    return created
+
+def claim_digests(db: Session, sender: str, limit: int) -> List[NotificationDigest]:
+    """Lease up to ``limit`` due digests, including ones whose lease expired"""
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=settings.NOTIFICATION_LEASE_TIMEOUT)
+    runnable = or_(
+        and_(NotificationDigest.status == DigestStatus.QUEUED, NotificationDigest.run_after <= now),
+        and_(NotificationDigest.status == DigestStatus.SENDING, NotificationDigest.locked_at < stale),
+    )
+    ids = db.scalars(
+        select(NotificationDigest.id)
+        .where(runnable)
+        .order_by(NotificationDigest.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not ids:
+        db.rollback()
+        return []
+
+    db.execute(
+        update(NotificationDigest)
+        .where(NotificationDigest.id.in_(ids), runnable)
+        .values(
+            status=DigestStatus.SENDING,
+            locked_by=sender,
+            locked_at=now,
+            attempts=NotificationDigest.attempts + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return db.scalars(
+        select(NotificationDigest)
+        .where(NotificationDigest.id.in_(ids), NotificationDigest.locked_by == sender)
+        .order_by(NotificationDigest.id)
+    ).all()
+
+def build_message(digest: NotificationDigest, events: List[Notification]) -> EmailMessage:
+    sections = defaultdict(list)
+    for event in events:
+        sections[event.kind].append(event)
+
+    lines = []
+    for kind, title in SECTION_TITLES.items():
+        if not sections[kind]:
+            continue
+        lines.append(f"{title} ({len(sections[kind])})")
+        for event in sections[kind]:
+            lines.append(f"  - {event.title}")
+            if event.body:
+                lines.append(f"    {event.body}")
+        lines.append("")
+
+    message = EmailMessage()
+    message["From"] = settings.NOTIFICATION_FROM
+    message["To"] = digest.recipient_email
+    message["Subject"] = f"{settings.PROJECT_NAME}: {len(events)} document update{'s' if len(events) != 1 else ''}"
+    message.set_content("\n".join(lines))
+    return message
+
+class SmtpConnection:
+    """One persistent SMTP connection, reopened when the server drops it"""
+
+    def __init__(self):
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self.connects = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            use_tls=settings.SMTP_USE_TLS,
+            start_tls=settings.SMTP_START_TLS,
+            timeout=settings.SMTP_TIMEOUT
+        )
+        await client.connect()
+        if settings.SMTP_USERNAME:
+            await client.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD or "")
+        self.connects += 1
+        return client
+
+    async def send(self, message: EmailMessage):
+        # A connection idle past the server's timeout fails on first use
+        for attempt in range(2):
+            if self._client is None or not self._client.is_connected:
+                self._client = await self._connect()
+            try:
+                await self._client.send_message(message)
+                return
+            except aiosmtplib.SMTPServerDisconnected:
+                self._client = None
+                if attempt:
+                    raise
+
+    async def close(self):
+        if self._client is not None and self._client.is_connected:
+            with contextlib.suppress(aiosmtplib.SMTPException, OSError):
+                await self._client.quit()
+        self._client = None
+
+class DispatcherStats:
+    def __init__(self):
+        self.digests_sent = 0
+        self.events_sent = 0
+        self.send_failures = 0
+        self.send_seconds = 0.0
+
+    def metrics(self) -> dict:
+        return {
+            "digests_sent": self.digests_sent,
+            "events_sent": self.events_sent,
+            "send_failures": self.send_failures,
+            "digests_per_second": self.digests_sent / self.send_seconds if self.send_seconds else 0.0,
+        }
+
+def _retry(digest: NotificationDigest, error: str, now: datetime):
+    digest.last_error = error
+    digest.locked_by = None
+    if digest.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        digest.status = DigestStatus.FAILED
+    else:
+        digest.status = DigestStatus.QUEUED
+        digest.run_after = now + timedelta(seconds=settings.NOTIFICATION_RETRY_BACKOFF * 2 ** (digest.attempts - 1))
+
+async def send_digests(db: Session, connection: SmtpConnection, digests: List[NotificationDigest], stats: DispatcherStats):
+    """Send claimed digests in order, recording each outcome"""
+    events = defaultdict(list)
+    for event in db.scalars(
+        select(Notification)
+        .where(Notification.digest_id.in_([digest.id for digest in digests]))
+        .order_by(Notification.id)
+    ):
+        events[event.digest_id].append(event)
+
+    for index, digest in enumerate(digests):
+        started = time.perf_counter()
+        try:
+            await connection.send(build_message(digest, events[digest.id]))
+        except RELAY_ERRORS as exc:
+            stats.send_failures += 1
+            logger.warning("SMTP relay unavailable: %s", exc)
+            now = datetime.now(timezone.utc)
+            _retry(digest, str(exc), now)
+            # The rest never reached the relay; give their attempt back
+            retry_at = now + timedelta(seconds=settings.NOTIFICATION_RETRY_BACKOFF)
+            for pending in digests[index + 1:]:
+                pending.status = DigestStatus.QUEUED
+                pending.locked_by = None
+                pending.attempts -= 1
+                pending.run_after = retry_at
+            db.commit()
+            return
+        except Exception as exc:
+            stats.send_failures += 1
+            logger.exception("Digest %s failed", digest.id)
+            _retry(digest, str(exc), datetime.now(timezone.utc))
+        else:
+            digest.status = DigestStatus.SENT
+            digest.sent_at = datetime.now(timezone.utc)
+            digest.locked_by = None
+            digest.last_error = None
+            stats.digests_sent += 1
+            stats.events_sent += digest.events_count
+        finally:
+            stats.send_seconds += time.perf_counter() - started
+        db.commit()
+
+async def run_dispatcher(sender: str, stop: Optional[asyncio.Event] = None, stats: Optional[DispatcherStats] = None):
+    """Coalesce and send digests until ``stop`` is set"""
+    if not settings.SMTP_HOST:
+        raise RuntimeError("SMTP_HOST is not configured")
+    stats = stats or DispatcherStats()
+    connection = SmtpConnection()
+    try:
+        while stop is None or not stop.is_set():
+            db = SessionLocal()
+            try:
+                if try_advisory_lock(db, NOTIFICATION_LOCK_KEY):
+                    coalesce_digests(db)
+                    db.commit()
+                else:
+                    db.rollback()
+                digests = claim_digests(db, sender, settings.NOTIFICATION_BATCH_SIZE)
+                if digests:
+                    await send_digests(db, connection, digests, stats)
+                    logger.info("Digests: %s", stats.metrics())
+                    continue
+            finally:
+                db.close()
+            await asyncio.sleep(settings.NOTIFICATION_POLL_INTERVAL)
+    finally:
+        await connection.close()
+
+def dispatcher_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive UTC timestamps
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def queue_metrics() -> dict:
+    """Backlog and recent throughput, read from the database so every process agrees"""
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(minutes=5)
+    with SessionLocal() as db:
+        pending, oldest = db.execute(
+            select(func.count(Notification.id), func.min(Notification.created_at))
+            .outerjoin(NotificationDigest, Notification.digest_id == NotificationDigest.id)
+            .where(or_(
+                Notification.digest_id.is_(None),
+                NotificationDigest.status.in_([DigestStatus.QUEUED, DigestStatus.SENDING])
+            ))
+        ).one()
+        digests_sent, events_sent = db.execute(
+            select(func.count(NotificationDigest.id), func.coalesce(func.sum(NotificationDigest.events_count), 0))
+            .where(NotificationDigest.sent_at >= since)
+        ).one()
+        failed = db.scalar(
+            select(func.count(NotificationDigest.id))
+            .where(NotificationDigest.status == DigestStatus.FAILED)
+        )
+    oldest = _as_utc(oldest)
+    return {
+        "undelivered_events": pending,
+        "queue_lag_seconds": (now - oldest).total_seconds() if oldest else 0.0,
+        "digests_sent_per_minute": digests_sent / 5,
+        "events_sent_per_minute": events_sent / 5,
+        "failed_digests": failed,
+    }
+
+register_metrics("notifications", queue_metrics)
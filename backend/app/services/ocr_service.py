@@ -0,0 +1,218 @@
+# backend/app/services/ocr_service.py
+"""OCR for scanned documents.
+
+Recognition is CPU-bound, so pages are processed in a ProcessPoolExecutor
+and never on the event loop. Multi-page PDFs are split so every page is
+an independent task. Text is cached on disk per content hash, engine and
+page, which makes re-validating identical content free.
+
+OCR runs in the validation workers, not the API, so each worker publishes
+its counters through ``process_metrics`` and ``/metrics`` shows their sum.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type
+import aiofiles
+import aiofiles.os
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.metrics import register_metrics
+from .process_metrics import publish_metrics, published_provider
+
+class OCREngine(ABC):
+    """Recognizes the text of one page of a stored file"""
+
+    name: str = ""
+
+    @abstractmethod
+    def recognize_page(self, file_path: str, page_index: int) -> str:
+        ...
+
+class StubOCREngine(OCREngine):
+    """Deterministic engine for tests and local development"""
+
+    name = "stub"
+
+    def recognize_page(self, file_path: str, page_index: int) -> str:
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        return f"page {page_index + 1} {digest[:32]}"
+
+class TesseractOCREngine(OCREngine):
+    """Tesseract via pytesseract; PDF pages are rendered with pypdfium2"""
+
+    name = "tesseract"
+
+    def recognize_page(self, file_path: str, page_index: int) -> str:
+        import pytesseract
+        if settings.TESSERACT_CMD:
+            pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
+        image = render_page(file_path, page_index)
+        return pytesseract.image_to_string(image, lang=settings.OCR_LANGUAGES)
+
+ENGINES: Dict[str, Type[OCREngine]] = {
+    StubOCREngine.name: StubOCREngine,
+    TesseractOCREngine.name: TesseractOCREngine,
+}
+
+def register_engine(engine: Type[OCREngine]):
+    """Make an engine selectable through OCR_ENGINE"""
+    ENGINES[engine.name] = engine
+
+def _is_pdf(file_path: str) -> bool:
+    with open(file_path, "rb") as f:
+        return f.read(5) == b"%PDF-"
+
+def count_pages(file_path: str) -> int:
+    """Number of pages in a PDF; images count as a single page"""
+    if not _is_pdf(file_path):
+        return 1
+    try:
+        import pypdfium2
+    except ImportError:
+        # Rough fallback without a PDF library: count page objects
+        with open(file_path, "rb") as f:
+            return max(1, len(re.findall(rb"/Type\s*/Page[^s]", f.read())))
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+def render_page(file_path: str, page_index: int, scale: float = 300 / 72):
+    """Render one page as a PIL image (images are opened as-is)"""
+    from PIL import Image
+    if not _is_pdf(file_path):
+        return Image.open(file_path)
+    import pypdfium2
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        return pdf[page_index].render(scale=scale).to_pil()
+    finally:
+        pdf.close()
+
+_process_engines: Dict[str, OCREngine] = {}
+
+def _recognize_in_process(engine_name: str, file_path: str, page_index: int) -> str:
+    # Runs inside the pool; engines are built once per worker process
+    engine = _process_engines.get(engine_name)
+    if engine is None:
+        engine = _process_engines[engine_name] = ENGINES[engine_name]()
+    return engine.recognize_page(file_path, page_index)
+
+@dataclass
+class OCRResult:
+    file_hash: str
+    pages: List[str]
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.pages)
+
+class OCRService:
+    def __init__(self, engine: Optional[str] = None, workers: Optional[int] = None, cache_dir: Optional[str] = None):
+        self.engine = engine or settings.OCR_ENGINE or StubOCREngine.name
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown OCR engine: {self.engine}")
+        self.workers = workers or settings.OCR_WORKERS
+        self.cache_dir = cache_dir or settings.OCR_CACHE_DIR
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self.pages_recognized = 0
+        self.cache_hits = 0
+        self.busy_seconds = 0.0
+        self.queued = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _cache_path(self, file_hash: str, page_index: int) -> str:
+        return os.path.join(self.cache_dir, self.engine, file_hash[:2], file_hash, f"{page_index}.txt")
+
+    async def _read_cache(self, file_hash: str, page_index: int) -> Optional[str]:
+        try:
+            async with aiofiles.open(self._cache_path(file_hash, page_index), "r", encoding="utf-8") as f:
+                return await f.read()
+        except FileNotFoundError:
+            return None
+
+    async def _write_cache(self, file_hash: str, page_index: int, text: str):
+        path = self._cache_path(file_hash, page_index)
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
+            await f.write(text)
+        await aiofiles.os.replace(temp_path, path)
+
+    async def _recognize(self, file_path: str, file_hash: str, page_index: int) -> str:
+        cached = await self._read_cache(file_hash, page_index)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        self.queued += 1
+        try:
+            text = await loop.run_in_executor(
+                self._executor(), _recognize_in_process, self.engine, file_path, page_index
+            )
+        finally:
+            self.queued -= 1
+        self.pages_recognized += 1
+        await self._write_cache(file_hash, page_index, text)
+        return text
+
+    async def extract_text(self, file_path: str, file_hash: str) -> OCRResult:
+        """OCR every page of a stored file in parallel"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        page_count = await loop.run_in_executor(None, count_pages, file_path)
+        pages = await asyncio.gather(*(
+            self._recognize(file_path, file_hash, page_index)
+            for page_index in range(page_count)
+        ))
+        self.busy_seconds += time.perf_counter() - started
+        return OCRResult(file_hash=file_hash, pages=list(pages))
+
+    def metrics(self) -> dict:
+        return {
+            "engine": self.engine,
+            "workers": self.workers,
+            "pages_recognized": self.pages_recognized,
+            "cache_hits": self.cache_hits,
+            "pages_per_second": (
+                self.pages_recognized / self.busy_seconds if self.busy_seconds else 0.0
+            ),
+            "queue_depth": self.queued,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+_service: Optional[OCRService] = None
+
+def get_ocr_service() -> OCRService:
+    """Process-wide OCR service built from settings"""
+    global _service
+    if _service is None:
+        _service = OCRService()
+    return _service
+
+def publish_ocr_metrics(db: Session, process: str):
+    """Share this process's OCR counters with the API, if it has run OCR"""
+    if _service is not None:
+        publish_metrics(db, "ocr", process, _service.metrics())
+
+# OCR runs in the validation workers, which publish their counters
+register_metrics("ocr", published_provider("ocr"))
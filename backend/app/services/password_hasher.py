@@ -0,0 +1,161 @@
+# backend/app/services/password_hasher.py
+"""Password hashing off the event loop and the request threadpool.
+
+bcrypt is deliberately slow, so hashing and verification run in a small
+dedicated process pool. Work is admitted in arrival order up to
+``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE`` pending operations;
+beyond that callers get ``PasswordPoolSaturated`` instead of piling up.
+Login attempts are additionally rate limited per username and per client
+IP with token buckets, so one noisy client cannot take the whole queue.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from ..core.config import settings
+from ..core.metrics import register_metrics
+
+class PasswordPoolSaturated(Exception):
+    """Raised when an operation is refused; ``retry_after`` is in seconds"""
+
+    def __init__(self, retry_after: float, reason: str = "Too many login attempts"):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+def _hash_in_process(password: str) -> str:
+    from ..core.security import pwd_context
+    return pwd_context.hash(password)
+
+def _verify_in_process(password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    from ..core.security import pwd_context
+    # A None hash runs a dummy verify so unknown users cost the same time
+    return pwd_context.verify_and_update(password, hashed_password)
+
+class TokenBuckets:
+    """Per-key token buckets, keeping at most ``max_keys`` recent keys"""
+
+    def __init__(self, capacity: int, per_seconds: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> float:
+        """Consume one token; returns 0 or the seconds until one is free"""
+        if self.capacity <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = [tokens, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+class PasswordHasher:
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        self.capacity = self.workers + (settings.PASSWORD_HASH_QUEUE_SIZE if queue_size is None else queue_size)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.by_username = TokenBuckets(settings.LOGIN_ATTEMPTS_PER_USERNAME, settings.LOGIN_RATE_WINDOW)
+        self.by_ip = TokenBuckets(settings.LOGIN_ATTEMPTS_PER_IP, settings.LOGIN_RATE_WINDOW)
+
+        # Metrics
+        self.pending = 0
+        self.hashes = 0
+        self.verifications = 0
+        self.rehashes = 0
+        self.rejected_saturated = 0
+        self.rejected_rate_limited = 0
+        self.busy_seconds = 0.0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _retry_after(self) -> float:
+        # Roughly how long the backlog takes to drain
+        per_operation = self.busy_seconds / max(self.hashes + self.verifications, 1) or 0.25
+        return max(1.0, per_operation * self.pending / self.workers)
+
+    async def _run(self, function, *args):
+        if self.pending >= self.capacity:
+            self.rejected_saturated += 1
+            raise PasswordPoolSaturated(self._retry_after(), "Authentication service busy")
+
+        # The executor's call queue is FIFO, so admitted work runs in order
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor(), function, *args)
+        finally:
+            self.pending -= 1
+            self.busy_seconds += time.perf_counter() - started
+
+    def admit_login(self, username: str, client_ip: Optional[str]):
+        """Apply per-username and per-IP limits; raises PasswordPoolSaturated"""
+        wait = self.by_username.take(username.lower())
+        if client_ip:
+            wait = max(wait, self.by_ip.take(client_ip))
+        if wait:
+            self.rejected_rate_limited += 1
+            raise PasswordPoolSaturated(wait)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(_hash_in_process, password)
+        self.hashes += 1
+        return hashed
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Return (valid, new_hash); new_hash is set when the cost settings changed"""
+        valid, new_hash = await self._run(_verify_in_process, password, hashed_password)
+        self.verifications += 1
+        if new_hash:
+            self.rehashes += 1
+        return valid, new_hash
+
+    def metrics(self) -> dict:
+        operations = self.hashes + self.verifications
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "capacity": self.capacity,
+            "hashes": self.hashes,
+            "verifications": self.verifications,
+            "rehashes": self.rehashes,
+            "rejected_saturated": self.rejected_saturated,
+            "rejected_rate_limited": self.rejected_rate_limited,
+            "mean_seconds": self.busy_seconds / operations if operations else 0.0,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+_hasher: Optional[PasswordHasher] = None
+
+def get_password_hasher() -> PasswordHasher:
+    """Process-wide password hasher built from settings"""
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher()
+        register_metrics("password_hasher", _hasher.metrics)
+    return _hasher
+
+def shutdown_password_hasher():
+    """Stop the hashing pool, if one was started"""
+    if _hasher is not None:
+        _hasher.shutdown()
@@ -0,0 +1,218 @@
+# backend/app/services/preview_service.py
+"""WebP thumbnails and first-page previews of stored documents.
+
+Rendering is CPU-bound. Like OCR, it runs in a ProcessPoolExecutor. The
+worker writes the WebP straight into the cache, so only the path
+crosses the process boundary. Previews are built on first request, or
+after upload when ``PREVIEW_EAGER`` is set.
+
+The cache lives on disk and is keyed by content hash and preview size,
+so documents sharing a blob share previews. A hit refreshes the file's
+mtime. When the cache grows past ``PREVIEW_CACHE_MAX_BYTES``, files are
+deleted oldest-mtime first until it is back under 90% of the budget.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+from ..core.config import settings
+from ..core.metrics import register_metrics
+
+@dataclass(frozen=True)
+class PreviewSize:
+    name: str
+    max_edge: int
+    quality: int
+
+SIZES: Dict[str, PreviewSize] = {
+    "thumb": PreviewSize("thumb", 256, 70),
+    "page": PreviewSize("page", 1200, 80),
+}
+
+class PreviewUnavailable(Exception):
+    """The stored file could not be rendered"""
+
+def _first_page(file_path: str, max_edge: int):
+    from PIL import Image, ImageOps
+    with open(file_path, "rb") as f:
+        is_pdf = f.read(5) == b"%PDF-"
+    if is_pdf:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            page = pdf[0]
+            width, height = page.get_size()
+            # Render near the target size instead of full resolution
+            return page.render(scale=min(4.0, max_edge / max(width, height, 1))).to_pil()
+        finally:
+            pdf.close()
+    image = Image.open(file_path)
+    # JPEG decodes at 1/2, 1/4 or 1/8 scale for a fraction of the cost
+    image.draft("RGB", (max_edge, max_edge))
+    return ImageOps.exif_transpose(image)
+
+def _render_in_process(file_path: str, cache_path: str, max_edge: int, quality: int) -> int:
+    # Runs inside the pool; returns the size of the written preview
+    image = _first_page(file_path, max_edge)
+    image.thumbnail((max_edge, max_edge))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    image.save(temp_path, "WEBP", quality=quality, method=4)
+    os.replace(temp_path, cache_path)
+    return os.path.getsize(cache_path)
+
+class PreviewService:
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None, workers: Optional[int] = None):
+        self.cache_dir = cache_dir or settings.PREVIEW_CACHE_DIR
+        self.max_bytes = settings.PREVIEW_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.workers = workers or settings.PREVIEW_WORKERS
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._cache_bytes: Optional[int] = None
+        self._evicting = False
+
+        # Metrics
+        self.rendered = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.evicted = 0
+        self.render_seconds = 0.0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def cache_path(self, file_hash: str, size: PreviewSize) -> str:
+        return os.path.join(self.cache_dir, size.name, file_hash[:2], f"{file_hash}.webp")
+
+    async def get(self, file_path: str, file_hash: str, size: PreviewSize) -> str:
+        """Path of the cached preview, rendering it on a miss"""
+        path = self.cache_path(file_hash, size)
+        loop = asyncio.get_running_loop()
+        try:
+            # Touch for LRU; raises when the preview is not cached yet
+            await loop.run_in_executor(None, os.utime, path)
+            self.cache_hits += 1
+            return path
+        except FileNotFoundError:
+            pass
+
+        pending = self._pending.get(path)
+        if pending is None:
+            pending = self._pending[path] = asyncio.ensure_future(self._render(file_path, path, size))
+            pending.add_done_callback(lambda future: self._finished(path, future))
+        return await asyncio.shield(pending)
+
+    def _finished(self, path: str, future: asyncio.Future):
+        self._pending.pop(path, None)
+        if not future.cancelled():
+            # Retrieved here so a render whose waiters all left is not logged as unhandled
+            future.exception()
+
+    async def _render(self, file_path: str, path: str, size: PreviewSize) -> str:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            written = await loop.run_in_executor(
+                self._executor(), _render_in_process, file_path, path, size.max_edge, size.quality
+            )
+        except FileNotFoundError:
+            raise
+        except Exception as exc:
+            self.failures += 1
+            raise PreviewUnavailable(str(exc)) from exc
+        self.render_seconds += time.perf_counter() - started
+        self.rendered += 1
+        await self._account(written)
+        return path
+
+    def schedule(self, file_path: str, file_hash: str):
+        """Render every preview size in the background, e.g. right after upload"""
+        async def render_all():
+            for size in SIZES.values():
+                try:
+                    await self.get(file_path, file_hash, size)
+                except (PreviewUnavailable, FileNotFoundError):
+                    return
+
+        task = asyncio.ensure_future(render_all())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _account(self, written: int):
+        loop = asyncio.get_running_loop()
+        if self._cache_bytes is None:
+            self._cache_bytes = await loop.run_in_executor(None, self._scan_size)
+        else:
+            self._cache_bytes += written
+        if self.max_bytes and self._cache_bytes > self.max_bytes and not self._evicting:
+            self._evicting = True
+            try:
+                evicted, remaining = await loop.run_in_executor(None, self._evict)
+                self.evicted += evicted
+                self._cache_bytes = remaining
+            finally:
+                self._evicting = False
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".webp"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Delete least recently used previews down to 90% of the budget"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        return evicted, total
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "rendered": self.rendered,
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "evicted": self.evicted,
+            "cache_bytes": self._cache_bytes,
+            "cache_max_bytes": self.max_bytes,
+            "render_ms_avg": round(self.render_seconds / self.rendered * 1000, 1) if self.rendered else 0.0,
+            "in_progress": len(self._pending),
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+# The pool starts on the first render, so building the service is cheap
+_service = PreviewService()
+register_metrics("previews", _service.metrics)
+
+def get_preview_service() -> PreviewService:
+    """Process-wide preview service built from settings"""
+    return _service
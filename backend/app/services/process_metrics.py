@@ -0,0 +1,59 @@
+# backend/app/services/process_metrics.py
+"""Metrics of worker processes, shared through the database.
+
+The metrics registry only sees the process that serves ``/metrics``.
+Validation workers run OCR in their own processes, often on other hosts.
+Each one upserts a snapshot of its counters every
+``METRICS_PUBLISH_INTERVAL`` seconds. The API registers a collector that
+sums the snapshots still fresh.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal, dialect_insert
+from ..models.process_metrics import ProcessMetrics
+
+# Rows of processes gone this long are deleted on the next publish
+RETENTION = timedelta(days=1)
+
+def publish_metrics(db: Session, name: str, process: str, values: dict):
+    """Store this process's current ``values`` for ``name``"""
+    now = datetime.now(timezone.utc)
+    statement = dialect_insert(db, ProcessMetrics).values(name=name, process=process, values=values, updated_at=now)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["name", "process"],
+        set_={"values": statement.excluded["values"], "updated_at": now}
+    ))
+    db.execute(delete(ProcessMetrics).where(ProcessMetrics.updated_at < now - RETENTION))
+    db.commit()
+
+def collect_published(db: Session, name: str) -> dict:
+    """Sum the numeric values of every process that published recently"""
+    fresh_after = datetime.now(timezone.utc) - timedelta(seconds=settings.METRICS_PUBLISH_INTERVAL * 3)
+    snapshots = db.execute(
+        select(ProcessMetrics.process, ProcessMetrics.values)
+        .where(ProcessMetrics.name == name, ProcessMetrics.updated_at >= fresh_after)
+        .order_by(ProcessMetrics.process)
+    ).all()
+    totals = {}
+    for _, values in snapshots:
+        for key, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[key] = totals.get(key, 0) + value
+    return {
+        "processes": len(snapshots),
+        **totals,
+        "by_process": {process: values for process, values in snapshots},
+    }
+
+def published_provider(name: str) -> Callable[[], dict]:
+    """A ``register_metrics`` provider reporting what workers published under ``name``"""
+    def provider() -> dict:
+        db = SessionLocal()
+        try:
+            return collect_published(db, name)
+        finally:
+            db.close()
+    return provider
@@ -0,0 +1,289 @@
+# backend/app/services/qr_service.py
+"""Signed QR credentials and their in-memory verification at the gate.
+
+A credential's QR payload is a self-verifying token: a packed
+(version, credential id, worker id, expiry) record followed by a
+truncated HMAC-SHA256, base64url encoded into 39 characters. Checking
+one needs no database access:
+
+- the signature and expiry come from the token itself;
+- revocations are kept in a set refreshed incrementally from
+  ``credentials.revoked_at``;
+- the worker's name, RUN and compliance come from a snapshot refreshed
+  incrementally from the worker and rollup timestamps.
+
+Both refresh every ``CREDENTIAL_REFRESH_INTERVAL`` seconds, so a
+revocation made in another process is honoured within that interval;
+revocations made in this process apply at once.
+"""
+import asyncio
+import base64
+import binascii
+import contextlib
+import hashlib
+import hmac
+import logging
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import select, or_
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..core.metrics import register_metrics
+from ..models.compliance import WorkerComplianceStats
+from ..models.credential import Credential
+from ..models.worker import Worker
+from .compliance_rollup import worker_compliance_status
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION = 1
+_PAYLOAD = struct.Struct(">BIII")  # version, credential id, worker id, valid until (epoch)
+_SIGNATURE_SIZE = 16
+
+# Rows committed slightly out of timestamp order are caught by re-reading
+# this far behind the watermark; applying a row twice is harmless
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+class InvalidCredential(Exception):
+    """The token is malformed or its signature does not match"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+def _signing_key() -> bytes:
+    if settings.CREDENTIAL_SIGNING_KEY:
+        return settings.CREDENTIAL_SIGNING_KEY.encode()
+    return hmac.new(settings.SECRET_KEY.encode(), b"credential-signing", hashlib.sha256).digest()
+
+# Keyed once; copying the prepared state skips the key setup per scan
+_MAC = hmac.new(_signing_key(), digestmod=hashlib.sha256)
+
+def _sign(payload: bytes) -> bytes:
+    mac = _MAC.copy()
+    mac.update(payload)
+    return mac.digest()[:_SIGNATURE_SIZE]
+
+def sign_credential(credential_id: int, worker_id: int, valid_until: datetime) -> str:
+    """Build the QR token for a credential; a naive expiry is taken as UTC"""
+    payload = _PAYLOAD.pack(TOKEN_VERSION, credential_id, worker_id, int(as_utc(valid_until).timestamp()))
+    return base64.urlsafe_b64encode(payload + _sign(payload)).rstrip(b"=").decode()
+
+@dataclass(frozen=True)
+class TokenClaims:
+    credential_id: int
+    worker_id: int
+    valid_until: int  # epoch seconds
+
+def decode_token(token: str) -> TokenClaims:
+    """Check the signature and unpack the claims; expiry is left to the caller"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        raise InvalidCredential("malformed")
+    if len(raw) != _PAYLOAD.size + _SIGNATURE_SIZE:
+        raise InvalidCredential("malformed")
+    payload, signature = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidCredential("invalid_signature")
+    version, credential_id, worker_id, valid_until = _PAYLOAD.unpack(payload)
+    if version != TOKEN_VERSION:
+        raise InvalidCredential("unsupported_version")
+    return TokenClaims(credential_id, worker_id, valid_until)
+
+@dataclass(frozen=True)
+class WorkerSnapshot:
+    run: str
+    name: str
+    company_id: int
+    is_active: bool
+    compliance_status: str
+
+def worker_snapshot(worker, stats: Optional[WorkerComplianceStats]) -> WorkerSnapshot:
+    """Snapshot of a Worker, or of a row selecting its columns"""
+    return WorkerSnapshot(
+        run=worker.run,
+        name=f"{worker.first_name} {worker.last_name}",
+        company_id=worker.company_id,
+        is_active=bool(worker.is_active),
+        compliance_status=worker_compliance_status(stats)
+    )
+
+@dataclass
+class Verification:
+    valid: bool
+    reason: Optional[str] = None
+    credential_id: Optional[int] = None
+    worker_id: Optional[int] = None
+    valid_until: Optional[datetime] = None
+    worker: Optional[WorkerSnapshot] = None
+
+class CredentialVerifier:
+    samples = 4096
+
+    def __init__(self):
+        self.revoked: Dict[int, int] = {}  # credential id -> valid until (epoch)
+        self.workers: Dict[int, WorkerSnapshot] = {}
+        self._revoked_since: Optional[datetime] = None
+        self._workers_since: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshed_at: Optional[float] = None
+
+        # Metrics
+        self.durations = deque(maxlen=self.samples)
+        self.outcomes: Dict[str, int] = {}
+        self.refresh_failures = 0
+
+    def revoke(self, credential_id: int, valid_until: datetime):
+        """Apply a revocation made by this process without waiting for a refresh"""
+        self.revoked[credential_id] = int(as_utc(valid_until).timestamp())
+
+    def add_worker(self, worker_id: int, snapshot: WorkerSnapshot):
+        """Apply a worker credentialed by this process without waiting for a refresh"""
+        self.workers[worker_id] = snapshot
+
+    def verify(self, token: str) -> Verification:
+        started = time.perf_counter()
+        result = self._verify(token)
+        self.durations.append(time.perf_counter() - started)
+        outcome = result.reason or "valid"
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        return result
+
+    def _verify(self, token: str) -> Verification:
+        try:
+            claims = decode_token(token)
+        except InvalidCredential as exc:
+            return Verification(valid=False, reason=exc.reason)
+
+        result = Verification(
+            valid=False,
+            credential_id=claims.credential_id,
+            worker_id=claims.worker_id,
+            valid_until=datetime.fromtimestamp(claims.valid_until, timezone.utc),
+            worker=self.workers.get(claims.worker_id)
+        )
+        if claims.valid_until <= time.time():
+            result.reason = "expired"
+        elif claims.credential_id in self.revoked:
+            result.reason = "revoked"
+        elif result.worker is None:
+            result.reason = "unknown_worker"
+        elif not result.worker.is_active:
+            result.reason = "worker_inactive"
+        elif result.worker.compliance_status != "compliant":
+            result.reason = result.worker.compliance_status
+        else:
+            result.valid = True
+        return result
+
+    async def refresh(self):
+        """Pull revocations and worker changes since the last refresh"""
+        async with AsyncSessionLocal() as db:
+            await self._refresh_revocations(db)
+            await self._refresh_workers(db)
+        self.refreshed_at = time.time()
+
+    async def _refresh_revocations(self, db):
+        query = select(Credential.id, Credential.valid_until, Credential.revoked_at).where(
+            Credential.revoked_at.isnot(None)
+        )
+        if self._revoked_since is not None:
+            query = query.where(Credential.revoked_at >= self._revoked_since - REFRESH_OVERLAP)
+        else:
+            # Expired tokens are refused anyway
+            query = query.where(Credential.valid_until > datetime.now(timezone.utc))
+
+        latest = self._revoked_since
+        for credential_id, valid_until, revoked_at in await db.execute(query):
+            self.revoked[credential_id] = int(as_utc(valid_until).timestamp())
+            latest = max(latest, revoked_at) if latest else revoked_at
+        self._revoked_since = latest
+
+        now = time.time()
+        self.revoked = {key: until for key, until in self.revoked.items() if until > now}
+
+    async def _refresh_workers(self, db):
+        since = self._workers_since
+        query = (
+            select(
+                Worker.id, Worker.run, Worker.first_name, Worker.last_name,
+                Worker.company_id, Worker.is_active, Worker.created_at, Worker.updated_at,
+                WorkerComplianceStats
+            )
+            .outerjoin(WorkerComplianceStats, WorkerComplianceStats.worker_id == Worker.id)
+        )
+        if since is not None:
+            # Two indexed lookups instead of a scan over an OR across the join
+            since = since - REFRESH_OVERLAP
+            changed = set((await db.scalars(select(Worker.id).where(or_(
+                Worker.created_at >= since, Worker.updated_at >= since
+            )))).all())
+            changed.update((await db.scalars(
+                select(WorkerComplianceStats.worker_id).where(WorkerComplianceStats.updated_at >= since)
+            )).all())
+            if not changed:
+                return
+            query = query.where(Worker.id.in_(changed))
+
+        latest = self._workers_since
+        for row in await db.execute(query):
+            stats = row.WorkerComplianceStats
+            self.workers[row.id] = worker_snapshot(row, stats)
+            for stamp in (row.created_at, row.updated_at, stats.updated_at if stats else None):
+                if stamp is not None and (latest is None or stamp > latest):
+                    latest = stamp
+        self._workers_since = latest
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(settings.CREDENTIAL_REFRESH_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception:
+                self.refresh_failures += 1
+                logger.exception("Credential verifier refresh failed")
+
+    async def start(self):
+        """Load the first snapshot, then keep refreshing in the background"""
+        try:
+            await self.refresh()
+        except Exception:
+            self.refresh_failures += 1
+            logger.exception("Initial credential snapshot failed; retrying in the background")
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def metrics(self) -> dict:
+        durations = sorted(self.durations)
+
+        def percentile(fraction: float) -> float:
+            return round(durations[min(len(durations) - 1, int(len(durations) * fraction))] * 1e6, 1) if durations else 0.0
+
+        return {
+            "workers": len(self.workers),
+            "revoked": len(self.revoked),
+            "snapshot_age_seconds": time.time() - self.refreshed_at if self.refreshed_at else None,
+            "refresh_failures": self.refresh_failures,
+            "outcomes": dict(self.outcomes),
+            "verify_p50_us": percentile(0.5),
+            "verify_p99_us": percentile(0.99),
+        }
+
+def as_utc(value: datetime) -> datetime:
+    """Read naive timestamps as UTC, the way SQLite hands them back"""
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+credential_verifier = CredentialVerifier()
+register_metrics("credential_verifier", credential_verifier.metrics)
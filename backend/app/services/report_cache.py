@@ -0,0 +1,223 @@
+# backend/app/services/report_cache.py
+"""Result cache for per-company reports.
+
+A report is stored under (report name, company id, data version) and a
+lookup only matches the company's current version. Every document,
+worker or observation write bumps the version in the database (see
+``compliance_rollup.bump_data_versions``). That invalidates the cached
+report in all processes at once, with no explicit invalidation calls.
+
+Backends are pluggable through ``REPORT_CACHE_BACKEND``:
+
+- ``memory``: a per-process LRU holding one entry per company and report;
+- ``shared``: JSON values in a key-value store shared by all processes.
+  This is Redis when ``REPORT_CACHE_URL`` is set, otherwise an
+  in-process stand-in with the same interface.
+
+Concurrent misses for the same key in one process share one recompute.
+"""
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import settings
+from ..core.metrics import register_metrics
+from ..models.compliance import CompanyComplianceStats
+
+class ReportCacheBackend(ABC):
+    """Stores one JSON-compatible report per (report, company) and version"""
+
+    name: str = ""
+
+    @abstractmethod
+    async def get(self, report: str, company_id: int, version: Hashable) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, report: str, company_id: int, version: Hashable, value: Any):
+        ...
+
+    def size(self) -> Optional[int]:
+        return None
+
+class MemoryReportCache(ReportCacheBackend):
+    """Per-process LRU; a newer version replaces the company's entry"""
+
+    name = "memory"
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[Hashable, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    async def get(self, report, company_id, version):
+        key = (report, company_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def set(self, report, company_id, version, value):
+        if self.max_size <= 0:
+            return
+        key = (report, company_id)
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def size(self):
+        return len(self._entries)
+
+class LocalSharedStore:
+    """In-process stand-in for the shared store (async get/set with expiry)"""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            self._values.pop(key, None)
+            return None
+        return entry[0]
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        now = time.monotonic()
+        if len(self._values) >= settings.REPORT_CACHE_SIZE:
+            self._values = {k: entry for k, entry in self._values.items() if entry[1] > now}
+        self._values[key] = (value, now + ex if ex else float("inf"))
+
+class SharedReportCache(ReportCacheBackend):
+    """JSON values in a shared store; stale versions are left to expire"""
+
+    name = "shared"
+
+    def __init__(self, store=None, ttl: Optional[float] = None):
+        self.store = store if store is not None else _shared_store()
+        self.ttl = int(ttl if ttl is not None else settings.REPORT_CACHE_TTL)
+
+    def _key(self, report, company_id, version) -> str:
+        return f"sso:report:{report}:{company_id}:{version}"
+
+    async def get(self, report, company_id, version):
+        raw = await self.store.get(self._key(report, company_id, version))
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, report, company_id, version, value):
+        await self.store.set(self._key(report, company_id, version), json.dumps(value).encode(), ex=self.ttl)
+
+def _shared_store():
+    if not settings.REPORT_CACHE_URL:
+        return LocalSharedStore()
+    import redis.asyncio
+    return redis.asyncio.from_url(settings.REPORT_CACHE_URL)
+
+BACKENDS: Dict[str, Callable[[], ReportCacheBackend]] = {
+    MemoryReportCache.name: lambda: MemoryReportCache(settings.REPORT_CACHE_SIZE),
+    SharedReportCache.name: SharedReportCache,
+}
+
+def register_backend(name: str, factory: Callable[[], ReportCacheBackend]):
+    """Make a backend selectable through REPORT_CACHE_BACKEND"""
+    BACKENDS[name] = factory
+
+async def data_version(db: AsyncSession, company_id: int) -> Optional[int]:
+    """The company's current data version; None before its first write"""
+    return await db.scalar(
+        select(CompanyComplianceStats.data_version).where(CompanyComplianceStats.company_id == company_id)
+    )
+
+class ReportCache:
+    samples = 1024
+
+    def __init__(self, backend: Optional[str] = None):
+        name = settings.REPORT_CACHE_BACKEND if backend is None else backend
+        if name and name not in BACKENDS:
+            raise ValueError(f"Unknown report cache backend: {name}")
+        self.backend: Optional[ReportCacheBackend] = BACKENDS[name]() if name else None
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.shared_waits = 0
+        self.recomputes = 0
+        self.recompute_durations = deque(maxlen=self.samples)
+
+    async def get_or_compute(
+        self, report: str, company_id: int, version: Hashable,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Cached report for this version, computing and storing it on a miss"""
+        if self.backend is None:
+            return await self._compute(compute)
+
+        value = await self.backend.get(report, company_id, version)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        key = (report, company_id, version)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared_waits += 1
+            return await asyncio.shield(pending)
+
+        pending = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await self._compute(compute)
+            await self.backend.set(report, company_id, version, value)
+            pending.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as exc:
+            pending.set_exception(exc)
+            # Waiters re-raise it; retrieve it here so an unwaited future is not logged
+            pending.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _compute(self, compute) -> Any:
+        started = time.perf_counter()
+        value = jsonable_encoder(await compute())
+        self.recomputes += 1
+        self.recompute_durations.append(time.perf_counter() - started)
+        return value
+
+    def metrics(self) -> dict:
+        durations = sorted(self.recompute_durations)
+
+        def percentile(fraction: float) -> float:
+            return round(durations[min(len(durations) - 1, int(len(durations) * fraction))] * 1000, 3) if durations else 0.0
+
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "size": self.backend.size() if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "shared_waits": self.shared_waits,
+            "recomputes": self.recomputes,
+            "recompute_p50_ms": percentile(0.5),
+            "recompute_p99_ms": percentile(0.99),
+        }
+
+report_cache = ReportCache()
+register_metrics("report_cache", report_cache.metrics)
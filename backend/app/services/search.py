@@ -0,0 +1,169 @@
+# backend/app/services/search.py
+"""Company and worker search.
+
+RUT/RUN-looking terms hit the normalized ``*_number``/``*_dv`` columns
+(exact or prefix, both served by a B-tree). Anything else is a name
+search: pg_trgm on Postgres, FTS5 on SQLite, plain ILIKE elsewhere.
+"""
+import re
+from typing import Optional
+from sqlalchemy import select, or_, and_, case, false, func, literal, literal_column, table, column
+from sqlalchemy.orm import Session
+from ..models.company import Company
+from ..models.worker import Worker
+
+RUT_TERM = re.compile(r"^\d[\d.\s]*(-\s*[\dkK]?)?$|^\d[\d.\s]*[kK]$")
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+def is_rut_term(term: str) -> bool:
+    return bool(RUT_TERM.match(term.strip()))
+
+def _prefix(db: Session, col, prefix: str):
+    if _dialect(db) == "sqlite":
+        # GLOB is case-sensitive, so SQLite can use the B-tree for it
+        return col.op("GLOB")(prefix + "*")
+    return col.like(prefix + "%")
+
+def _rut_condition(db: Session, number_col, dv_col, term: str):
+    """Exact match when a check digit is given, prefix match otherwise"""
+    term = re.sub(r"[.\s]", "", term).upper()
+    if "-" in term:
+        number, dv = term.split("-", 1)
+        number = number.lstrip("0") or "0"
+        if dv:
+            return and_(number_col == number, dv_col == dv)
+        return number_col == number
+    digits = term.lstrip("0") or "0"
+    conditions = [_prefix(db, number_col, digits.rstrip("K"))]
+    if len(digits) > 1:
+        # Full RUT typed without the dash
+        conditions.append(and_(number_col == digits[:-1], dv_col == digits[-1]))
+    return or_(*conditions)
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _fts_query(term: str) -> str:
+    """Prefix-match every token: ``juan per`` -> ``"juan"* "per"*``
+
+    Empty when no token is left (``""``); FTS5 rejects an empty MATCH.
+    """
+    tokens = [token.replace('"', "") for token in term.split()]
+    return " ".join(f'"{token}"*' for token in tokens if token)
+
+def _fts_table(name: str):
+    return table(name, column("rowid"), column("rank"))
+
+def worker_name_expression():
+    # Must match the expression of the ix_workers_name_trgm index
+    return Worker.first_name.concat(literal_column("' '")).concat(Worker.last_name)
+
+def company_search_condition(db: Session, term: str):
+    """Filter for Company queries matching a RUT or a name"""
+    term = term.strip()
+    if is_rut_term(term):
+        return _rut_condition(db, Company.rut_number, Company.rut_dv, term)
+    if _dialect(db) == "sqlite":
+        query = _fts_query(term)
+        if not query:
+            return false()
+        fts = _fts_table("companies_fts")
+        return Company.id.in_(
+            select(fts.c.rowid).where(literal_column("companies_fts").op("MATCH")(query))
+        )
+    pattern = _like_pattern(term)
+    return or_(
+        Company.name.ilike(pattern, escape="\\"),
+        Company.business_name.ilike(pattern, escape="\\")
+    )
+
+def worker_search_condition(db: Session, term: str):
+    """Filter for Worker queries matching a RUN or a name"""
+    term = term.strip()
+    if is_rut_term(term):
+        return _rut_condition(db, Worker.run_number, Worker.run_dv, term)
+    if _dialect(db) == "sqlite":
+        query = _fts_query(term)
+        if not query:
+            return false()
+        fts = _fts_table("workers_fts")
+        return Worker.id.in_(
+            select(fts.c.rowid).where(literal_column("workers_fts").op("MATCH")(query))
+        )
+    return worker_name_expression().ilike(_like_pattern(term), escape="\\")
+
+def _ranked(db: Session, model, condition, name_score, fts_name: str, rut_term: bool, number_col, term: str):
+    """Build a ranked select for one model"""
+    if rut_term:
+        digits = re.sub(r"[^\d]", "", term.split("-")[0]).lstrip("0")
+        score = case((number_col == digits, 1.0), else_=0.9)
+        return (
+            select(model, score.label("score"))
+            .where(condition)
+            .order_by(score.desc(), func.length(number_col), number_col)
+        )
+    if _dialect(db) == "sqlite":
+        fts = _fts_table(fts_name)
+        return (
+            select(model, (-fts.c.rank).label("score"))
+            .join(fts, fts.c.rowid == model.id)
+            .where(literal_column(fts_name).op("MATCH")(_fts_query(term)))
+            .order_by(fts.c.rank)
+        )
+    if _dialect(db) == "postgresql":
+        return select(model, name_score.label("score")).where(condition).order_by(name_score.desc())
+    return select(model, literal(1.0).label("score")).where(condition).order_by(model.id)
+
+def search(db: Session, term: str, company_id: Optional[int] = None, limit: int = 10) -> dict:
+    """Ranked companies and workers for a typeahead term"""
+    term = term.strip()
+    rut_term = is_rut_term(term)
+    if not rut_term and _dialect(db) == "sqlite" and not _fts_query(term):
+        return {"companies": [], "workers": []}
+
+    company_query = _ranked(
+        db, Company, company_search_condition(db, term),
+        func.greatest(
+            func.similarity(Company.name, term),
+            func.similarity(func.coalesce(Company.business_name, ""), term)
+        ),
+        "companies_fts", rut_term, Company.rut_number, term
+    ).where(Company.is_active == True).limit(limit)
+
+    worker_query = _ranked(
+        db, Worker, worker_search_condition(db, term),
+        func.similarity(worker_name_expression(), term),
+        "workers_fts", rut_term, Worker.run_number, term
+    ).where(Worker.is_active == True).limit(limit)
+
+    if company_id is not None:
+        company_query = company_query.where(Company.id == company_id)
+        worker_query = worker_query.where(Worker.company_id == company_id)
+
+    return {
+        "companies": [
+            {
+                "id": company.id,
+                "rut": company.rut,
+                "name": company.name,
+                "business_name": company.business_name,
+                "score": float(score or 0),
+            }
+            for company, score in db.execute(company_query)
+        ],
+        "workers": [
+            {
+                "id": worker.id,
+                "run": worker.run,
+                "first_name": worker.first_name,
+                "last_name": worker.last_name,
+                "position": worker.position,
+                "company_id": worker.company_id,
+                "score": float(score or 0),
+            }
+            for worker, score in db.execute(worker_query)
+        ],
+    }
@@ -0,0 +1,76 @@
+# backend/app/services/storage.py
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+from ..core.config import settings
+
+# Slack allowed on top of MAX_FILE_SIZE for multipart boundaries and form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+class FileTooLargeError(Exception):
+    """Raised when a stream exceeds the configured maximum size"""
+
+@dataclass
+class StoredFile:
+    path: str
+    sha256: str
+    size: int
+
+async def iter_upload(upload: UploadFile, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Yield an uploaded file in fixed-size chunks"""
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+async def write_temp(chunks: AsyncIterator[bytes], max_size: Optional[int] = None) -> StoredFile:
+    """Stream chunks into a temp file under UPLOAD_FOLDER, hashing as they arrive.
+
+    Only one chunk is held in memory at a time. The temp file lives on the
+    same filesystem as the final location so it can be renamed atomically.
+    """
+    max_size = max_size or settings.MAX_FILE_SIZE
+    temp_dir = os.path.join(settings.UPLOAD_FOLDER, "tmp")
+    await aiofiles.os.makedirs(temp_dir, exist_ok=True)
+    temp_path = os.path.join(temp_dir, f"{uuid.uuid4().hex}.part")
+
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise FileTooLargeError(f"File exceeds {max_size} bytes")
+                sha256.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        await discard(temp_path)
+        raise
+
+    return StoredFile(path=temp_path, sha256=sha256.hexdigest(), size=size)
+
+async def move_into_place(temp: StoredFile, destination: str) -> StoredFile:
+    """Atomically rename a temp file to its final path"""
+    await aiofiles.os.makedirs(os.path.dirname(destination), exist_ok=True)
+    await aiofiles.os.replace(temp.path, destination)
+    return StoredFile(path=destination, sha256=temp.sha256, size=temp.size)
+
+async def discard(path: str):
+    """Remove a file if it exists"""
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
+async def save_upload(upload: UploadFile, destination: str, max_size: Optional[int] = None) -> StoredFile:
+    """Stream an upload to ``destination`` with bounded memory"""
+    temp = await write_temp(iter_upload(upload), max_size)
+    return await move_into_place(temp, destination)
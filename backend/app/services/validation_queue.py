@@ -0,0 +1,248 @@
+# backend/app/services/validation_queue.py
+"""Database-backed queue for out-of-band document validation.
+
+Uploads insert a ``ValidationJob`` in the same transaction as the
+document. A pool of worker processes claims jobs with a short lease,
+validates the stored file and records the outcome on the document, with
+one ``Observation`` per failed check.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.document import Document, DocumentStatus
+from ..models.observation import Observation, ObservationType
+from ..models.validation_job import ValidationJob, ValidationJobStatus
+from .blob_store import get_cached_validation, cache_validation
+from ..models.notification import NotificationKind
+from .compliance_rollup import record_document_status_change
+from .notification_service import document_event, enqueue_events
+from .document_validator import DocumentValidator, ValidationResult
+from .ocr_service import publish_ocr_metrics
+
+logger = logging.getLogger(__name__)
+
+def enqueue_validation(db: Session, document: Document) -> ValidationJob:
+    """Queue validation for a document; call before the surrounding commit"""
+    job = ValidationJob(document_id=document.id, status=ValidationJobStatus.QUEUED)
+    db.add(job)
+    db.flush()
+    return job
+
+def get_latest_job(db: Session, document_id: int) -> Optional[ValidationJob]:
+    return db.scalars(
+        select(ValidationJob)
+        .where(ValidationJob.document_id == document_id)
+        .order_by(ValidationJob.id.desc())
+        .limit(1)
+    ).first()
+
+def claim_job(db: Session, worker_name: str) -> Optional[ValidationJob]:
+    """Lease the oldest runnable job, including ones whose lease expired.
+
+    The guarded UPDATE makes claiming safe across processes on any
+    backend; on Postgres SKIP LOCKED also keeps workers from queueing on
+    the same row.
+    """
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=settings.VALIDATION_JOB_TIMEOUT)
+    fail_exhausted_jobs(db, stale)
+    runnable = or_(
+        and_(ValidationJob.status == ValidationJobStatus.QUEUED, ValidationJob.run_after <= now),
+        and_(
+            ValidationJob.status == ValidationJobStatus.RUNNING,
+            ValidationJob.locked_at < stale,
+            ValidationJob.attempts < settings.VALIDATION_MAX_ATTEMPTS
+        ),
+    )
+    job = db.scalars(
+        select(ValidationJob)
+        .where(runnable)
+        .order_by(ValidationJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if job is None:
+        db.rollback()
+        return None
+
+    claimed = db.execute(
+        update(ValidationJob)
+        .where(ValidationJob.id == job.id, runnable)
+        .values(
+            status=ValidationJobStatus.RUNNING,
+            locked_by=worker_name,
+            locked_at=now,
+            attempts=ValidationJob.attempts + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if claimed.rowcount != 1:
+        return None
+    db.refresh(job)
+    return job
+
+def fail_exhausted_jobs(db: Session, stale: datetime) -> int:
+    """Fail expired leases that used their last attempt.
+
+    A job whose file crashes or OOM-kills its worker never reaches the
+    failure path in ``process_job``. Without this it would be reclaimed,
+    and crash a worker, forever.
+    """
+    exhausted = and_(
+        ValidationJob.status == ValidationJobStatus.RUNNING,
+        ValidationJob.locked_at < stale,
+        ValidationJob.attempts >= settings.VALIDATION_MAX_ATTEMPTS
+    )
+    jobs = db.scalars(
+        select(ValidationJob).where(exhausted).with_for_update(skip_locked=True)
+    ).all()
+    failed = 0
+    for job in jobs:
+        error = f"Worker {job.locked_by} stopped while validating"
+        claimed = db.execute(
+            update(ValidationJob)
+            .where(ValidationJob.id == job.id, exhausted)
+            .values(
+                status=ValidationJobStatus.FAILED,
+                finished_at=datetime.now(timezone.utc),
+                locked_by=None,
+                last_error=error
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount == 1:
+            record_validation_failure(db, job.document_id, job.attempts, error)
+            failed += 1
+    db.commit()
+    return failed
+
+def record_validation_failure(db: Session, document_id: int, attempts: int, error: str):
+    """Flag a document whose validation gave up for manual review"""
+    document = db.get(Document, document_id)
+    if document is None or not document.is_active:
+        return
+    db.add(Observation(
+        type=ObservationType.OTHER,
+        title="Automatic validation failed",
+        description=f"Validation failed after {attempts} attempts ({error}). Review the document manually.",
+        deadline=datetime.now(timezone.utc) + timedelta(days=settings.OBSERVATION_DEADLINE_DAYS),
+        document_id=document.id
+    ))
+
+def apply_validation_result(db: Session, document: Document, result: ValidationResult):
+    """Move a pending document to approved/observed and record failed checks"""
+    if document.status != DocumentStatus.PENDING:
+        # A reviewer already acted on the document; keep their decision
+        return
+
+    old_status = document.status
+    document.status = DocumentStatus.APPROVED if result.is_valid else DocumentStatus.OBSERVED
+    record_document_status_change(db, document, old_status)
+
+    deadline = datetime.now(timezone.utc) + timedelta(days=settings.OBSERVATION_DEADLINE_DAYS)
+    for issue in result.errors:
+        db.add(Observation(
+            type=ObservationType(issue.type),
+            title=issue.title,
+            description=issue.description,
+            deadline=deadline,
+            document_id=document.id
+        ))
+
+    if result.is_valid:
+        events = [document_event(NotificationKind.DOCUMENT_APPROVED, document, f"{document.name} approved")]
+    else:
+        events = [
+            document_event(NotificationKind.OBSERVATION_CREATED, document, f"{document.name}: {issue.title}", issue.description)
+            for issue in result.errors
+        ]
+    enqueue_events(db, events)
+
+async def process_job(db: Session, job: ValidationJob, validator: Optional[DocumentValidator] = None):
+    """Validate the job's document and finish the job"""
+    validator = validator or DocumentValidator()
+    try:
+        document = db.get(Document, job.document_id)
+        if document is not None and document.is_active:
+            result = None
+            if document.file_hash:
+                result = get_cached_validation(db, document.file_hash, document.type)
+            if result is None:
+                result = await validator.validate(
+                    document.file_path, document.type, document.file_hash
+                )
+                if document.file_hash:
+                    cache_validation(db, document.file_hash, document.type, result)
+            apply_validation_result(db, document, result)
+
+        job.status = ValidationJobStatus.SUCCEEDED
+        job.finished_at = datetime.now(timezone.utc)
+        job.last_error = None
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.exception("Validation job %s failed", job.id)
+        job = db.get(ValidationJob, job.id)
+        job.last_error = str(exc)
+        job.locked_by = None
+        if job.attempts >= settings.VALIDATION_MAX_ATTEMPTS:
+            job.status = ValidationJobStatus.FAILED
+            job.finished_at = datetime.now(timezone.utc)
+            record_validation_failure(db, job.document_id, job.attempts, str(exc))
+        else:
+            job.status = ValidationJobStatus.QUEUED
+            job.run_after = datetime.now(timezone.utc) + timedelta(seconds=2 ** job.attempts)
+        db.commit()
+
+async def run_worker(worker_name: str, stop: Optional[asyncio.Event] = None):
+    """Drain the queue until ``stop`` is set, sleeping when it is empty"""
+    validator = DocumentValidator()
+    published_at = 0.0
+    while stop is None or not stop.is_set():
+        db = SessionLocal()
+        try:
+            if time.monotonic() - published_at >= settings.METRICS_PUBLISH_INTERVAL:
+                publish_ocr_metrics(db, worker_name)
+                published_at = time.monotonic()
+            job = claim_job(db, worker_name)
+            if job is not None:
+                await process_job(db, job, validator)
+                continue
+        finally:
+            db.close()
+        await asyncio.sleep(settings.VALIDATION_POLL_INTERVAL)
+
+def _worker_process(index: int):
+    worker_name = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    logger.info("Validation worker %s started", worker_name)
+    try:
+        asyncio.run(run_worker(worker_name))
+    except KeyboardInterrupt:
+        pass
+
+def run_worker_pool(workers: Optional[int] = None):
+    """Start ``workers`` validation processes and wait for them"""
+    workers = workers or settings.VALIDATION_WORKERS
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_process, args=(index,))
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
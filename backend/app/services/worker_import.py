@@ -0,0 +1,215 @@
+# backend/app/services/worker_import.py
+"""Bulk worker import from CSV or XLSX rosters.
+
+Rows are read lazily, validated and normalized in chunks on the
+threadpool, and each chunk is written with a single multi-row
+``INSERT ... ON CONFLICT (run) DO UPDATE``. Workers that already belong to another company are rejected,
+never moved.
+"""
+import codecs
+import csv
+from datetime import date, datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from ..core.config import settings
+from ..core.database import dialect_insert
+from ..models.worker import Worker
+from ..utils.validators import normalize_run, split_run
+from .compliance_rollup import record_workers_added
+
+COLUMNS = ("run", "first_name", "last_name", "email", "phone", "position", "entry_date")
+REQUIRED_COLUMNS = ("run", "first_name", "last_name", "position")
+UPDATABLE_COLUMNS = ("first_name", "last_name", "email", "phone", "position", "entry_date")
+
+class ImportFormatError(ValueError):
+    """Raised when the roster file cannot be read"""
+
+def _header(values) -> List[str]:
+    return [str(value or "").strip().lower() for value in values]
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[dict]:
+    # Decoding is lazy, so bad bytes surface mid-import rather than up front
+    reader = csv.reader(codecs.iterdecode(file, "utf-8-sig"))
+    try:
+        try:
+            header = _header(next(reader))
+        except StopIteration:
+            return
+        for values in reader:
+            yield dict(zip(header, values))
+    except UnicodeDecodeError:
+        raise ImportFormatError(f"CSV is not UTF-8 (after line {reader.line_num})")
+    except csv.Error as exc:
+        raise ImportFormatError(f"Invalid CSV at line {reader.line_num}: {exc}")
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[dict]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError("XLSX import requires openpyxl")
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFormatError(f"Invalid XLSX file: {exc}")
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        try:
+            header = _header(next(rows))
+        except StopIteration:
+            return
+        for values in rows:
+            if values and any(value is not None for value in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+def iter_rows(file: BinaryIO, filename: str) -> Iterator[dict]:
+    """Yield roster rows as dicts keyed by lower-case header"""
+    if filename.lower().endswith(".xlsx"):
+        return iter_xlsx_rows(file)
+    if filename.lower().endswith(".csv"):
+        return iter_csv_rows(file)
+    raise ImportFormatError("Roster must be a .csv or .xlsx file")
+
+def _parse_date(value) -> Optional[date]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
+
+def clean_row(raw: dict, company_id: int) -> dict:
+    """Validate and normalize one roster row; raises ValueError with the reason"""
+    row = {}
+    for column in COLUMNS:
+        value = raw.get(column)
+        if value is not None and column != "entry_date":
+            value = str(value).strip()
+        row[column] = value if value != "" else None
+
+    missing = [column for column in REQUIRED_COLUMNS if not row.get(column)]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+
+    run = normalize_run(row["run"])
+    if run is None:
+        raise ValueError("Invalid RUN")
+    row["run"] = run
+    row["run_number"], row["run_dv"] = split_run(run)
+
+    try:
+        row["entry_date"] = _parse_date(row["entry_date"])
+    except ValueError:
+        raise ValueError("Invalid entry_date")
+
+    row["company_id"] = company_id
+    row["is_active"] = True
+    return row
+
+class WorkerImport:
+    """Streams roster rows into chunked upserts for one company"""
+
+    def __init__(self, db: AsyncSession, company_id: int, chunk_size: Optional[int] = None):
+        self.db = db
+        self.company_id = company_id
+        self.chunk_size = chunk_size or settings.WORKER_IMPORT_CHUNK_SIZE
+        self.inserted = 0
+        self.updated = 0
+        self.rejected: List[dict] = []
+
+    def _reject(self, row_number: int, run, reason: str):
+        self.rejected.append({"row": row_number, "run": str(run) if run else None, "reason": reason})
+
+    async def _flush(self, chunk: Dict[str, tuple]):
+        if not chunk:
+            return
+        # Match on the digits: workers stored before RUNs were normalized
+        # keep their original spelling (12.345.678-5) in ``run``
+        runs = {(row["run_number"], row["run_dv"]): run for run, (_, row) in chunk.items()}
+        matches = (await self.db.execute(
+            select(Worker.id, Worker.run, Worker.run_number, Worker.run_dv, Worker.company_id)
+            .where(Worker.run_number.in_({number for number, _ in runs}))
+        )).all()
+        existing = {}
+        stored = {match.run for match in matches}
+        for worker_id, stored_run, number, dv, owner in matches:
+            run = runs.get((number, dv))
+            if run is None:
+                continue
+            existing[run] = owner
+            if owner == self.company_id and run not in stored:
+                # Respell it so ON CONFLICT (run) below updates this row instead of adding a twin
+                await self.db.execute(update(Worker).where(Worker.id == worker_id).values(run=run))
+                stored.add(run)
+
+        rows = []
+        for run, (row_number, row) in chunk.items():
+            owner = existing.get(run)
+            if owner is not None and owner != self.company_id:
+                self._reject(row_number, run, "RUN belongs to another company")
+                continue
+            rows.append(row)
+        if not rows:
+            return
+
+        statement = dialect_insert(self.db, Worker)
+        statement = statement.values(rows).on_conflict_do_update(
+            index_elements=["run"],
+            set_=dict(
+                {column: statement.excluded[column] for column in UPDATABLE_COLUMNS},
+                updated_at=func.now()
+            ),
+            where=Worker.company_id == self.company_id
+        )
+        await self.db.execute(statement)
+
+        inserted = sum(1 for row in rows if row["run"] not in existing)
+        await self.db.run_sync(record_workers_added, self.company_id, inserted)
+        await self.db.commit()
+
+        self.inserted += inserted
+        self.updated += len(rows) - inserted
+
+    def _read_chunk(self, rows: Iterator[tuple]) -> Dict[str, tuple]:
+        """Parse and clean up to ``chunk_size`` rows; empty at end of file"""
+        chunk: Dict[str, tuple] = {}
+        for row_number, raw in rows:
+            try:
+                row = clean_row(raw, self.company_id)
+            except ValueError as exc:
+                self._reject(row_number, raw.get("run"), str(exc))
+                continue
+            if row["run"] in chunk:
+                self._reject(chunk[row["run"]][0], row["run"], "Duplicate RUN in file; later row kept")
+            chunk[row["run"]] = (row_number, row)
+            if len(chunk) >= self.chunk_size:
+                break
+        return chunk
+
+    async def run(self, rows: Iterator[dict]) -> dict:
+        # Header is row 1 in both formats
+        numbered = enumerate(rows, start=2)
+        while True:
+            # Parsing (XLSX especially) is CPU-bound; keep it off the event loop
+            try:
+                chunk = await run_in_threadpool(self._read_chunk, numbered)
+            except ImportFormatError as exc:
+                if self.inserted or self.updated:
+                    raise ImportFormatError(
+                        f"{exc}; {self.inserted} inserted and {self.updated} updated rows before it were kept"
+                    )
+                raise
+            if not chunk:
+                break
+            await self._flush(chunk)
+
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "rejected": len(self.rejected),
+            "rejected_rows": self.rejected,
+        }
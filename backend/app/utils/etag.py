@@ -0,0 +1,145 @@
+# backend/app/utils/etag.py
+"""Weak ETags and ``304 Not Modified`` for read endpoints.
+
+List endpoints fingerprint their filtered query without loading it. One
+aggregate query returns the row count and the latest change timestamps.
+These are hashed together with the query string and the caller's scope.
+A matching ``If-None-Match`` gets a 304 before the page is queried or
+serialized. The timestamps come from ``onupdate=func.now()``, so changes
+in the same clock tick only show up through the row count or the
+rollup data version.
+
+Cursor pages are not fingerprinted. The aggregate scans the whole
+filtered set, so a client walking a large listing would pay for it
+once per page. The body hash of ``ETagMiddleware`` covers those pages.
+
+``ETagMiddleware`` covers every other GET. It hashes JSON bodies up to
+``MAX_HASHED_BODY`` bytes. That saves the payload but not the database
+work.
+"""
+import hashlib
+from typing import Optional, Sequence
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from .pagination import PageParams
+
+MAX_HASHED_BODY = 1024 * 1024
+
+def _weak(digest: str) -> str:
+    return f'W/"{digest[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match (RFC 9110 13.1.2)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+def latest(*columns) -> list:
+    """max() of each column, for ``list_etag``"""
+    return [func.max(column) for column in columns]
+
+async def list_etag(db: AsyncSession, statement, request: Request, current_user, aggregates: Sequence) -> str:
+    """Fingerprint ``statement`` by its row count and ``aggregates`` over its rows"""
+    fingerprint = statement.with_only_columns(
+        func.count(), *aggregates,
+        maintain_column_froms=True
+    ).order_by(None)
+    values = (await db.execute(fingerprint)).one()
+    scope = (current_user.id, getattr(current_user.role, "value", current_user.role), current_user.company_id)
+    key = repr((request.url.path, str(request.url.query), scope, tuple(values)))
+    return _weak(hashlib.sha256(key.encode()).hexdigest())
+
+async def conditional_list(
+    request: Request, response: Response, db: AsyncSession, statement, current_user, aggregates: Sequence,
+    page: PageParams
+) -> Optional[Response]:
+    """Set the listing's ETag and return a 304 response when the client is current"""
+    if page.cursor:
+        return None
+    etag = await list_etag(db, statement, request, current_user, aggregates)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return None
+
+class ETagMiddleware:
+    """Add a body-hash ETag to JSON GET responses that lack one; answer 304 on a match"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        start = None
+        body = []
+        size = 0
+        passthrough = swallow = False
+
+        async def send_wrapper(message):
+            nonlocal start, size, passthrough, swallow
+            if passthrough:
+                await send(message)
+                return
+            if swallow:
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {key.lower(): value for key, value in message.get("headers", [])}
+                etag = headers.get(b"etag")
+                if message["status"] == 200 and etag is not None and etag_matches(request, etag.decode()):
+                    await send(_not_modified_start(message, etag))
+                    swallow = True
+                elif (
+                    message["status"] != 200 or etag is not None
+                    or not headers.get(b"content-type", b"").startswith(b"application/json")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            body.append(message.get("body", b""))
+            size += len(body[-1])
+            more_body = message.get("more_body", False)
+            if size > MAX_HASHED_BODY:
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(body), "more_body": more_body})
+                return
+            if more_body:
+                return
+
+            content = b"".join(body)
+            etag = _weak(hashlib.sha256(content).hexdigest()).encode()
+            if etag_matches(request, etag.decode()):
+                await send(_not_modified_start(start, etag))
+                await send({"type": "http.response.body", "body": b""})
+                return
+            start["headers"] = list(start.get("headers", [])) + [(b"etag", etag)]
+            await send(start)
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_wrapper)
+
+def _not_modified_start(start: dict, etag: bytes) -> dict:
+    # A 304 carries the 200's headers minus those describing the omitted body
+    headers = [
+        (key, value) for key, value in start.get("headers", [])
+        if key.lower() not in (b"content-length", b"content-type", b"etag")
+    ]
+    return {"type": "http.response.start", "status": 304, "headers": headers + [(b"etag", etag)]}
@@ -0,0 +1,113 @@
+# backend/app/utils/pagination.py
+"""Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by a unique sort key, ``id`` (insertion order) or
+e.g. ``(expiry_date, id)``, and the next page starts strictly after the
+last row seen, so the database seeks through an index instead of
+scanning and discarding an OFFSET.
+The cursor is an opaque base64 token of the last row's key values and is
+returned in the ``X-Next-Cursor`` header while more rows remain.
+
+``skip`` is still honoured when no cursor is given, so offset clients keep
+working while they migrate.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Optional, Sequence
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Sequence) -> str:
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    """Decode a cursor into values typed like ``columns``; raises ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Malformed cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Cursor does not match this listing")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None:
+            python_type = column.type.python_type
+            try:
+                if python_type is datetime:
+                    value = datetime.fromisoformat(value)
+                elif python_type is date:
+                    value = date.fromisoformat(value)
+            except TypeError:
+                raise ValueError("Cursor does not match this listing")
+            # Postgres refuses to compare an integer key with text, and vice versa
+            if python_type in (int, str) and type(value) is not python_type:
+                raise ValueError("Cursor does not match this listing")
+        decoded.append(value)
+    return tuple(decoded)
+
+class PageParams:
+    """Query parameters shared by every paginated list endpoint"""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+        skip: int = Query(0, ge=0, description="Deprecated: use cursor"),
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE)
+    ):
+        self.cursor = cursor
+        self.skip = skip
+        self.limit = limit
+
+def keyset(statement, page: PageParams, columns: Sequence):
+    """``statement`` ordered by ``columns`` and starting after ``page.cursor``, without a limit"""
+    statement = statement.order_by(*columns)
+    if page.cursor:
+        try:
+            values = decode_cursor(page.cursor, columns)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {exc}")
+        bounds = [literal(value, column.type) for column, value in zip(columns, values)]
+        if len(columns) == 1:
+            statement = statement.where(columns[0] > bounds[0])
+        else:
+            statement = statement.where(tuple_(*columns) > tuple_(*bounds))
+    elif page.skip:
+        statement = statement.offset(page.skip)
+    return statement
+
+async def paginate(db: AsyncSession, statement, page: PageParams, response: Response, columns: Sequence) -> list:
+    """Fetch one page of ``statement`` ordered by ``columns``.
+
+    ``columns`` must be non-null, end in a unique column (normally the
+    primary key) and belong to the first entity selected, or be selected
+    themselves. Returns model instances for single-entity selects and rows
+    otherwise. Sets ``X-Next-Cursor`` on the response when there is
+    another page.
+    """
+    statement = keyset(statement, page, columns)
+
+    # One extra row tells us whether another page exists
+    result = await db.execute(statement.limit(page.limit + 1))
+    single = len(statement.column_descriptions) == 1
+    rows = result.scalars().all() if single else result.all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        if not single and columns[0].key not in last._fields:
+            # (entity, ...) rows; plain column rows carry the keys themselves
+            last = last[0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, column.key) for column in columns]
+        )
+    return rows
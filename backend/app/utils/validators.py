@@ -0,0 +1,40 @@
+# backend/app/utils/validators.py
+import re
+from typing import Optional, Tuple
+
+_RUN_CLEAN = re.compile(r"[^0-9kK]")
+
+def split_run(value: str) -> Optional[Tuple[str, str]]:
+    """Split a RUT/RUN into (digits, check digit), ignoring dots, dashes and spaces"""
+    if not value:
+        return None
+    cleaned = _RUN_CLEAN.sub("", value).upper()
+    if len(cleaned) < 2 or not cleaned[:-1].isdigit():
+        return None
+    return cleaned[:-1].lstrip("0") or "0", cleaned[-1]
+
+def run_check_digit(digits: str) -> str:
+    """Compute the modulo-11 check digit of a RUT/RUN body"""
+    total = 0
+    factor = 2
+    for digit in reversed(digits):
+        total += int(digit) * factor
+        factor = 2 if factor == 7 else factor + 1
+    remainder = 11 - total % 11
+    if remainder == 11:
+        return "0"
+    if remainder == 10:
+        return "K"
+    return str(remainder)
+
+def is_valid_run(value: str) -> bool:
+    """True if the RUT/RUN has a correct check digit"""
+    parts = split_run(value)
+    return parts is not None and run_check_digit(parts[0]) == parts[1]
+
+def normalize_run(value: str) -> Optional[str]:
+    """Canonical RUT/RUN form ``12345678-9``, or None if it is not valid"""
+    if not is_valid_run(value):
+        return None
+    digits, check_digit = split_run(value)
+    return f"{digits}-{check_digit}"
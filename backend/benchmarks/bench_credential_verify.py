@@ -0,0 +1,142 @@
+# backend/benchmarks/bench_credential_verify.py
+"""Gate scan load: QR credential verification throughput and latency.
+
+    python benchmarks/bench_credential_verify.py [--workers 5000] [--scans 5000] [--concurrency 50]
+
+Issues one credential per worker (a tenth of them revoked), then replays
+--scans random scans from --concurrency guards, first against a
+database-backed check (credential, revocation and compliance loaded per
+scan), then against POST /credentials/verify. Reports scans/sec and
+request latency for both, and the verifier's own p99 from its
+Server-Timing header. Uses a throwaway SQLite file.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def replay(client, path: str, tokens, scans: int, concurrency: int, headers: dict) -> dict:
+    latencies, server_times = [], []
+    queue = [random.choice(tokens) for _ in range(scans)]
+
+    async def guard():
+        while queue:
+            token = queue.pop()
+            started = time.perf_counter()
+            response = await client.post(path, json={"token": token}, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+            timing = response.headers.get("server-timing")
+            if timing:
+                server_times.append(float(timing.split("dur=")[1]) / 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(guard() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "scans_per_second": scans / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "server_p99_us": percentile(server_times, 0.99) * 1e6 if server_times else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=5000)
+    parser.add_argument("--scans", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import httpx
+    from datetime import datetime, timedelta, timezone
+    from fastapi import Depends
+    from sqlalchemy import insert, select
+    from app.main import app
+    from app.core.database import Base, engine, SessionLocal, get_db
+    from app.core.security import create_access_token, get_password_hash, token_claims
+    from app.models import Company, Credential, User, UserRole, Worker, WorkerComplianceStats
+    from app.services.compliance_rollup import worker_compliance_status
+    from app.services.qr_service import sign_credential
+
+    @app.post("/bench/db-verify")
+    async def db_verify(payload: dict, db=Depends(get_db)):
+        credential = await db.scalar(select(Credential).where(Credential.token == payload["token"]))
+        if credential is None:
+            return {"valid": False, "reason": "unknown"}
+        worker = await db.get(Worker, credential.worker_id)
+        stats = await db.get(WorkerComplianceStats, worker.id)
+        valid = (
+            credential.revoked_at is None
+            and worker.is_active
+            and worker_compliance_status(stats) == "compliant"
+        )
+        return {"valid": valid, "worker_run": worker.run}
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    company = Company(rut="76000000-0", name="Benchmark")
+    db.add(company)
+    db.flush()
+    guard = User(username="guard", email="guard@example.com", hashed_password=get_password_hash("x"),
+                 role=UserRole.GUARDIA, company_id=company.id)
+    admin = User(username="admin", email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    db.add_all([guard, admin])
+    db.flush()
+    db.execute(insert(Worker), [
+        {"run": f"{10_000_000 + index}-0", "first_name": f"Nombre{index}", "last_name": "Apellido",
+         "position": "Operador", "company_id": company.id}
+        for index in range(args.workers)
+    ])
+    worker_ids = db.scalars(select(Worker.id)).all()
+    db.execute(insert(WorkerComplianceStats), [
+        {"worker_id": worker_id, "company_id": company.id, "documents_count": 1, "approved_count": 1}
+        for worker_id in worker_ids
+    ])
+
+    valid_until = datetime.now(timezone.utc) + timedelta(days=365)
+    now = datetime.now(timezone.utc)
+    tokens = [sign_credential(index + 1, worker_id, valid_until) for index, worker_id in enumerate(worker_ids)]
+    db.execute(insert(Credential), [
+        {"id": index + 1, "qr_code": token, "token": token, "valid_until": valid_until,
+         "worker_id": worker_id, "created_by": admin.id,
+         "revoked_at": now if index % 10 == 0 else None, "is_active": index % 10 != 0}
+        for index, (worker_id, token) in enumerate(zip(worker_ids, tokens))
+    ])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(token_claims(guard))}"}
+    db.close()
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                # Warm the principal cache
+                await client.get("/api/v1/auth/me", headers=headers)
+                database = await replay(client, "/bench/db-verify", tokens, args.scans, args.concurrency, headers)
+                memory = await replay(client, "/api/v1/credentials/verify", tokens, args.scans, args.concurrency, headers)
+        return database, memory
+
+    database, memory = asyncio.run(run())
+
+    print(f"{args.workers} credentials, {args.scans} scans, {args.concurrency} concurrent guards")
+    for name, result in (("database lookup", database), ("in-memory verify", memory)):
+        server = f"  server p99={result['server_p99_us']:.1f}us" if result["server_p99_us"] else ""
+        print(
+            f"{name:17} {result['scans_per_second']:8.0f} scans/sec  "
+            f"p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms{server}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# backend/benchmarks/bench_document_download.py
+"""Document downloads: full-file throughput and PDF-viewer range fetches.
+
+    python benchmarks/bench_document_download.py [--size-mb 8] [--downloads 40] [--pages 400] [--concurrency 8]
+
+Serves one stored document through uvicorn on a local port, both from a
+naive FileResponse endpoint and from GET /documents/{id}/file. It first
+runs --downloads full downloads, then --pages random 64 KiB Range
+requests like a lazy-loading PDF viewer. It reports requests/sec,
+MB/s, latency and bytes on the wire. The naive endpoint ignores Range,
+so every page costs it the whole file. Uses a throwaway SQLite file and
+upload folder.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+PAGE = 64 * 1024
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def fetch_all(client, url: str, requests: int, concurrency: int, headers: dict, size: int, ranged: bool) -> dict:
+    latencies = []
+    transferred = 0
+    remaining = list(range(requests))
+
+    async def reader():
+        nonlocal transferred
+        while remaining:
+            remaining.pop()
+            request_headers = dict(headers)
+            if ranged:
+                start = random.randrange(0, size - PAGE)
+                request_headers["Range"] = f"bytes={start}-{start + PAGE - 1}"
+            started = time.perf_counter()
+            async with client.stream("GET", url, headers=request_headers) as response:
+                assert response.status_code in (200, 206), response.status_code
+                async for chunk in response.aiter_raw():
+                    transferred += len(chunk)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reader() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": requests / elapsed,
+        "mb_per_second": transferred / elapsed / 1e6,
+        "mb_transferred": transferred / 1e6,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--downloads", type=int, default=40)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["UPLOAD_FOLDER"] = os.path.join(workdir, "uploads")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import hashlib
+    import httpx
+    import uvicorn
+    from fastapi import Depends
+    from fastapi.responses import FileResponse
+    from app.main import app
+    from app.core.database import Base, engine, SessionLocal, get_db
+    from app.core.security import create_access_token, token_claims
+    from app.models import Company, Document, DocumentType, FileBlob, User, UserRole, Worker
+    from app.services.blob_store import blob_path
+
+    @app.get("/bench/naive/{document_id}")
+    async def naive_download(document_id: int, db=Depends(get_db)):
+        document = await db.get(Document, document_id)
+        return FileResponse(document.file_path, media_type="application/pdf")
+
+    size = int(args.size_mb * 1024 * 1024)
+    content = b"%PDF-1.4\n" + os.urandom(size - 9)
+    file_hash = hashlib.sha256(content).hexdigest()
+    path = blob_path(file_hash)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    company = Company(rut="76000000-0", name="Benchmark")
+    db.add(company)
+    db.flush()
+    admin = User(username="admin", email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    worker = Worker(run="10000000-8", first_name="Nombre", last_name="Apellido", position="Operador", company_id=company.id)
+    db.add_all([admin, worker])
+    db.flush()
+    db.add(FileBlob(file_hash=file_hash, path=path, size=size, content_type="application/pdf", ref_count=1))
+    document = Document(name="escaneo", type=DocumentType.CONTRATO, file_path=path, file_hash=file_hash,
+                        worker_id=worker.id, company_id=company.id, uploaded_by=admin.id)
+    db.add(document)
+    db.commit()
+    document_id = document.id
+    headers = {"Authorization": f"Bearer {create_access_token(token_claims(admin))}"}
+    db.close()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    async def run():
+        results = {}
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            for name, url in (
+                ("FileResponse", f"/bench/naive/{document_id}"),
+                ("range endpoint", f"/api/v1/documents/{document_id}/file"),
+            ):
+                results[name] = (
+                    await fetch_all(client, url, args.downloads, args.concurrency, headers, size, ranged=False),
+                    await fetch_all(client, url, args.pages, args.concurrency, headers, size, ranged=True),
+                )
+        return results
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(f"{args.size_mb:g} MB document, {args.concurrency} concurrent readers")
+    for name, (full, pages) in results.items():
+        print(
+            f"{name:15} full: {full['mb_per_second']:7.1f} MB/s  p50={full['p50_ms']:.1f}ms p99={full['p99_ms']:.1f}ms\n"
+            f"{'':15} 64KiB pages: {pages['requests_per_second']:7.0f} req/s  "
+            f"p50={pages['p50_ms']:.1f}ms p99={pages['p99_ms']:.1f}ms  {pages['mb_transferred']:.0f} MB sent"
+        )
+
+if __name__ == "__main__":
+    main()
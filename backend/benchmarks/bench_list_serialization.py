@@ -0,0 +1,170 @@
+# backend/benchmarks/bench_list_serialization.py
+"""Worker listings: ORM + response_model + stdlib JSON against the row fast path.
+
+    python benchmarks/bench_list_serialization.py [--workers 5000] [--limit 500] [--requests 40] [--concurrency 4]
+
+Seeds --workers workers with compliance rollups and serves them through
+uvicorn on a local port. It first times full pages of --limit rows from
+a route that reproduces the previous GET /workers/: it loads ORM
+instances, validates them through WorkerResponse and encodes them with
+JSONResponse. Then it times the same pages from the current endpoint.
+Last, it reads the whole listing by following X-Next-Cursor, and as one
+NDJSON stream. It reports requests/sec, latency, and rows/sec for the
+full listing. Uses a throwaway SQLite file.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def fetch_pages(client, url: str, requests: int, concurrency: int, headers: dict) -> dict:
+    latencies = []
+    remaining = list(range(requests))
+
+    async def reader():
+        while remaining:
+            remaining.pop()
+            started = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            assert response.status_code == 200, response.status_code
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reader() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+async def read_listing(client, url: str, headers: dict, limit: int) -> dict:
+    """Every row, by following cursors or from a single NDJSON stream"""
+    started = time.perf_counter()
+    rows = 0
+    if headers.get("Accept") == "application/x-ndjson":
+        async with client.stream("GET", url, headers=headers) as response:
+            async for line in response.aiter_lines():
+                rows += bool(line)
+    else:
+        cursor = None
+        while True:
+            response = await client.get(url, headers=headers, params={"limit": limit, **({"cursor": cursor} if cursor else {})})
+            rows += len(response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+    elapsed = time.perf_counter() - started
+    return {"rows": rows, "seconds": elapsed, "rows_per_second": rows / elapsed}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["UPLOAD_FOLDER"] = os.path.join(workdir, "uploads")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from typing import List
+    import httpx
+    import uvicorn
+    from fastapi import Depends
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import insert, select
+    from app.main import app
+    from app.core.database import Base, engine, SessionLocal
+    from app.core.replicas import get_read_db
+    from app.core.security import create_access_token, get_current_user, token_claims
+    from app.models import Company, User, UserRole, Worker, WorkerComplianceStats
+    from app.schemas.worker import WorkerResponse
+    from app.services.compliance_rollup import worker_compliance_status
+
+    @app.get("/bench/orm/workers", response_model=List[WorkerResponse], response_class=JSONResponse)
+    async def orm_workers(limit: int, db=Depends(get_read_db), current_user=Depends(get_current_user)):
+        query = select(Worker, WorkerComplianceStats).outerjoin(
+            WorkerComplianceStats, WorkerComplianceStats.worker_id == Worker.id
+        ).order_by(Worker.id).limit(limit)
+        workers = []
+        for worker, stats in (await db.execute(query)).all():
+            worker.documents_count = stats.documents_count if stats else 0
+            worker.compliance_status = worker_compliance_status(stats)
+            workers.append(worker)
+        return workers
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    company = Company(rut="76000000-0", name="Benchmark")
+    db.add(company)
+    db.flush()
+    admin = User(username="admin", email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    db.add(admin)
+    db.execute(insert(Worker), [
+        {"run": f"{10000000 + i}-K", "first_name": "Nombre", "last_name": f"Apellido {i}", "email": f"w{i}@example.com",
+         "position": "Operador", "company_id": company.id}
+        for i in range(args.workers)
+    ])
+    db.execute(insert(WorkerComplianceStats), [
+        {"worker_id": worker_id, "company_id": company.id, "documents_count": 4, "approved_count": 4 if worker_id % 3 else 2}
+        for worker_id in db.scalars(select(Worker.id))
+    ])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(token_claims(admin))}"}
+    db.close()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    async def run():
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120) as client:
+            before = await client.get(f"/bench/orm/workers?limit={args.limit}", headers=headers)
+            after = await client.get(f"/api/v1/workers/?limit={args.limit}", headers=headers)
+            assert before.json() == after.json(), "fast path changed the response"
+            return {
+                "ORM + pydantic": await fetch_pages(
+                    client, f"/bench/orm/workers?limit={args.limit}", args.requests, args.concurrency, headers
+                ),
+                "row fast path": await fetch_pages(
+                    client, f"/api/v1/workers/?limit={args.limit}", args.requests, args.concurrency, headers
+                ),
+            }, {
+                "JSON pages": await read_listing(client, "/api/v1/workers/", headers, args.limit),
+                "NDJSON stream": await read_listing(
+                    client, "/api/v1/workers/", {**headers, "Accept": "application/x-ndjson"}, args.limit
+                ),
+            }
+
+    try:
+        pages, listings = asyncio.run(run())
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(f"{args.workers} workers, pages of {args.limit}, {args.concurrency} concurrent clients")
+    for name, result in pages.items():
+        print(f"{name:15} {result['requests_per_second']:7.1f} pages/s  p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms")
+    for name, result in listings.items():
+        print(f"{name:15} {result['rows']} rows in {result['seconds']:.2f}s  {result['rows_per_second']:,.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# backend/benchmarks/bench_login_burst.py
+"""Login burst: latency of ordinary requests while many users log in.
+
+    python benchmarks/bench_login_burst.py [--logins 200] [--probes 100] [--rounds 10]
+
+Fires --logins concurrent logins together with a steady stream of
+GET /auth/me probes, first against the old path (bcrypt verified inside
+a sync endpoint, i.e. in the request threadpool), then against
+/auth/login backed by the hashing process pool. Reports login
+throughput and probe latency for each. Uses a throwaway SQLite file.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+async def run_burst(client, login_path: str, users: int, logins: int, probes: int, token: str) -> dict:
+    async def login(index: int):
+        response = await client.post(login_path, data={
+            "username": f"user{index % users}", "password": "secret"
+        })
+        return response.status_code
+
+    async def probe():
+        started = time.perf_counter()
+        response = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200, response.text
+        return time.perf_counter() - started
+
+    async def probe_stream():
+        latencies = []
+        for _ in range(probes):
+            latencies.append(await probe())
+            await asyncio.sleep(0.005)
+        return latencies
+
+    started = time.perf_counter()
+    statuses, latencies = await asyncio.gather(
+        asyncio.gather(*(login(index) for index in range(logins))),
+        probe_stream()
+    )
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "ok": statuses.count(200),
+        "rejected": statuses.count(429),
+        "logins_per_second": logins / elapsed,
+        "probe_p50_ms": statistics.median(latencies) * 1000,
+        "probe_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probes", type=int, default=100)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    # Measure the pool itself, not the per-client rate limits
+    os.environ["LOGIN_ATTEMPTS_PER_USERNAME"] = "0"
+    os.environ["LOGIN_ATTEMPTS_PER_IP"] = "0"
+    os.environ["PASSWORD_HASH_QUEUE_SIZE"] = str(args.logins)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import httpx
+    from fastapi import Depends, HTTPException
+    from fastapi.security import OAuth2PasswordRequestForm
+    from app.main import app
+    from app.core.database import Base, engine, SessionLocal
+    from app.core.security import create_access_token, pwd_context, token_claims
+    from app.models import User, UserRole
+    from app.services.password_hasher import get_password_hasher
+
+    @app.post("/bench/legacy-login")
+    def legacy_login(form_data: OAuth2PasswordRequestForm = Depends()):
+        with SessionLocal() as db:
+            user = db.query(User).filter(User.username == form_data.username).first()
+            if not user or not pwd_context.verify(form_data.password, user.hashed_password):
+                raise HTTPException(status_code=401)
+            return {"access_token": create_access_token(token_claims(user))}
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    hashed = pwd_context.hash("secret")
+    db.add_all([
+        User(username=f"user{index}", email=f"user{index}@example.com",
+             hashed_password=hashed, role=UserRole.EMPRESA)
+        for index in range(args.users)
+    ])
+    db.commit()
+    token = create_access_token(token_claims(db.query(User).first()))
+    db.close()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            legacy = await run_burst(client, "/bench/legacy-login", args.users, args.logins, args.probes, token)
+            pooled = await run_burst(client, "/api/v1/auth/login", args.users, args.logins, args.probes, token)
+        return legacy, pooled
+
+    legacy, pooled = asyncio.run(run())
+    get_password_hasher().shutdown()
+
+    print(f"{args.logins} logins, bcrypt cost {args.rounds}, {get_password_hasher().workers} hashing workers")
+    for name, result in (("threadpool (old)", legacy), ("process pool", pooled)):
+        print(
+            f"{name:17} {result['logins_per_second']:7.1f} logins/sec  "
+            f"ok={result['ok']} 429={result['rejected']}  "
+            f"/auth/me p50={result['probe_p50_ms']:.1f}ms p95={result['probe_p95_ms']:.1f}ms"
+        )
+
+if __name__ == "__main__":
+    main()
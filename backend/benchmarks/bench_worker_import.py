@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_worker_import.py
+"""Compare the per-row worker creation path with the bulk roster import.
+
+    python benchmarks/bench_worker_import.py [--rows 3000] [--database-url URL]
+
+Uses a throwaway SQLite file unless --database-url is given.
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+
+def make_roster(rows: int, offset: int) -> bytes:
+    from app.utils.validators import run_check_digit
+    lines = ["run,first_name,last_name,email,phone,position,entry_date"]
+    for index in range(rows):
+        digits = str(10_000_000 + offset + index)
+        lines.append(
+            f"{digits}-{run_check_digit(digits)},Nombre{index},Apellido{index},"
+            f"w{index}@example.com,+5690000{index:04d},Operador,2024-01-15"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+def per_row(db, company_id: int, roster: bytes) -> float:
+    """Mirror create_worker: existence SELECT, INSERT and COMMIT per worker"""
+    from app.models import Worker
+    from app.services.compliance_rollup import record_worker_added
+    from app.services.worker_import import clean_row, iter_csv_rows
+
+    started = time.perf_counter()
+    for raw in iter_csv_rows(io.BytesIO(roster)):
+        row = clean_row(raw, company_id)
+        if db.query(Worker).filter(Worker.run == row["run"]).first():
+            continue
+        worker = Worker(**row)
+        db.add(worker)
+        db.flush()
+        record_worker_added(db, worker)
+        db.commit()
+    return time.perf_counter() - started
+
+def bulk(company_id: int, roster: bytes) -> float:
+    from app.core.database import AsyncSessionLocal, async_engine
+    from app.services.worker_import import WorkerImport, iter_csv_rows
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            await WorkerImport(db, company_id).run(iter_csv_rows(io.BytesIO(roster)))
+        await async_engine.dispose()
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app.core.database import Base, engine, SessionLocal
+    from app.models import Company
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    company = Company(rut="76000000-0", name="Benchmark")
+    db.add(company)
+    db.commit()
+
+    slow = per_row(db, company.id, make_roster(args.rows, 0))
+    fast = bulk(company.id, make_roster(args.rows, args.rows))
+    db.close()
+
+    print(f"per-row create_worker path: {args.rows / slow:10.0f} rows/sec ({slow:.2f}s)")
+    print(f"bulk import (upsert):       {args.rows / fast:10.0f} rows/sec ({fast:.2f}s)")
+    print(f"speedup: {slow / fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+
+# Settings are read at import time, so point them at a scratch area first
+_workdir = tempfile.mkdtemp(prefix="sso-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["UPLOAD_FOLDER"] = os.path.join(_workdir, "uploads")
+os.environ["OCR_CACHE_DIR"] = os.path.join(_workdir, "ocr")
+os.environ["OCR_ENGINE"] = "stub"
+os.environ["OCR_WORKERS"] = "1"
+os.environ.setdefault("SECRET_KEY", "tests")
+
+import pytest
+from app.core.database import Base, engine, SessionLocal
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        # SQLite's FTS5 indexes are not part of the metadata
+        with engine.begin() as connection:
+            for table in ("companies_fts", "workers_fts"):
+                connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+
+@pytest.fixture
+def client(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.core.principal import principal_cache
+    from app.main import app
+    from app.services.report_cache import MemoryReportCache, report_cache
+
+    # Ids repeat across tests, so process-wide caches start empty
+    principal_cache.clear()
+    monkeypatch.setattr(report_cache, "backend", MemoryReportCache(100))
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def company(db):
+    from app.models import Company
+    company = Company(rut="76000000-0", name="Empresa")
+    db.add(company)
+    db.commit()
+    return company
+
+@pytest.fixture
+def admin_headers(db):
+    from app.core.security import create_access_token, token_claims
+    from app.models import User, UserRole
+    user = User(username="admin", email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    db.add(user)
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token(token_claims(user))}"}
+
+@pytest.fixture
+def create_worker(client, company, admin_headers):
+    """POST a worker with a valid RUN built from ``digits``"""
+    from app.utils.validators import run_check_digit
+
+    def create(digits: str = "10000000", company_id: int = None, **fields) -> dict:
+        response = client.post("/api/v1/workers/", headers=admin_headers, json={
+            "run": f"{digits}-{run_check_digit(digits)}", "first_name": "Nombre", "last_name": "Apellido",
+            "position": "Operador", "company_id": company_id or company.id, **fields
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+    return create
+
+@pytest.fixture
+def upload(client, admin_headers):
+    """Upload a document for a worker through the API"""
+    def upload(worker: dict, content: bytes, type: str = "contrato", **fields) -> dict:
+        response = client.post("/api/v1/documents/upload", headers=admin_headers, files={
+            "file": ("documento.pdf", content, "application/pdf")
+        }, data={"name": "documento", "type": type, "worker_id": worker["id"], "company_id": worker["company_id"], **fields})
+        assert response.status_code == 200, response.text
+        return response.json()
+    return upload
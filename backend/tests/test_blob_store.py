@@ -0,0 +1,55 @@
+# backend/tests/test_blob_store.py
+import os
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import update
+from app.models import Document, FileBlob
+from app.services.blob_store import blob_path, collect_garbage
+
+@pytest.fixture
+def orphan(db, client, admin_headers, create_worker, upload):
+    """A blob whose only document was deleted two days ago"""
+    document = upload(create_worker(), b"%PDF-1.4 orphan")
+    assert client.delete(f"/api/v1/documents/{document['id']}", headers=admin_headers).status_code == 200
+    file_hash = db.get(Document, document["id"]).file_hash
+    db.execute(update(FileBlob).values(orphaned_at=datetime.now(timezone.utc) - timedelta(days=2)))
+    db.commit()
+    assert os.path.exists(blob_path(file_hash))
+    return file_hash
+
+def test_collect_garbage_removes_row_and_file(db, orphan):
+    assert collect_garbage(db) == [orphan]
+
+    assert db.get(FileBlob, orphan) is None
+    assert not os.path.exists(blob_path(orphan))
+
+def test_blobs_within_the_grace_period_are_kept(db, orphan):
+    assert collect_garbage(db, grace=timedelta(days=3)) == []
+    assert os.path.exists(blob_path(orphan))
+
+def test_failed_commit_keeps_the_file(db, orphan, monkeypatch):
+    def fail():
+        raise RuntimeError("commit failed")
+    monkeypatch.setattr(db, "commit", fail)
+
+    with pytest.raises(RuntimeError):
+        collect_garbage(db)
+    monkeypatch.undo()
+    db.rollback()
+
+    # The row survives, so the file it points at must too
+    assert db.get(FileBlob, orphan) is not None
+    assert os.path.exists(blob_path(orphan))
+
+def test_row_recreated_after_the_commit_keeps_the_file(db, orphan, monkeypatch):
+    commit = db.commit
+
+    def commit_then_reupload():
+        commit()
+        db.add(FileBlob(file_hash=orphan, path=blob_path(orphan), size=1, ref_count=1))
+        commit()
+    monkeypatch.setattr(db, "commit", commit_then_reupload)
+
+    collect_garbage(db)
+
+    assert os.path.exists(blob_path(orphan))
@@ -0,0 +1,42 @@
+# backend/tests/test_compliance_export.py
+import csv
+import io
+import openpyxl
+import pytest
+
+FORMULAS = ('=HYPERLINK("http://example.com","x")', "-1+1", "+1", "@SUM(A1)")
+
+@pytest.fixture
+def export_url(company, create_worker, upload):
+    for index, name in enumerate(FORMULAS):
+        worker = create_worker(str(10000000 + index), first_name=name, last_name="Apellido")
+        upload(worker, f"%PDF-1.4 {index}".encode())
+    create_worker("10000100", first_name="Sin", last_name="Documentos")
+    return f"/api/v1/companies/{company.id}/export"
+
+def test_csv_export_neutralises_formulas(client, admin_headers, export_url):
+    response = client.get(export_url, headers=admin_headers, params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    text = response.content.decode("utf-8")
+    assert text.startswith("\ufeff")
+    rows = list(csv.DictReader(io.StringIO(text.removeprefix("\ufeff"))))
+    assert [row["first_name"] for row in rows] == [f"'{name}" for name in FORMULAS] + ["Sin"]
+    assert rows[0]["document_status"] == "pending"
+    # A worker without documents still gets its row, with the document columns empty
+    assert rows[-1]["document_id"] == ""
+
+def test_xlsx_export_opens_in_openpyxl(client, admin_headers, export_url):
+    response = client.get(export_url, headers=admin_headers, params={"format": "xlsx"})
+
+    assert response.status_code == 200
+    workbook = openpyxl.load_workbook(io.BytesIO(response.content), read_only=True)
+    rows = list(workbook.active.iter_rows(values_only=True))
+    assert rows[0][:3] == ("run", "first_name", "last_name")
+    # Inline strings are never evaluated, so they are kept verbatim
+    assert [row[1] for row in rows[1:]] == list(FORMULAS) + ["Sin"]
+    assert len(rows) == len(FORMULAS) + 2
+
+def test_unknown_format_is_rejected(client, admin_headers, export_url):
+    assert client.get(export_url, headers=admin_headers, params={"format": "pdf"}).status_code == 422
@@ -0,0 +1,26 @@
+# backend/tests/test_compliance_report.py
+from app.services.report_cache import report_cache
+
+def test_deleting_a_document_changes_the_cached_report(client, company, admin_headers, create_worker, upload):
+    worker = create_worker()
+    documents = [upload(worker, f"%PDF-1.4 {index}".encode()) for index in range(3)]
+    client.patch(f"/api/v1/documents/{documents[0]['id']}", headers=admin_headers, json={"status": "approved"})
+    url = f"/api/v1/companies/{company.id}/compliance-report"
+
+    before = client.get(url, headers=admin_headers).json()
+    assert before["total_documents"] == 3
+    assert before["documents_by_status"] == {"pending": 2, "approved": 1}
+    recomputes = report_cache.recomputes
+    assert client.get(url, headers=admin_headers).json() == before
+    assert report_cache.recomputes == recomputes
+
+    assert client.delete(f"/api/v1/documents/{documents[1]['id']}", headers=admin_headers).status_code == 200
+
+    after = client.get(url, headers=admin_headers).json()
+    assert report_cache.recomputes == recomputes + 1
+    assert after["total_documents"] == 2
+    assert after["documents_by_status"] == {"pending": 1, "approved": 1}
+    assert after["documents_by_type"] == [{"type": "contrato", "total": 2, "approved": 1, "compliance_rate": 50.0}]
+    assert after["overall_compliance"] == 50.0
+    listed = client.get("/api/v1/companies/", headers=admin_headers).json()
+    assert listed[0]["documents_count"] == after["total_documents"]
@@ -0,0 +1,83 @@
+# backend/tests/test_compliance_rollup.py
+from datetime import date, timedelta
+from sqlalchemy import update
+from app.models import CompanyComplianceStats, WorkerComplianceStats
+from app.services.compliance_rollup import reconcile_rollups
+from app.services.expiry_engine import expire_batch
+
+COUNTERS = ("documents_count", "pending_count", "approved_count", "observed_count", "expired_count")
+
+def counts(db, model, key: int) -> dict:
+    db.expire_all()
+    row = db.get(model, key)
+    return {column: getattr(row, column) for column in COUNTERS}
+
+def expected(**values) -> dict:
+    return {column: values.get(column, 0) for column in COUNTERS}
+
+def test_rollups_follow_every_document_write(db, client, company, admin_headers, create_worker, upload):
+    worker = create_worker()
+    first = upload(worker, b"%PDF-1.4 first")
+    second = upload(worker, b"%PDF-1.4 second")
+    assert counts(db, CompanyComplianceStats, company.id) == expected(documents_count=2, pending_count=2)
+    assert counts(db, WorkerComplianceStats, worker["id"]) == expected(documents_count=2, pending_count=2)
+
+    client.patch(f"/api/v1/documents/{first['id']}", headers=admin_headers, json={"status": "approved"})
+    client.patch(f"/api/v1/documents/{second['id']}", headers=admin_headers, json={"status": "observed"})
+    assert counts(db, WorkerComplianceStats, worker["id"]) == expected(
+        documents_count=2, approved_count=1, observed_count=1
+    )
+
+    assert client.delete(f"/api/v1/documents/{second['id']}", headers=admin_headers).status_code == 200
+    assert counts(db, CompanyComplianceStats, company.id) == expected(documents_count=1, approved_count=1)
+    assert counts(db, WorkerComplianceStats, worker["id"]) == expected(documents_count=1, approved_count=1)
+    assert reconcile_rollups(db, fix=False) == []
+
+def test_expired_documents_move_to_the_expired_counter(db, client, company, create_worker, upload):
+    worker = create_worker()
+    upload(worker, b"%PDF-1.4 overdue", expiry_date=(date.today() - timedelta(days=1)).isoformat())
+    upload(worker, b"%PDF-1.4 current", expiry_date=(date.today() + timedelta(days=90)).isoformat())
+
+    assert len(expire_batch(db, date.today(), 100)) == 1
+    db.commit()
+
+    assert counts(db, CompanyComplianceStats, company.id) == expected(
+        documents_count=2, pending_count=1, expired_count=1
+    )
+    assert counts(db, WorkerComplianceStats, worker["id"]) == expected(
+        documents_count=2, pending_count=1, expired_count=1
+    )
+    assert reconcile_rollups(db, fix=False) == []
+
+def test_new_workers_are_counted(db, client, company, admin_headers, create_worker):
+    create_worker("10000000")
+    worker = create_worker("10000001")
+
+    db.expire_all()
+    assert db.get(CompanyComplianceStats, company.id).workers_count == 2
+    assert counts(db, WorkerComplianceStats, worker["id"]) == expected()
+    listed = client.get("/api/v1/workers/", headers=admin_headers).json()
+    assert [row["compliance_status"] for row in listed] == ["no_documents", "no_documents"]
+
+def test_reconcile_reports_and_repairs_drift(db, client, company, create_worker, upload):
+    worker = create_worker()
+    upload(worker, b"%PDF-1.4 only")
+    db.execute(update(CompanyComplianceStats).values(documents_count=5, workers_count=0))
+    db.execute(update(WorkerComplianceStats).values(pending_count=0))
+    db.commit()
+
+    drift = reconcile_rollups(db, fix=False)
+    db.commit()
+    assert {entry.get("company_id") or entry.get("worker_id") for entry in drift} == {company.id, worker["id"]}
+    company_drift = next(entry for entry in drift if "company_id" in entry)
+    assert company_drift["actual"]["documents_count"] == 5
+    assert company_drift["expected"]["documents_count"] == 1
+    # A dry run leaves the rows alone
+    assert counts(db, CompanyComplianceStats, company.id)["documents_count"] == 5
+
+    assert len(reconcile_rollups(db, fix=True)) == 2
+    db.commit()
+    assert counts(db, CompanyComplianceStats, company.id) == expected(documents_count=1, pending_count=1)
+    assert db.get(CompanyComplianceStats, company.id).workers_count == 1
+    assert counts(db, WorkerComplianceStats, worker["id"]) == expected(documents_count=1, pending_count=1)
+    assert reconcile_rollups(db, fix=False) == []
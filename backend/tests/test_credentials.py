@@ -0,0 +1,113 @@
+# backend/tests/test_credentials.py
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.services.qr_service import (
+    CredentialVerifier, WorkerSnapshot, credential_verifier, decode_token, sign_credential
+)
+
+def snapshot(compliance_status: str = "compliant", is_active: bool = True) -> WorkerSnapshot:
+    return WorkerSnapshot("12345678-5", "Ana Rojas", 1, is_active, compliance_status)
+
+@pytest.fixture
+def verifier():
+    verifier = CredentialVerifier()
+    verifier.add_worker(7, snapshot())
+    return verifier
+
+def in_an_hour() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=1)
+
+def test_signed_token_verifies(verifier):
+    valid_until = in_an_hour().replace(microsecond=0)
+
+    result = verifier.verify(sign_credential(3, 7, valid_until))
+
+    assert (result.valid, result.reason) == (True, None)
+    assert (result.credential_id, result.worker_id, result.valid_until) == (3, 7, valid_until)
+    assert result.worker == snapshot()
+
+def test_expired_token_is_refused(verifier):
+    token = sign_credential(3, 7, datetime.now(timezone.utc) - timedelta(seconds=1))
+
+    assert verifier.verify(token).reason == "expired"
+
+def test_revoked_token_is_refused(verifier):
+    valid_until = in_an_hour()
+    token = sign_credential(3, 7, valid_until)
+    verifier.revoke(3, valid_until)
+
+    assert verifier.verify(token).reason == "revoked"
+    # Other credentials of the same worker still pass
+    assert verifier.verify(sign_credential(4, 7, valid_until)).valid
+
+@pytest.mark.parametrize("worker, reason", [
+    (snapshot("non_compliant"), "non_compliant"),
+    (snapshot("no_documents"), "no_documents"),
+    (snapshot(is_active=False), "worker_inactive"),
+    (None, "unknown_worker"),
+])
+def test_worker_state_refuses_a_valid_token(verifier, worker, reason):
+    if worker is None:
+        verifier.workers.clear()
+    else:
+        verifier.add_worker(7, worker)
+
+    result = verifier.verify(sign_credential(3, 7, in_an_hour()))
+
+    assert (result.valid, result.reason) == (False, reason)
+
+def test_tampered_token_is_refused(verifier):
+    token = sign_credential(3, 7, in_an_hour())
+    tampered = token[:4] + ("A" if token[4] != "A" else "B") + token[5:]
+
+    assert verifier.verify(tampered).reason == "invalid_signature"
+    assert verifier.verify(token[:-2]).reason == "malformed"
+    assert verifier.verify("not a token!").reason == "malformed"
+
+def test_naive_expiry_is_read_as_utc(monkeypatch):
+    # Far from UTC, so reading the expiry as server-local time would shift it by hours
+    monkeypatch.setenv("TZ", "America/Santiago")
+    time.tzset()
+    try:
+        valid_until = datetime(2030, 1, 1, 12, 0)
+        claims = decode_token(sign_credential(3, 7, valid_until))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert claims.valid_until == int(valid_until.replace(tzinfo=timezone.utc).timestamp())
+
+@pytest.fixture
+def fresh_verifier(client):
+    credential_verifier.revoked.clear()
+    credential_verifier.workers.clear()
+    yield credential_verifier
+    credential_verifier.revoked.clear()
+    credential_verifier.workers.clear()
+
+def test_issue_verify_and_revoke(client, admin_headers, create_worker, upload, fresh_verifier):
+    worker = create_worker()
+    document = upload(worker, b"%PDF-1.4 contrato")
+    issued = client.post("/api/v1/credentials/", headers=admin_headers, json={
+        "worker_id": worker["id"], "valid_until": "2030-01-01T12:00:00"
+    })
+    assert issued.status_code == 200, issued.text
+    credential = issued.json()
+    verify = lambda: client.post("/api/v1/credentials/verify", headers=admin_headers,
+                                 json={"token": credential["qr_code"]}).json()
+
+    pending = verify()
+    assert (pending["valid"], pending["reason"]) == (False, "non_compliant")
+    # The naive expiry was taken as UTC by both the token and the stored row
+    assert datetime.fromisoformat(pending["valid_until"]) == datetime(2030, 1, 1, 12, tzinfo=timezone.utc)
+    assert credential["valid_until"].startswith("2030-01-01T12:00:00")
+
+    client.patch(f"/api/v1/documents/{document['id']}", headers=admin_headers, json={"status": "approved"})
+    # Issuing again applies the worker's fresh snapshot without waiting for a refresh
+    client.post("/api/v1/credentials/", headers=admin_headers, json={"worker_id": worker["id"]})
+    assert verify()["valid"] is True
+
+    revoked = client.post(f"/api/v1/credentials/{credential['id']}/revoke", headers=admin_headers)
+    assert revoked.status_code == 200
+    assert verify()["reason"] == "revoked"
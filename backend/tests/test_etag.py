@@ -0,0 +1,63 @@
+# backend/tests/test_etag.py
+import hashlib
+import pytest
+from fastapi import Request
+from app.utils.etag import etag_matches
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+def request_with(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "headers": headers})
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"xyz", W/"abc"', True),
+    (' W/"xyz" ,"abc" ', True),
+    ("*", True),
+    ('W/"ab"', False),
+    ('W/"abcd"', False),
+    ("abc", False),
+])
+def test_etag_matches_weakly(header, matches):
+    assert etag_matches(request_with(header), 'W/"abc"') is matches
+    # A strong tag compares the same way
+    assert etag_matches(request_with(header), '"abc"') is matches
+
+def body_etag(content: bytes) -> str:
+    return f'W/"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+def test_listing_answers_304_until_it_changes(client, admin_headers, create_worker):
+    create_worker("10000000")
+    first = client.get("/api/v1/workers/", headers=admin_headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    cached = client.get("/api/v1/workers/", headers={**admin_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+    assert client.get("/api/v1/workers/", headers={**admin_headers, "If-None-Match": "*"}).status_code == 304
+
+    create_worker("10000001")
+    changed = client.get("/api/v1/workers/", headers={**admin_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
+    assert changed.headers["ETag"] != etag
+
+def test_cursor_pages_skip_the_listing_fingerprint(client, admin_headers, create_worker):
+    for index in range(3):
+        create_worker(str(10000000 + index))
+    first = client.get("/api/v1/workers/", headers=admin_headers, params={"limit": 2})
+    # The first page is fingerprinted from the query, not hashed from its body
+    assert first.headers["ETag"] != body_etag(first.content)
+
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    page = client.get("/api/v1/workers/", headers=admin_headers, params={"limit": 2, "cursor": cursor})
+    assert page.status_code == 200
+    assert page.headers["ETag"] == body_etag(page.content)
+    cached = client.get("/api/v1/workers/", headers={**admin_headers, "If-None-Match": page.headers["ETag"]},
+                        params={"limit": 2, "cursor": cursor})
+    assert cached.status_code == 304
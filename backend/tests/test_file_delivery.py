@@ -0,0 +1,89 @@
+# backend/tests/test_file_delivery.py
+import pytest
+from app.services.file_delivery import RangeNotSatisfiable, parse_range
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("bytes=0-", (0, 99)),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-19", (10, 19)),
+    ("bytes=90-500", (90, 99)),
+    ("bytes=99-", (99, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+    (" bytes=5-5 ", (5, 5)),
+    ("bytes=0-1,5-6", None),
+    ("bytes=-", None),
+    ("bytes=20-10", None),
+    ("items=0-10", None),
+    ("bytes=a-b", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=100-", 100),
+    ("bytes=150-200", 100),
+    ("bytes=-0", 100),
+    ("bytes=0-", 0),
+])
+def test_unsatisfiable_range(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, size)
+
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+@pytest.fixture
+def file_url(create_worker, upload):
+    document = upload(create_worker(), CONTENT)
+    return f"/api/v1/documents/{document['id']}/file"
+
+def test_whole_file(client, admin_headers, file_url):
+    response = client.get(file_url, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["Content-Length"] == str(len(CONTENT))
+
+def test_single_range(client, admin_headers, file_url):
+    response = client.get(file_url, headers={**admin_headers, "Range": "bytes=-16"})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[-16:]
+    assert response.headers["Content-Range"] == f"bytes {len(CONTENT) - 16}-{len(CONTENT) - 1}/{len(CONTENT)}"
+
+def test_range_past_the_end_is_416(client, admin_headers, file_url):
+    response = client.get(file_url, headers={**admin_headers, "Range": f"bytes={len(CONTENT)}-"})
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+def test_multiple_ranges_get_the_whole_file(client, admin_headers, file_url):
+    response = client.get(file_url, headers={**admin_headers, "Range": "bytes=0-1,4-5"})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+def test_if_range(client, admin_headers, file_url):
+    etag = client.head(file_url, headers=admin_headers).headers["ETag"]
+
+    current = client.get(file_url, headers={**admin_headers, "Range": "bytes=0-3", "If-Range": etag})
+    assert (current.status_code, current.content) == (206, CONTENT[:4])
+
+    stale = client.get(file_url, headers={**admin_headers, "Range": "bytes=0-3", "If-Range": '"stale"'})
+    assert (stale.status_code, stale.content) == (200, CONTENT)
+    # If-Range compares strongly, so a weak tag never matches
+    weak = client.get(file_url, headers={**admin_headers, "Range": "bytes=0-3", "If-Range": f"W/{etag}"})
+    assert weak.status_code == 200
+
+def test_head_and_if_none_match(client, admin_headers, file_url):
+    head = client.head(file_url, headers={**admin_headers, "Range": "bytes=0-9"})
+    assert head.status_code == 206
+    assert head.headers["Content-Length"] == "10"
+    assert head.content == b""
+
+    cached = client.get(file_url, headers={**admin_headers, "If-None-Match": f"W/{head.headers['ETag']}"})
+    assert cached.status_code == 304
+    assert cached.content == b""
@@ -0,0 +1,63 @@
+# backend/tests/test_pagination.py
+import base64
+import json
+from datetime import date, timedelta
+import pytest
+from app.models import Document, DocumentType, Worker
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+@pytest.fixture
+def expiring(db, company):
+    """Seven documents sharing three expiry dates, inserted out of date order"""
+    worker = Worker(run="10000000-8", first_name="Nombre", last_name="Apellido", position="Operador", company_id=company.id)
+    db.add(worker)
+    db.flush()
+    today = date.today()
+    for offset in (5, 1, 5, 3, 1, 5, 3):
+        db.add(Document(name=f"vence en {offset}", type=DocumentType.EPP, file_path="/dev/null",
+                        expiry_date=today + timedelta(days=offset), worker_id=worker.id, company_id=company.id))
+    db.commit()
+    return [
+        document.id
+        for document in db.query(Document).order_by(Document.expiry_date, Document.id)
+    ]
+
+def walk(client, headers, url: str, limit: int) -> list:
+    pages = []
+    cursor = None
+    while True:
+        response = client.get(url, headers=headers, params={"limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        pages.append([row["id"] for row in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+def test_cursor_walk_visits_every_row_once(client, admin_headers, expiring, limit):
+    pages = walk(client, admin_headers, "/api/v1/documents/expiring", limit)
+
+    assert [row for page in pages for row in page] == expiring
+    assert all(len(page) == limit for page in pages[:-1])
+    # The last page ends the walk without a cursor, even when it is full
+    assert 0 < len(pages[-1]) <= limit
+
+def test_cursor_walk_over_ids(client, admin_headers, company, create_worker):
+    created = [create_worker(str(10000000 + index))["id"] for index in range(5)]
+
+    assert walk(client, admin_headers, "/api/v1/workers/", 2) == [created[:2], created[2:4], created[4:]]
+
+@pytest.mark.parametrize("cursor", [
+    "%%%not-base64",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    encode_cursor([1]),                                # one value for a two-column key
+    base64.urlsafe_b64encode(json.dumps({"id": 1}).encode()).decode(),
+    encode_cursor(["not-a-date", 1]),
+    encode_cursor([20250101, 1]),
+    encode_cursor([date.today().isoformat(), "1"]),
+])
+def test_tampered_cursor_is_a_bad_request(client, admin_headers, expiring, cursor):
+    response = client.get("/api/v1/documents/expiring", headers=admin_headers, params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid cursor")
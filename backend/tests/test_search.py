@@ -0,0 +1,43 @@
+# backend/tests/test_search.py
+import pytest
+
+@pytest.fixture
+def workers(create_worker):
+    return [create_worker("12345678"), create_worker("12340000"), create_worker("10000013")]
+
+@pytest.mark.parametrize("query", ["12.345.678-5", "12345678-5", "12 345 678-5", "123456785", "012.345.678-5"])
+def test_formatted_run_finds_the_canonical_worker(client, admin_headers, workers, query):
+    response = client.get("/api/v1/search/", headers=admin_headers, params={"q": query})
+
+    assert response.status_code == 200
+    assert [worker["run"] for worker in response.json()["workers"]] == ["12345678-5"]
+
+def test_run_prefix_lists_shorter_matches_first(client, admin_headers, workers):
+    response = client.get("/api/v1/search/", headers=admin_headers, params={"q": "12.34"})
+
+    assert [worker["run"] for worker in response.json()["workers"]] == ["12340000-3", "12345678-5"]
+
+def test_lowercase_k_matches(client, admin_headers, workers):
+    response = client.get("/api/v1/search/", headers=admin_headers, params={"q": "10.000.013-k"})
+
+    assert [worker["run"] for worker in response.json()["workers"]] == ["10000013-K"]
+
+def test_worker_listing_filters_by_formatted_run(client, admin_headers, workers):
+    response = client.get("/api/v1/workers/", headers=admin_headers, params={"search": "12.345.678-5"})
+
+    assert [worker["id"] for worker in response.json()] == [workers[0]["id"]]
+
+def test_name_prefix_search(client, admin_headers, workers):
+    response = client.get("/api/v1/search/", headers=admin_headers, params={"q": "nomb apell"})
+
+    assert len(response.json()["workers"]) == 3
+
+@pytest.mark.parametrize("query", ['""', '" "'])
+def test_term_without_tokens_finds_nothing(client, admin_headers, workers, query):
+    response = client.get("/api/v1/search/", headers=admin_headers, params={"q": query})
+    assert response.status_code == 200
+    assert response.json() == {"companies": [], "workers": []}
+
+    listed = client.get("/api/v1/workers/", headers=admin_headers, params={"search": query})
+    assert listed.status_code == 200
+    assert listed.json() == []
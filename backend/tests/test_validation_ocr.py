@@ -0,0 +1,79 @@
+# backend/tests/test_validation_ocr.py
+import asyncio
+import hashlib
+import io
+import os
+import pypdfium2
+from app.core.config import settings
+from app.models import (
+    Company, Document, DocumentStatus, DocumentType, Observation, ObservationType, User, UserRole, Worker
+)
+from app.services.blob_store import blob_path
+from app.services.ocr_service import get_ocr_service, publish_ocr_metrics
+from app.services.process_metrics import collect_published
+from app.services.validation_queue import claim_job, enqueue_validation, process_job
+
+def blank_pdf(pages: int) -> bytes:
+    pdf = pypdfium2.PdfDocument.new()
+    for _ in range(pages):
+        pdf.new_page(595, 842)
+    output = io.BytesIO()
+    pdf.save(output)
+    return output.getvalue()
+
+def make_document(db, content: bytes, document_type=DocumentType.EXAMEN_MEDICO) -> Document:
+    file_hash = hashlib.sha256(content).hexdigest()
+    path = blob_path(file_hash)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+    company = Company(rut="76000000-0", name="Empresa")
+    db.add(company)
+    db.flush()
+    user = User(username="admin", email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+    worker = Worker(run="10000000-8", first_name="Nombre", last_name="Apellido", position="Operador", company_id=company.id)
+    db.add_all([user, worker])
+    db.flush()
+    document = Document(name="examen", type=document_type, file_path=path, file_hash=file_hash,
+                        worker_id=worker.id, company_id=company.id, uploaded_by=user.id)
+    db.add(document)
+    db.flush()
+    enqueue_validation(db, document)
+    db.commit()
+    return document
+
+def run_queue(db):
+    job = claim_job(db, "test")
+    assert job is not None
+    asyncio.run(process_job(db, job))
+
+def test_stub_ocr_approves_legible_scan(db):
+    document = make_document(db, blank_pdf(2))
+
+    run_queue(db)
+
+    db.refresh(document)
+    assert document.status == DocumentStatus.APPROVED
+    # Every page is recognized and cached on its own
+    for page in range(2):
+        cached = os.path.join(settings.OCR_CACHE_DIR, "stub", document.file_hash[:2], document.file_hash, f"{page}.txt")
+        with open(cached, encoding="utf-8") as f:
+            assert f.read() == f"page {page + 1} {document.file_hash[:32]}"
+
+    publish_ocr_metrics(db, "test")
+    published = collect_published(db, "ocr")
+    assert published["processes"] == 1
+    assert published["pages_recognized"] == get_ocr_service().pages_recognized >= 1
+
+def test_stub_ocr_flags_illegible_scan(db, monkeypatch):
+    # The stub's text is shorter than this, so the scan counts as unreadable
+    monkeypatch.setattr(settings, "OCR_MIN_TEXT_LENGTH", 1000)
+    document = make_document(db, blank_pdf(1))
+
+    run_queue(db)
+
+    db.refresh(document)
+    assert document.status == DocumentStatus.OBSERVED
+    observation = db.query(Observation).filter_by(document_id=document.id).one()
+    assert observation.type == ObservationType.ILLEGIBLE
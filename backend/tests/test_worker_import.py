@@ -0,0 +1,100 @@
+# backend/tests/test_worker_import.py
+import pytest
+from sqlalchemy import insert
+from app.models import Company, CompanyComplianceStats, Worker
+from app.utils.validators import normalize_run, split_run
+
+@pytest.mark.parametrize("value, expected", [
+    ("12345678-5", "12345678-5"),
+    ("12.345.678-5", "12345678-5"),
+    (" 12 345 678 - 5 ", "12345678-5"),
+    ("123456785", "12345678-5"),
+    ("10000013-k", "10000013-K"),
+    ("10.000.013k", "10000013-K"),
+    ("012.345.678-5", "12345678-5"),
+    ("0012345678-5", "12345678-5"),
+    ("12345678-4", None),
+    ("10000013-0", None),
+    ("1k345678-5", None),
+    ("5", None),
+    ("", None),
+])
+def test_normalize_run(value, expected):
+    assert normalize_run(value) == expected
+
+def test_split_run_keeps_the_check_digit_apart():
+    assert split_run("12.345.678-5") == ("12345678", "5")
+    assert split_run("010.000.013-k") == ("10000013", "K")
+    assert split_run("-") is None
+
+def roster(*rows: str) -> bytes:
+    return ("run,first_name,last_name,position\n" + "".join(f"{row}\n" for row in rows)).encode()
+
+def import_roster(client, headers, company_id: int, content: bytes, filename: str = "roster.csv"):
+    return client.post("/api/v1/workers/import", headers=headers, files={"file": (filename, content, "text/csv")},
+                       data={"company_id": company_id})
+
+def test_reimporting_a_roster_updates_instead_of_duplicating(db, client, company, admin_headers):
+    first = import_roster(client, admin_headers, company.id, roster(
+        "12.345.678-5,Ana,Rojas,Operadora", "10000013-k,Luis,Soto,Bodega", "12345678-4,Mal,Digito,Operador"
+    ))
+    assert first.status_code == 200, first.text
+    assert first.json()["inserted"] == 2
+    assert first.json()["rejected_rows"] == [{"row": 4, "run": "12345678-4", "reason": "Invalid RUN"}]
+
+    second = import_roster(client, admin_headers, company.id, roster(
+        "12345678-5,Ana,Rojas,Supervisora", "10.000.013-K,Luis,Soto,Bodega"
+    ))
+    assert second.json() == {"inserted": 0, "updated": 2, "rejected": 0, "rejected_rows": []}
+
+    workers = db.query(Worker).order_by(Worker.run).all()
+    assert [(worker.run, worker.position) for worker in workers] == [
+        ("10000013-K", "Bodega"), ("12345678-5", "Supervisora")
+    ]
+    assert db.get(CompanyComplianceStats, company.id).workers_count == 2
+
+def test_import_matches_workers_stored_with_legacy_spelling(db, client, company, admin_headers):
+    db.execute(insert(Worker).values(run="12.345.678-5", run_number="12345678", run_dv="5", first_name="Ana",
+                                     last_name="Rojas", position="Operadora", company_id=company.id))
+    db.commit()
+
+    response = import_roster(client, admin_headers, company.id, roster("12345678-5,Ana,Rojas,Supervisora"))
+
+    assert response.json()["updated"] == 1
+    worker = db.query(Worker).one()
+    assert (worker.run, worker.position) == ("12345678-5", "Supervisora")
+    # Creating the same person by hand is refused as well
+    duplicate = client.post("/api/v1/workers/", headers=admin_headers, json={
+        "run": "12.345.678-5", "first_name": "Ana", "last_name": "Rojas", "position": "Operadora",
+        "company_id": company.id
+    })
+    assert duplicate.status_code == 400
+
+def test_import_never_moves_another_company_s_worker(db, client, company, admin_headers):
+    other = Company(rut="77000000-6", name="Otra")
+    db.add(other)
+    db.flush()
+    db.add(Worker(run="12345678-5", first_name="Ana", last_name="Rojas", position="Operadora", company_id=other.id))
+    db.commit()
+
+    response = import_roster(client, admin_headers, company.id, roster("12.345.678-5,Ana,Rojas,Supervisora"))
+
+    assert response.json()["rejected_rows"] == [
+        {"row": 2, "run": "12345678-5", "reason": "RUN belongs to another company"}
+    ]
+    assert db.query(Worker).one().company_id == other.id
+
+@pytest.mark.parametrize("content, detail", [
+    (roster("12345678-5,Ana,Rojas,Operadora") + b"10000013-K,Jos\xe9,Soto,Bodega\n", "CSV is not UTF-8"),
+    (roster("12345678-5,Ana," + "x" * 200_000 + ",Operadora"), "Invalid CSV at line 2"),
+], ids=["not-utf8", "field-too-large"])
+def test_unreadable_csv_is_a_bad_request(client, company, admin_headers, content, detail):
+    response = import_roster(client, admin_headers, company.id, content)
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith(detail)
+
+def test_roster_must_be_csv_or_xlsx(client, company, admin_headers):
+    response = import_roster(client, admin_headers, company.id, b"", filename="roster.txt")
+
+    assert response.status_code == 400